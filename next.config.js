@@ -5,6 +5,8 @@ const nextConfig = {
   i18n,
   reactStrictMode: true,
   output: "standalone",
+  // Source maps for the Selenium JS coverage report (tests/js_coverage.py)
+  productionBrowserSourceMaps: process.env.AMPLIFY_SOURCE_MAPS === '1',
  
   webpack(config, { isServer, dev }) {
     config.experiments = {
@@ -15,9 +15,87 @@ if [ -z "$1" ]; then
   echo "Case 7: Run everything in the 'ModalTests' folder"
   echo "Case 8: Run everything in the 'RightSidebarTests' folder"
   echo "Case 9: Run everything in the 'TabTests' folder"
+  echo "Case 10: Run the benchmarks in the 'BenchmarkTests' folder (reports go to tests/reports)"
+  echo "Case 11: Run the harness unit tests in the 'HarnessTests' folder (no browser or server needed)"
+  echo ""
+  echo "Options (after the case number):"
+  echo "  --no-preflight     Skip the server/auth/backend pre-flight checks"
+  echo "  --payload-profile  Profile /api/requestOp payload sizes and print a per-op report"
+  echo "  --record           Record each test's /api/requestOp traffic to tests/cassettes"
+  echo "  --replay           Serve /api/requestOp from the recorded cassettes and print a diff report"
+  echo "  --contexts=N       Run test files concurrently, each test in its own browser context inside N shared Chrome processes"
+  echo "  --jobs=M           Test files run at once with --contexts (default: 2 per Chrome)"
+  echo "  --block=PROFILE    Block requests matching a profile from tests/blocking.py (third_party, images, all)"
+  echo "  --throttle=PROFILE Emulate a network/CPU profile from tests/throttling.py (vpn, old_laptop, ...)"
+  echo "  --no-cache         Run every test file, even ones with a cached pass for the same build and sources"
+  echo "  --js-coverage      Collect V8 coverage of the app code and print a per-file report"
+  echo "  --profile[=sections] Save a CPU profile per test (or per marked section) and build a flamegraph"
+  echo "  --budgets          Check the journey benchmark against tests/budgets.json and fail on regressions"
   exit 1
 fi
 
+CASE=$1
+shift
+
+RUN_PREFLIGHT=1
+PAYLOAD_PROFILE=0
+CASSETTE=""
+CONTEXTS=0
+JOBS=0
+BLOCK=""
+THROTTLE=""
+USE_CACHE=1
+JS_COVERAGE=0
+CPU_PROFILE=""
+CHECK_BUDGETS=0
+for arg in "$@"; do
+  case $arg in
+    --no-preflight)
+      RUN_PREFLIGHT=0
+      ;;
+    --payload-profile)
+      PAYLOAD_PROFILE=1
+      ;;
+    --record)
+      CASSETTE=record
+      ;;
+    --replay)
+      CASSETTE=replay
+      ;;
+    --contexts=*)
+      CONTEXTS="${arg#*=}"
+      ;;
+    --jobs=*)
+      JOBS="${arg#*=}"
+      ;;
+    --block=*)
+      BLOCK="${arg#*=}"
+      ;;
+    --throttle=*)
+      THROTTLE="${arg#*=}"
+      ;;
+    --no-cache)
+      USE_CACHE=0
+      ;;
+    --js-coverage)
+      JS_COVERAGE=1
+      ;;
+    --profile)
+      CPU_PROFILE=test
+      ;;
+    --profile=*)
+      CPU_PROFILE="${arg#*=}"
+      ;;
+    --budgets)
+      CHECK_BUDGETS=1
+      ;;
+    *)
+      echo "Unknown option: $arg"
+      exit 1
+      ;;
+  esac
+done
+
 # Set PYTHONPATH to include the project root
 export PYTHONPATH="$SCRIPT_DIR:$PYTHONPATH"
 
@@ -27,26 +105,148 @@ export ENV_FILE="$SCRIPT_DIR/.env.local"
 # Navigate to the project directory
 cd "$SCRIPT_DIR" || { echo "Directory not found"; exit 1; }
 
+# The harness unit tests need neither the server nor a login
+if [ "$CASE" = "11" ]; then
+  RUN_PREFLIGHT=0
+fi
+
+# Check server health, login and backend reachability once before starting any browsers
+# Exported before the pre-flight, which leaves out the backend checks for --replay
+if [ -n "$CASSETTE" ]; then
+  export AMPLIFY_CASSETTE=$CASSETTE
+  rm -f tests/reports/cassette_diff.jsonl
+fi
+
+if [ "$RUN_PREFLIGHT" -eq 1 ]; then
+  echo "Running pre-flight checks..."
+  if ! PYTHONPATH="$SCRIPT_DIR" python3 -m tests.preflight; then
+    echo "Aborting test run: pre-flight checks failed."
+    exit 1
+  fi
+  export AMPLIFY_PREFLIGHT=passed
+else
+  export AMPLIFY_PREFLIGHT=skip
+fi
+
+if [ "$PAYLOAD_PROFILE" -eq 1 ]; then
+  export AMPLIFY_PAYLOAD_PROFILE=1
+  rm -f tests/reports/payload_profile.jsonl
+fi
+
+if [ "$JS_COVERAGE" -eq 1 ]; then
+  export AMPLIFY_JS_COVERAGE=1
+  rm -f tests/reports/js_coverage.jsonl
+fi
+
+if [ -n "$CPU_PROFILE" ]; then
+  export AMPLIFY_CPU_PROFILE=$CPU_PROFILE
+  rm -rf tests/reports/cpuprofiles
+fi
+
+if [ "$CHECK_BUDGETS" -eq 1 ] && { [ -n "$BLOCK" ] || [ -n "$THROTTLE" ]; }; then
+  # Budgets and baselines hold for unblocked, unthrottled runs; those reports are also written under another name
+  echo "--budgets cannot be combined with --block or --throttle."
+  exit 1
+fi
+
+if [ "$CHECK_BUDGETS" -eq 1 ]; then
+  # Never judge a stale report from an earlier run
+  rm -f tests/reports/Journeys.json
+fi
+
+
+if [ -n "$BLOCK" ]; then
+  export AMPLIFY_BLOCK=$BLOCK
+fi
+
+if [ -n "$THROTTLE" ]; then
+  export AMPLIFY_THROTTLE=$THROTTLE
+fi
+
+if [ "$CONTEXTS" -gt 0 ]; then
+  echo "Starting $CONTEXTS shared Chrome process(es)..."
+  # Set first, so Chromes from a start that fails halfway are stopped too
+  trap 'PYTHONPATH="$SCRIPT_DIR" python3 -m tests.browser_pool stop' EXIT
+  if ! PYTHONPATH="$SCRIPT_DIR" python3 -m tests.browser_pool start --size "$CONTEXTS"; then
+    echo "Aborting test run: the browser pool did not start."
+    exit 1
+  fi
+  export AMPLIFY_BROWSER_POOL=1
+  # The pool is what makes concurrent files affordable, so files only run in parallel with it
+  if [ "$JOBS" -le 0 ]; then
+    JOBS=$((CONTEXTS * 2))
+  fi
+else
+  JOBS=1
+fi
+
+# Benchmarks measure timings, so their files never share the machine with each other
+if [ "$CASE" = "10" ]; then
+  JOBS=1
+fi
+
+# Benchmarks, profiles, coverage and recordings are wanted for their side effects, so they always run
+if [ "$CASE" = "10" ] || [ "$PAYLOAD_PROFILE" -eq 1 ] || [ "$JS_COVERAGE" -eq 1 ] || [ -n "$CPU_PROFILE" ] || [ "$CASSETTE" = "record" ]; then
+  USE_CACHE=0
+fi
+
+# Run one test file, unless it passed before with the same build, sources and fixtures (tests/result_cache.py)
+run_test_file() {
+  local test_file=$1
+  if [ "$USE_CACHE" -eq 1 ] && PYTHONPATH="$SCRIPT_DIR" python3 -m tests.result_cache check "$test_file"; then
+    return
+  fi
+  local log
+  log=$(mktemp)
+  local status
+  if [ "$JOBS" -gt 1 ]; then
+    # Concurrent files print their whole output when done instead of interleaving it
+    PYTHONPATH="$SCRIPT_DIR" python3 -m unittest -v "$test_file" > "$log" 2>&1
+    status=$?
+    echo "Tests in $test_file:"
+    cat "$log"
+  else
+    echo "Running tests in $test_file..."
+    PYTHONPATH="$SCRIPT_DIR" python3 -m unittest -v "$test_file" 2>&1 | tee "$log"
+    status=${PIPESTATUS[0]}
+  fi
+  # Skipped tests (e.g. after a failed pre-flight) did not really pass
+  if [ "$USE_CACHE" -eq 1 ] && [ "$status" -eq 0 ] && ! grep -q "skipped" "$log"; then
+    PYTHONPATH="$SCRIPT_DIR" python3 -m tests.result_cache record "$test_file"
+  fi
+  rm -f "$log"
+}
+
+# Run every test file read from stdin, up to $JOBS at a time
+run_test_files() {
+  local test_file
+  while read -r test_file; do
+    if [ "$JOBS" -gt 1 ]; then
+      while [ "$(jobs -rp | wc -l)" -ge "$JOBS" ]; do
+        sleep 0.2
+      done
+      run_test_file "$test_file" &
+    else
+      run_test_file "$test_file"
+    fi
+  done
+  wait
+}
+
 # Function to run tests in a specific directory
 run_tests_in_directory() {
   local dir=$1
   echo "Running tests in the '$dir' folder..."
   
   # Find all test files, excluding .pytest_cache and __pycache__
-  find "tests/$dir" -type f -name "test_*.py" | grep -v "\.pytest_cache" | grep -v "__pycache__" | while read -r test_file; do
-    echo "Running tests in $test_file..."
-    PYTHONPATH="$SCRIPT_DIR" python3 -m unittest -v "$test_file"
-  done
+  find "tests/$dir" -type f -name "test_*.py" | grep -v "\.pytest_cache" | grep -v "__pycache__" | run_test_files
 }
 
 # Determine which tests to run based on the case
-case $1 in
+case $CASE in
   1)
     echo "Running all tests in all folders..."
-    find tests -type f -name "test_*.py" | grep -v "\.pytest_cache" | grep -v "__pycache__" | while read -r test_file; do
-      echo "Running tests in $test_file..."
-      PYTHONPATH="$SCRIPT_DIR" python3 -m unittest -v "$test_file"
-    done
+    find tests -type f -name "test_*.py" | grep -v "\.pytest_cache" | grep -v "__pycache__" | run_test_files
     ;;
   2)
     run_tests_in_directory "AmplifyHelperTests"
@@ -72,8 +272,41 @@ case $1 in
   9)
     run_tests_in_directory "TabTests"
     ;;
+  10)
+    export AMPLIFY_BENCHMARK=1
+    run_tests_in_directory "BenchmarkTests"
+    ;;
+  11)
+    run_tests_in_directory "HarnessTests"
+    ;;
   *)
-    echo "Invalid case number. Please enter a number between 1 and 9."
+    echo "Invalid case number. Please enter a number between 1 and 11."
     exit 1
     ;;
-esac
\ No newline at end of file
+esac
+
+if [ "$PAYLOAD_PROFILE" -eq 1 ]; then
+  echo "requestOp payload profile:"
+  PYTHONPATH="$SCRIPT_DIR" python3 -m tests.payload_profiler
+fi
+
+if [ "$JS_COVERAGE" -eq 1 ]; then
+  echo "JS coverage:"
+  PYTHONPATH="$SCRIPT_DIR" python3 -m tests.js_coverage
+fi
+
+if [ -n "$CPU_PROFILE" ]; then
+  echo "CPU profile:"
+  PYTHONPATH="$SCRIPT_DIR" python3 -m tests.cpu_profile
+fi
+
+if [ "$CASSETTE" = "replay" ]; then
+  echo "Cassette diff:"
+  PYTHONPATH="$SCRIPT_DIR" python3 -m tests.cassette
+fi
+
+if [ "$CHECK_BUDGETS" -eq 1 ]; then
+  echo "Performance budgets:"
+  PYTHONPATH="$SCRIPT_DIR" python3 -m tests.budgets
+  exit $?
+fi
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest, summarize
+from tests.standin import StandIn
+
+
+# Answers getAdminConfigs(true) with the lazy keys and getAdminConfigs() with the rest,
+# the same split the admin service makes
+CONFIGS_HANDLER = """
+(payload, opData) => {
+    const query = opData.queryParams || {};
+    const lazy = query.lazy_load ? window.__amplifyStandIn.decode(query.lazy_load) === "1" : false;
+    return {success: true, data: lazy ? %(lazy)s : %(full)s};
+}
+"""
+
+# Answers updateAdminConfigs and keeps the config types each write carried
+UPDATE_HANDLER = """
+(payload) => {
+    const saves = window.__adminSaves = window.__adminSaves || [];
+    saves.push(((payload && payload.configurations) || []).map(c => c.type));
+    return {success: true, data: {}};
+}
+"""
+
+# Counts rendered rows and checks for a marker in the page, without a round trip per element
+TABLE_PROBE = """
+const [selector, marker] = arguments;
+return [
+    document.querySelectorAll(selector).length,
+    marker ? document.body.innerText.includes(marker) : false,
+];
+"""
+
+
+def admin_dataset(size):
+    """(lazy, full) admin configs with `size` models, feature flags, ops and groups"""
+    flags = {
+        f"benchFlag{i:05d}": {"enabled": i % 2 == 0, "userExceptions": [f"user{i}@example.com"],
+                              "amplifyGroupExceptions": []}
+        for i in range(size)
+    }
+    groups = {
+        f"benchGroup{i:05d}": {"groupName": f"benchGroup{i:05d}", "members": [f"user{i}@example.com"],
+                               "createdBy": "admin@example.com", "includeFromOtherGroups": []}
+        for i in range(size)
+    }
+    models = {
+        f"bench-model-{i:05d}": {
+            "id": f"bench-model-{i:05d}", "name": f"Bench Model {i:05d}", "provider": "Bedrock",
+            "inputContextWindow": 128000, "outputTokenLimit": 4096, "outputTokenCost": 0.01,
+            "inputTokenCost": 0.003, "cachedTokenCost": 0.0, "description": "Benchmark model",
+            "exclusiveGroupAvailability": [], "supportsImages": False, "supportsReasoning": False,
+            "supportsSystemPrompts": True, "systemPrompt": "", "isAvailable": True, "isBuiltIn": False,
+        }
+        for i in range(size)
+    }
+    ops = [
+        {"id": f"op-{i:05d}", "name": f"benchOp{i:05d}", "url": f"/bench/op/{i}", "method": "POST",
+         "description": "Benchmark op", "type": "custom", "tags": ["bench", f"tag{i % 20}"],
+         "parameters": {"type": "object", "properties": {"value": {"type": "string"}}, "required": []}}
+        for i in range(size)
+    ]
+    lazy = {
+        "admins": ["admin@example.com"],
+        "featureFlags": flags,
+        "amplifyGroups": groups,
+        "powerPointTemplates": [],
+        "rateLimit": {"period": "Unlimited", "rate": "0"},
+        "promtCostAlert": {"isActive": False, "alertMessage": "", "cost": 0},
+        "defaultConversationStorage": "future-local",
+        "emailSupport": {"isActive": False, "email": ""},
+        "aiEmailDomain": "",
+        "defaultModels": {"user": "bench-model-00000", "advanced": "", "cheapest": "", "agent": "",
+                          "documentCaching": "", "embeddings": ""},
+    }
+    full = {
+        "applicationVariables": {},
+        "applicationSecrets": {},
+        "ops": ops,
+        "openaiEndpoints": {"models": []},
+        "supportedModels": models,
+        "assistantAdminGroups": [],
+    }
+    return lazy, full
+
+
+# tab -> (row selector, search term for one row, expected rows for it, save toggle selector)
+TABS = {
+    "Feature Flags": ("#featureTitle", "benchflag00007", 1,
+                      "button[title='Click to Disable'], button[title='Click to Enable']"),
+    "Supported Models": ("#supportedModelTitle", "bench model 00007", 1, "button[title^='Click to set as']"),
+    "Ops": ("#functionName", "benchop00007", 1, None),
+}
+
+# Tabs the save benchmark spreads its edits over, each edit being one toggle
+EDIT_TABS = ["Feature Flags", "Supported Models"]
+
+
+class AdminModalBenchmark(BenchmarkTest):
+    """Serves large admin datasets from the stand-in and times the admin modal.
+
+    ADMIN_BENCH_SIZES lists the dataset sizes (models, flags, ops and groups
+    each); ADMIN_BENCH_LOAD_DELAY_MS and ADMIN_BENCH_SAVE_DELAY_MS add backend
+    latency to the configs load and save. ADMIN_SAVE_EDITS lists how many
+    settings the save benchmark edits before saving.
+    """
+
+    def setUp(self):
+        self.sizes = [int(s) for s in os.getenv("ADMIN_BENCH_SIZES", "50,200,1000").split(",")]
+        self.load_delay_ms = int(os.getenv("ADMIN_BENCH_LOAD_DELAY_MS", "0"))
+        self.save_delay_ms = int(os.getenv("ADMIN_BENCH_SAVE_DELAY_MS", "200"))
+        self.edit_counts = [int(n) for n in os.getenv("ADMIN_SAVE_EDITS", "1,5,20").split(",")]
+        self.stand_in = StandIn()
+        super().setUp(headless=True)
+
+    # ----------------- Helpers -----------------
+    def serve_dataset(self, size):
+        """Serve a dataset of `size` items, reload the app and return the dataset's JSON size"""
+        lazy, full = admin_dataset(size)
+        self.stand_in.rules = []
+        self.stand_in.op("/amplifymin/configs/update", handler=UPDATE_HANDLER, delay_ms=self.save_delay_ms)
+        self.stand_in.op("/amplifymin/configs", handler=CONFIGS_HANDLER % {
+            "lazy": json.dumps(lazy), "full": json.dumps(full),
+        }, delay_ms=self.load_delay_ms)
+        self.stand_in.op("/amplifymin/feature_flags", response={"success": True, "data": {"adminInterface": True}})
+        self.stand_in.install(self.driver)
+        self.driver.get(self.base_url)
+        self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        StandIn.drain_log(self.driver)
+        return len(json.dumps(lazy)) + len(json.dumps(full))
+
+    def probe(self, selector, marker=None):
+        return self.driver.execute_script(TABLE_PROBE, selector, marker)
+
+    def open_modal(self):
+        self.wait.until(EC.element_to_be_clickable((By.ID, "userMenu"))).click()
+        admin_button = self.wait.until(EC.element_to_be_clickable((By.ID, "adminInterface")))
+        admin_button.click()
+        open_seconds = self.wait_until(lambda: self.driver.find_elements(By.ID, "tabName"), timeout=60)
+        # The Configurations tab only shows the Amplify groups section once the lazy configs are in
+        loaded_seconds = self.wait_until(lambda: self.probe("#tabName", "Manage Amplify Groups")[1], timeout=120)
+        return open_seconds, loaded_seconds
+
+    def open_tab(self, name):
+        tabs = self.wait.until(EC.presence_of_all_elements_located((By.ID, "tabName")))
+        next(tab for tab in tabs if tab.text.startswith(name)).click()
+
+    def time_rows(self, selector, expected, timeout=120):
+        return self.wait_until(lambda: self.probe(selector)[0] == expected, timeout=timeout)
+
+    def search(self, term):
+        search_bar = self.wait.until(EC.presence_of_element_located((By.ID, "SearchBar")))
+        # clear() does not fire React's onChange, so select and delete like a user would
+        search_bar.send_keys(Keys.CONTROL, "a")
+        search_bar.send_keys(Keys.BACKSPACE)
+        if term:
+            search_bar.send_keys(term)
+
+    def save(self, toggle_selector):
+        """Make one edit, save, and return (seconds until saved, update calls made)"""
+        self.driver.find_element(By.CSS_SELECTOR, toggle_selector).click()
+        seconds, calls = self.save_changes()
+        return seconds, [e for e in calls if e.get("op") == "/amplifymin/configs/update"]
+
+    def edit(self, tab, index):
+        """Toggle the index-th setting on a tab, the way an admin edits one setting"""
+        self.open_tab(tab)
+        toggle = TABS[tab][3]
+        self.wait_until(lambda: len(self.driver.find_elements(By.CSS_SELECTOR, toggle)) > index, timeout=30)
+        self.driver.find_elements(By.CSS_SELECTOR, toggle)[index].click()
+
+    def save_changes(self):
+        """Click Save Changes and return (seconds until saved, requestOp calls the save made).
+
+        Saved means the success toast is up and the saving overlay is gone; calls
+        include the reads updateOnSave starts after the write, collected until
+        the page has been quiet for half a second.
+        """
+        # A toast from the previous save would end the wait straight away
+        self.wait_until(lambda: not self.probe("#tabName", "Configurations successfully saved")[1], timeout=30)
+        buttons = self.wait.until(EC.presence_of_all_elements_located((By.ID, "confirmationButton")))
+        save_button = next(b for b in buttons if b.text == "Save Changes")
+        StandIn.drain_log(self.driver)
+        save_button.click()
+        seconds = self.wait_until(
+            lambda: self.driver.execute_script(
+                "const text = document.body.innerText;"
+                "return text.includes('Configurations successfully saved') && !text.includes('Saving Configurations');"
+            ),
+            timeout=60,
+        )
+        calls, quiet_since = [], time.perf_counter()
+        while time.perf_counter() - quiet_since < 0.5:
+            new_calls = StandIn.drain_log(self.driver)
+            if new_calls:
+                calls += new_calls
+                quiet_since = time.perf_counter()
+            time.sleep(0.05)
+        return seconds, [e for e in calls if e.get("type") == "requestOp"]
+
+    def save_stats(self, saves):
+        """Fold (seconds, calls) per save into one record"""
+        calls = [e for _, calls in saves for e in calls]
+        writes = [e for e in calls if e.get("method") != "GET"]
+        payloads = self.driver.execute_script("return window.__adminSaves || [];")
+        return {
+            "saves": len(saves),
+            "save_ms": summarize([s * 1000 for s, _ in saves if s is not None]),
+            "total_save_ms": sum(s for s, _ in saves if s is not None) * 1000,
+            "writes": len(writes),
+            "writes_per_save": len(writes) / len(saves) if saves else None,
+            "write_ops": sorted({e["op"] for e in writes}),
+            "config_types_per_write": [len(types) for types in payloads],
+            "reads_after_save": len(calls) - len(writes),
+            "read_ops": sorted({e["op"] for e in calls if e.get("method") == "GET"}),
+            "write_ms": summarize([e["end"] - e["start"] for e in writes if "end" in e]),
+        }
+
+    # ----------------- Admin Modal -----------------
+    """Times modal open, table render, search filtering and save for every tab and dataset size"""
+
+    def test_admin_modal(self):
+        for size in self.sizes:
+            with self.subTest(size=size):
+                dataset_bytes = self.serve_dataset(size)
+                open_seconds, loaded_seconds = self.open_modal()
+                self.assertIsNotNone(loaded_seconds, f"Admin configs for {size} items never finished loading")
+                configs = [e for e in StandIn.drain_log(self.driver) if e.get("op") == "/amplifymin/configs"]
+                self.record(
+                    size=size,
+                    tab="(open)",
+                    open_ms=open_seconds * 1000 if open_seconds is not None else None,
+                    loaded_ms=loaded_seconds * 1000,
+                    configs_calls=len(configs),
+                    dataset_bytes=dataset_bytes,
+                )
+
+                for tab, (selector, term, matches, toggle) in TABS.items():
+                    self.open_tab(tab)
+                    render = self.time_rows(selector, size)
+                    self.assertIsNotNone(render, f"{tab} never rendered {size} rows")
+
+                    filter_times, reset_times = [], []
+                    for _ in range(3):
+                        self.search(term)
+                        filter_times.append(self.time_rows(selector, matches))
+                        self.search("")
+                        reset_times.append(self.time_rows(selector, size))
+
+                    save_seconds, updates = self.save(toggle) if toggle else (None, [])
+                    self.record(
+                        size=size,
+                        tab=tab,
+                        render_ms=render * 1000,
+                        search_filter_ms=summarize([t * 1000 for t in filter_times if t is not None]),
+                        search_reset_ms=summarize([t * 1000 for t in reset_times if t is not None]),
+                        save_ms=save_seconds * 1000 if save_seconds is not None else None,
+                        save_requests=len(updates),
+                        save_request_ms=summarize([e["end"] - e["start"] for e in updates if "end" in e]),
+                    )
+
+                self.driver.get(self.base_url)
+
+    # ----------------- Admin Save -----------------
+    """Counts backend writes per save: N edits saved together vs. saved one at a time"""
+
+    def test_admin_save(self):
+        size = max(self.edit_counts)
+        for edits in self.edit_counts:
+            plan = [(EDIT_TABS[i % len(EDIT_TABS)], i // len(EDIT_TABS)) for i in range(edits)]
+            for mode in ("batched", "per_edit"):
+                with self.subTest(edits=edits, mode=mode):
+                    self.serve_dataset(size)
+                    self.open_modal()
+                    StandIn.drain_log(self.driver)
+                    saves = []
+                    for tab, index in plan:
+                        self.edit(tab, index)
+                        if mode == "per_edit":
+                            saves.append(self.save_changes())
+                    if mode == "batched":
+                        saves.append(self.save_changes())
+
+                    self.assertTrue(all(seconds is not None for seconds, _ in saves), "A save never finished")
+                    stats = self.save_stats(saves)
+                    row = self.record(edits=edits, mode=mode, save_delay_ms=self.save_delay_ms, **stats)
+                    self.summary[f"{edits}_{mode}"] = {
+                        key: row[key] for key in ("writes", "total_save_ms", "reads_after_save")
+                    }
+                    if mode == "batched":
+                        # Every edited config type goes out in one updateAdminConfigs call
+                        self.assertEqual(stats["writes"], 1, f"Saving {edits} edits made {stats['writes']} writes")
+                    self.driver.get(self.base_url)
@@ -0,0 +1,96 @@
+import os
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest
+from tests.cdp import heap_usage
+from tests.standin import StandIn
+
+
+# Streams a function call whose arguments are {"rows":[...]}, one row per event,
+# the same shape the chat endpoint produces for csv(...) requests
+ROWS_GENERATOR = """
+function* (request, callIndex) {
+    const rows = %(rows)d;
+    const fn = (args) => ({s: "0", d: {tool_calls: [{function: args}]}});
+    yield fn({name: "answer"});
+    yield fn({arguments: '{"rows":['});
+    for (let i = 0; i < rows; i++) {
+        const row = {Name: "Name" + i, Race: "Raccoon", Occupation: "Row" + i};
+        yield fn({arguments: (i ? "," : "") + JSON.stringify(row)});
+    }
+    yield fn({arguments: "]}"});
+}
+"""
+
+CSV_MESSAGE = "csv({Name:'string',Race:'string',Occupation:'string'}) Extract the characters"
+
+# Returns [page time, stream log entry, whether the last row is on screen]
+RENDER_PROBE = """
+const marker = arguments[0];
+const messages = document.querySelectorAll('#chatHover');
+const last = messages.length ? messages[messages.length - 1] : null;
+const log = window.__amplifyStandIn ? window.__amplifyStandIn.log : [];
+const stream = log.filter(e => e.type === 'stream').pop() || null;
+return [performance.now(), stream, !!(last && last.textContent.includes(marker))];
+"""
+
+
+class CsvRenderingBenchmark(BenchmarkTest):
+    """Streams synthetic CSV rows through incrementalJSONtoCSV and times the rendered table.
+
+    CSV_BENCH_ROWS (comma separated row counts) and CSV_BENCH_TIMEOUT (seconds
+    per row count) control the run.
+    """
+
+    def setUp(self):
+        self.require_chat_endpoint()
+        self.rows = [int(r) for r in os.getenv("CSV_BENCH_ROWS", "10,100,1000,10000,100000,1000000").split(",")]
+        self.timeout = float(os.getenv("CSV_BENCH_TIMEOUT", "600"))
+        self.stand_in = StandIn()
+        super().setUp(headless=True)
+
+    # ----------------- Helpers -----------------
+    def stream_rows(self, rows):
+        """Point the chat endpoint at a stream of `rows` rows and reload the app"""
+        self.stand_in.rules = []
+        self.stand_in.stream(self.chat_endpoint, generator=ROWS_GENERATOR % {"rows": rows}, batch=200)
+        self.stand_in.install(self.driver)
+        self.driver.get(self.base_url)
+        self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+
+    # ----------------- CSV Rendering -----------------
+    """Streams 10 to 1M rows and records rows/sec, peak heap and the time to render the final row"""
+
+    def test_csv_rendering(self):
+        for rows in self.rows:
+            with self.subTest(rows=rows):
+                self.stream_rows(rows)
+                marker = f"Row{rows - 1}"
+                heap_before = heap_usage(self.driver)["js_heap_used"]
+                peak_heap = heap_before
+
+                self.send_message(CSV_MESSAGE)
+                deadline = time.time() + self.timeout
+                last_sample = 0
+                now, stream, rendered = self.driver.execute_script(RENDER_PROBE, marker)
+                while not rendered and time.time() < deadline:
+                    time.sleep(0.05)
+                    if time.time() - last_sample > 0.5:
+                        peak_heap = max(peak_heap, heap_usage(self.driver)["js_heap_used"])
+                        last_sample = time.time()
+                    now, stream, rendered = self.driver.execute_script(RENDER_PROBE, marker)
+
+                self.assertTrue(rendered, f"Row {rows - 1} was not rendered within {self.timeout}s")
+                self.assertIsNotNone(stream, "The chat request should have been served by the stand-in")
+
+                total_ms = now - stream["start"]
+                self.record(
+                    rows=rows,
+                    rows_per_second=rows / (total_ms / 1000.0) if total_ms else None,
+                    total_ms=total_ms,
+                    stream_ms=(stream["end"] - stream["start"]) if stream.get("end") else None,
+                    final_render_ms=(now - stream["end"]) if stream.get("end") else None,
+                    heap_before=heap_before,
+                    heap_peak=max(peak_heap, heap_usage(self.driver)["js_heap_used"]),
+                )
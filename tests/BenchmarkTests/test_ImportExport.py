@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import tempfile
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest, INTERACTIVE_PROBE, SEED_INDEXED_DB
+from tests.cdp import add_init_script
+
+
+# Stamps export blobs, import file reads and long tasks; the import entry survives
+# the reload handleImportConversations ends with
+IO_PROBE = """
+(function () {
+    if (window.__ioBench) return;
+    const bench = window.__ioBench = {longTasks: [], exports: []};
+    try {
+        new PerformanceObserver((list) => {
+            for (const e of list.getEntries()) bench.longTasks.push({start: e.startTime, ms: e.duration});
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+
+    const createObjectURL = URL.createObjectURL;
+    URL.createObjectURL = function (blob) {
+        if (blob && blob.type === 'application/json') {
+            const entry = {at: performance.now(), bytes: blob.size};
+            bench.exports.push(entry);
+            blob.text().then(text => { entry.compressed = text.includes('"compressedMessages"'); });
+        }
+        return createObjectURL.call(this, blob);
+    };
+
+    const readAsText = FileReader.prototype.readAsText;
+    FileReader.prototype.readAsText = function (file) {
+        const entry = {start: performance.now(), bytes: file.size};
+        // Listeners run after the app's onload, so this brackets parse, cleanData, merge and dispatch
+        this.addEventListener('load', (event) => {
+            entry.loadedAt = event.timeStamp;
+            entry.handledAt = performance.now();
+            try { sessionStorage.setItem('__ioBenchImport', JSON.stringify(entry)); } catch (e) {}
+        });
+        return readAsText.call(this, file);
+    };
+})();
+"""
+
+# Number of conversations the app has persisted, read without going through the app
+STORED_CONVERSATIONS = """
+const done = arguments[arguments.length - 1];
+const request = indexedDB.open('ChatUIStorage', 1);
+request.onerror = () => done(null);
+request.onsuccess = () => {
+    const db = request.result;
+    const get = db.transaction(['keyvalue'], 'readonly').objectStore('keyvalue').get('conversationHistory');
+    get.onsuccess = () => done(get.result ? JSON.parse(get.result.value).length : 0);
+    get.onerror = () => done(null);
+};
+"""
+
+
+def import_file(version, size, messages, folders, prompts):
+    """An export in format V1-V4 whose second half of ids is new to a store seeded with `size`"""
+    text = "Imported message content. " * 8
+    first = size // 2
+    history = [
+        {
+            "id": f"conv-{c}", "name": f"Imported {c}",
+            "messages": [{"role": "assistant" if m % 2 else "user", "content": text} for m in range(messages)],
+        }
+        for c in range(first, first + size)
+    ]
+    if version == 1:
+        return history
+    for conversation in history:
+        conversation.update(model={"id": "gpt-4o"}, prompt="", temperature=0.5, folderId=None)
+    if version == 2:
+        return {"history": history, "folders": [{"id": f, "name": f"Imported folder {f}"} for f in range(folders)]}
+    folder_list = [
+        {"id": f"folder-{f}", "name": f"Folder {f}", "type": "chat", "date": "2024-01-01"}
+        for f in range(folders // 2, folders // 2 + folders)
+    ]
+    if version == 3:
+        return {"version": 3, "history": history, "folders": folder_list}
+    return {
+        "version": 4, "history": history, "folders": folder_list,
+        "prompts": [
+            {"id": f"prompt-{p}", "name": f"Prompt {p}", "description": "", "content": text,
+             "folderId": None, "type": "prompt"}
+            for p in range(prompts // 2, prompts // 2 + prompts)
+        ],
+    }
+
+
+class ImportExportBenchmark(BenchmarkTest):
+    """Measures Export Conversations and Import Conversations (utils/app/importExport.ts).
+
+    IO_BENCH_SIZES lists how many conversations are seeded (with a folder per
+    50 and a prompt per 20); IO_BENCH_MESSAGES sets messages per conversation
+    and IO_BENCH_FORMATS which export versions are imported.
+    """
+
+    def setUp(self):
+        self.sizes = [int(n) for n in os.getenv("IO_BENCH_SIZES", "100,1000,10000,50000").split(",")]
+        self.messages = int(os.getenv("IO_BENCH_MESSAGES", "4"))
+        self.formats = [int(v) for v in os.getenv("IO_BENCH_FORMATS", "1,2,3,4").split(",")]
+        super().setUp(headless=True)
+        add_init_script(self.driver, IO_PROBE)
+        add_init_script(self.driver, INTERACTIVE_PROBE)
+        # The export still builds its blob; only the file write is skipped
+        self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", {"behavior": "deny"})
+
+    # ----------------- Helpers -----------------
+    def shape(self, size):
+        return max(1, size // 50), max(1, size // 20)
+
+    def reset_and_seed(self, size):
+        folders, prompts = self.shape(size)
+        self.reset_storage()
+        seeded = self.driver.execute_async_script(SEED_INDEXED_DB, size, self.messages, folders, prompts)
+        self.assertNotIn("error", seeded, f"Seeding {size} conversations failed: {seeded}")
+        return seeded
+
+    def settings_button(self, text):
+        tabs = self.wait.until(EC.presence_of_all_elements_located((By.ID, "tabSelection")))
+        next(tab for tab in tabs if tab.get_attribute("title") == "Settings").click()
+        buttons = self.wait.until(EC.presence_of_all_elements_located((By.ID, "sideBarButton")))
+        return next(b for b in buttons if text in b.text)
+
+    def blocking(self, start, end):
+        """Long tasks overlapping [start, end] in page time"""
+        tasks = [t for t in self.driver.execute_script("return window.__ioBench.longTasks;")
+                 if t["start"] < end and t["start"] + t["ms"] > start]
+        return {
+            "long_tasks": len(tasks),
+            "long_task_ms": sum(t["ms"] for t in tasks),
+            "longest_task_ms": max((t["ms"] for t in tasks), default=0),
+        }
+
+    def run_export(self, timeout=300):
+        button = self.settings_button("Export Conversations")
+        start = self.driver.execute_script(
+            "const start = performance.now(); arguments[0].click(); return start;", button
+        )
+        seconds = self.wait_until(
+            lambda: self.driver.execute_script("const e = window.__ioBench.exports[0]; return e && 'compressed' in e;"),
+            timeout=timeout,
+        )
+        self.assertIsNotNone(seconds, "Export never produced a file")
+        # Long task entries are delivered after the task ends
+        time.sleep(0.5)
+        entry = self.driver.execute_script("return window.__ioBench.exports[0];")
+        return {
+            "export_ms": entry["at"] - start,
+            "export_bytes": entry["bytes"],
+            "exported_compressed": entry["compressed"],
+            **self.blocking(start, entry["at"]),
+        }
+
+    def run_import(self, path, timeout=600):
+        self.driver.execute_script("sessionStorage.removeItem('__ioBenchImport'); window.__ioBenchBeforeImport = true;")
+        self.settings_button("Import Conversations")
+        self.driver.find_element(By.ID, "import-file").send_keys(path)
+        # handleImportConversations reloads the page once the merge is dispatched
+        reloaded = self.wait_until(
+            lambda: self.driver.execute_script(
+                "return !window.__ioBenchBeforeImport && sessionStorage.getItem('__ioBenchImport') !== null;"
+            ),
+            timeout=timeout,
+        )
+        self.assertIsNotNone(reloaded, "Import never finished")
+        entry = json.loads(self.driver.execute_script("return sessionStorage.getItem('__ioBenchImport');"))
+        interactive_ms = self.wait_interactive(timeout)
+        return {
+            "import_file_bytes": entry["bytes"],
+            "read_ms": entry["loadedAt"] - entry["start"],
+            # JSON.parse, cleanData, the merge and the dispatches all run in one handler
+            "import_blocking_ms": entry["handledAt"] - entry["loadedAt"],
+            "interactive_after_reload_ms": interactive_ms,
+        }
+
+    # ----------------- Import and Export -----------------
+    """Seeds each size, exports it, then imports every format on top of a fresh seed"""
+
+    def test_import_export(self):
+        for size in self.sizes:
+            folders, prompts = self.shape(size)
+            with self.subTest(size=size, step="export"):
+                seeded = self.reset_and_seed(size)
+                interactive_ms = self.load_app(timeout=300)
+                row = self.record(
+                    size=size,
+                    step="export",
+                    seeded_bytes=seeded["bytes"],
+                    interactive_ms=interactive_ms,
+                    **self.run_export(),
+                )
+                self.summary[f"{size}_export"] = {key: row[key] for key in ("export_ms", "export_bytes", "long_task_ms")}
+
+            expected = size + size // 2
+            for version in self.formats:
+                with self.subTest(size=size, step="import", version=version):
+                    handle = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+                    try:
+                        json.dump(import_file(version, size, self.messages, folders, prompts), handle)
+                        handle.close()
+                        self.reset_and_seed(size)
+                        self.load_app(timeout=300)
+                        result = self.run_import(handle.name)
+                    finally:
+                        os.unlink(handle.name)
+                    stored = self.driver.execute_async_script(STORED_CONVERSATIONS)
+                    row = self.record(
+                        size=size,
+                        step="import",
+                        version=version,
+                        expected_conversations=expected,
+                        stored_conversations=stored,
+                        persisted=stored == expected,
+                        **result,
+                    )
+                    self.summary[f"{size}_v{version}"] = {
+                        key: row[key] for key in ("import_blocking_ms", "persisted")
+                    }
@@ -0,0 +1,183 @@
+import os
+import itertools
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest, robust_summary, INTERACTIVE_PROBE, SEED_INDEXED_DB
+from tests.cdp import add_init_script
+from tests.standin import StandIn
+
+
+# Clicks element and resolves with page-side ms until the DOM shows the result:
+#   selector  an element matching value exists
+#   text      value appears in the page text
+#   settle    the DOM has been quiet for value ms; measured to the last mutation
+# or with null after timeout ms
+TIMED_CLICK = """
+const [element, until, value, timeout, done] = arguments;
+const start = performance.now();
+let last = null, finished = false;
+const met = (records) => {
+    if (until === 'selector') return !!document.querySelector(value);
+    if (until === 'text') {
+        return records ? records.some(r => (r.target.textContent || '').includes(value))
+                       : document.body.textContent.includes(value);
+    }
+    return false;
+};
+const finish = (result) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+};
+const observer = new MutationObserver((records) => {
+    last = performance.now();
+    if (met(records)) finish(last - start);
+});
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+const interval = setInterval(() => {
+    if (until === 'settle' && performance.now() - (last === null ? start : last) >= value) {
+        finish(last === null ? 0 : last - start);
+    }
+}, 25);
+const timer = setTimeout(() => finish(null), timeout);
+element.click();
+if (met(null)) finish(performance.now() - start);
+"""
+
+FIRST_TOKEN = "JourneyFirstToken"
+
+JOURNEYS = ["cold_start", "new_chat", "send_message_first_token", "open_assistants_tab", "open_admin_modal",
+            "folder_sort_1k"]
+
+
+class JourneysBenchmark(BenchmarkTest):
+    """Times the key user journeys that tests/budgets.json puts budgets on.
+
+    JOURNEY_BENCH_RUNS sets the repetitions after a warmup run (default 5) and
+    JOURNEY_BENCH_ITEMS the conversations seeded for the folder sort (default
+    1000). Replies come from the stand-in, so first-token time is the app's own
+    overhead, unless JOURNEY_BENCH_REAL_CHAT=1.
+    """
+
+    report_name = "Journeys"
+
+    def setUp(self):
+        self.runs = int(os.getenv("JOURNEY_BENCH_RUNS", "5"))
+        self.items = int(os.getenv("JOURNEY_BENCH_ITEMS", "1000"))
+        self.settle_ms = int(os.getenv("JOURNEY_BENCH_SETTLE_MS", "500"))
+        self.real_chat = os.getenv("JOURNEY_BENCH_REAL_CHAT") == "1"
+        if not self.real_chat:
+            self.require_chat_endpoint()
+            self.stand_in = StandIn().stream(
+                self.chat_endpoint,
+                events=[{"s": "0", "d": FIRST_TOKEN + " "}] + [{"s": "0", "d": "lorem ipsum "}] * 40,
+                interval_ms=20,
+            )
+        super().setUp(headless=True)
+        add_init_script(self.driver, INTERACTIVE_PROBE)
+        self.driver.set_script_timeout(60)
+
+    # ----------------- Helpers -----------------
+    def timed_click(self, element, until, value, timeout_ms=50000):
+        return self.driver.execute_async_script(TIMED_CLICK, element, until, value, timeout_ms)
+
+    # ----------------- Journeys -----------------
+    def cold_start(self):
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        return self.load_app()
+
+    def new_chat(self):
+        prompt_buttons = self.wait.until(EC.presence_of_all_elements_located((By.ID, "promptButton")))
+        new_chat = next(el for el in prompt_buttons if el.text == "New Chat")
+        return self.timed_click(new_chat, "settle", self.settle_ms)
+
+    def send_message_first_token(self):
+        chat_input_bar = self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        chat_input_bar.send_keys("Journey benchmark message")
+        send = self.wait.until(EC.element_to_be_clickable((By.ID, "sendMessage")))
+        if self.real_chat:
+            # A real reply has no known first word; wait for the reply container instead
+            return self.timed_click(send, "selector", "#copyResponse")
+        return self.timed_click(send, "text", FIRST_TOKEN)
+
+    def open_assistants_tab(self):
+        tab_buttons = self.wait.until(EC.presence_of_all_elements_located((By.ID, "tabSelection")))
+        assistants = next(btn for btn in tab_buttons if "Assistants" in btn.get_attribute("title"))
+        return self.timed_click(assistants, "selector", "#addAssistantButton")
+
+    def open_admin_modal(self):
+        """ms until the admin tabs show, or None for users without the admin interface"""
+        self.wait.until(EC.element_to_be_clickable((By.ID, "userMenu"))).click()
+        admin_buttons = self.driver.find_elements(By.ID, "adminInterface")
+        self.has_admin = bool(admin_buttons)
+        if not admin_buttons:
+            self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+            return None
+        elapsed = self.timed_click(admin_buttons[0], "selector", "#tabName")
+        self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        return elapsed
+
+    def seed_folders(self):
+        # Same seeding as test_ImportExport: a chat folder per 100 conversations
+        self.reset_storage()
+        seeded = self.driver.execute_async_script(SEED_INDEXED_DB, self.items, 2, max(2, self.items // 50), 0)
+        self.assertNotIn("error", seeded, f"Seeding {self.items} conversations failed: {seeded}")
+        self.load_app(timeout=300)
+
+    def folder_sort(self, order):
+        self.wait.until(EC.element_to_be_clickable((By.ID, "promptHandler"))).click()
+        self.wait.until(EC.presence_of_element_located((By.ID, "folderSort"))).click()
+        nested = self.wait.until(EC.presence_of_all_elements_located((By.ID, "folderSort")))
+        nested[1].click()
+        button = self.wait.until(EC.presence_of_element_located((By.ID, order)))
+        return self.timed_click(button, "settle", self.settle_ms)
+
+    # ----------------- Key Journeys -----------------
+    """Repeats every journey and reports the samples and percentiles tests/budgets.py checks"""
+
+    def test_journeys(self):
+        def run_journeys():
+            # A failing run is reported on its own and leaves the journeys it did not reach out
+            timings = {}
+            with self.subTest(run=self.repetition):
+                timings["cold_start"] = self.cold_start()
+                timings["new_chat"] = self.new_chat()
+                timings["send_message_first_token"] = self.send_message_first_token()
+                timings["open_assistants_tab"] = self.open_assistants_tab()
+                timings["open_admin_modal"] = self.open_admin_modal()
+            return timings
+
+        runs = self.repeat(run_journeys, self.runs)
+        samples = {journey: [] for journey in JOURNEYS}
+        for run, timings in enumerate(runs):
+            for journey, ms in timings.items():
+                samples[journey].append(self.record(journey=journey, run=run, ms=ms)["ms"])
+
+        with self.subTest(journey="folder_sort_1k"):
+            self.seed_folders()
+            # Name and Date alternate so every click reorders the folders
+            orders = itertools.cycle(["Name", "Date"])
+
+            def sort_folders():
+                order, ms = next(orders), None
+                with self.subTest(run=self.repetition):
+                    ms = self.folder_sort(order)
+                return order, ms
+
+            for run, (order, ms) in enumerate(self.repeat(sort_folders, self.runs)):
+                samples["folder_sort_1k"].append(
+                    self.record(journey="folder_sort_1k", run=run, order=order, items=self.items, ms=ms)["ms"]
+                )
+
+        for journey, values in samples.items():
+            self.summary[journey] = robust_summary(values)
+
+        # A journey that timed out on every run must fail here, not pass the budgets as no_data
+        for journey in JOURNEYS:
+            if journey == "open_admin_modal" and not getattr(self, "has_admin", True):
+                continue
+            self.assertTrue(self.summary[journey]["samples"], f"{journey} produced no timing in any run")
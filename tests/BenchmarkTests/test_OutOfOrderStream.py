@@ -0,0 +1,143 @@
+import os
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest, summarize, slope
+from tests.standin import StandIn
+
+
+# Switches the stream to out-of-order mode and interleaves `events` tokens across
+# `sources` sources. Every checkpoint token is stamped with the time it was emitted.
+EVENTS_GENERATOR = """
+function* (request, callIndex) {
+    const sources = %(sources)d, events = %(events)d, every = %(every)d;
+    const bench = window.__oooBench;
+    yield {s: "meta", m: "out_of_order"};
+    for (let i = 0; i < events; i++) {
+        const source = String((i * 7919) %% sources);
+        if (i %% every === every - 1) {
+            const k = Math.floor(i / every);
+            bench.emitted[k] = performance.now();
+            yield {s: source, d: "CKPT" + k + "X "};
+        } else {
+            yield {s: source, d: "w" + i + " "};
+        }
+    }
+    bench.emitted.end = performance.now();
+    yield {s: "0", d: "CKPTENDX"};
+}
+"""
+
+# Checks the last message once per frame and stamps each checkpoint when it is first on screen
+RENDER_WATCHER = """
+window.__oooBench = {emitted: {}, seen: {}, frames: 0};
+const bench = window.__oooBench;
+const checkpoints = arguments[0];
+let next = 0;
+const frame = () => {
+    bench.frames++;
+    const messages = document.querySelectorAll('#chatHover');
+    const last = messages.length ? messages[messages.length - 1] : null;
+    const text = last ? last.textContent : '';
+    const now = performance.now();
+    while (next < checkpoints && text.includes('CKPT' + next + 'X')) {
+        bench.seen[next++] = now;
+    }
+    if (text.includes('CKPTENDX')) {
+        bench.seen.end = now;
+        return;
+    }
+    requestAnimationFrame(frame);
+};
+requestAnimationFrame(frame);
+"""
+
+CPU_METRICS = ["ScriptDuration", "TaskDuration", "LayoutDuration", "RecalcStyleDuration"]
+
+
+class OutOfOrderStreamBenchmark(BenchmarkTest):
+    """Floods out-of-order, multi-source chat streams through utils/app/outOfOrder.ts.
+
+    OOO_BENCH_SOURCES and OOO_BENCH_EVENTS (comma separated) form the matrix;
+    OOO_BENCH_BATCH events are sent per chunk every OOO_BENCH_INTERVAL_MS.
+    """
+
+    CHECKPOINTS = 20
+
+    def setUp(self):
+        self.require_chat_endpoint()
+        self.sources = [int(s) for s in os.getenv("OOO_BENCH_SOURCES", "1,4,16,64").split(",")]
+        self.events = [int(e) for e in os.getenv("OOO_BENCH_EVENTS", "500,2000,10000").split(",")]
+        self.batch = int(os.getenv("OOO_BENCH_BATCH", "10"))
+        self.interval_ms = int(os.getenv("OOO_BENCH_INTERVAL_MS", "5"))
+        self.timeout = float(os.getenv("OOO_BENCH_TIMEOUT", "300"))
+        self.stand_in = StandIn()
+        super().setUp(headless=True)
+
+    # ----------------- Helpers -----------------
+    def stream_events(self, sources, events):
+        """Point the chat endpoint at an out-of-order stream and reload the app"""
+        every = max(1, events // self.CHECKPOINTS)
+        self.stand_in.rules = []
+        self.stand_in.stream(
+            self.chat_endpoint,
+            generator=EVENTS_GENERATOR % {"sources": sources, "events": events, "every": every},
+            interval_ms=self.interval_ms,
+            batch=self.batch,
+        )
+        self.stand_in.install(self.driver)
+        self.driver.get(self.base_url)
+        self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        return events // every
+
+    def cpu_seconds(self):
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in metrics}
+        return {name: values.get(name, 0) for name in CPU_METRICS}
+
+    # ----------------- Out-of-Order Stream -----------------
+    """Records render-to-screen latency and main-thread time as sources and events grow"""
+
+    def test_out_of_order_stream(self):
+        for sources in self.sources:
+            for events in self.events:
+                with self.subTest(sources=sources, events=events):
+                    checkpoints = self.stream_events(sources, events)
+                    self.driver.execute_script(RENDER_WATCHER, checkpoints)
+                    # Restart the Performance domain so the durations cover only this stream
+                    self.driver.execute_cdp_cmd("Performance.disable", {})
+                    self.driver.execute_cdp_cmd("Performance.enable", {})
+                    # Nothing left over from a subtest that failed before draining
+                    StandIn.drain_log(self.driver)
+
+                    self.send_message(f"Out of order stream with {sources} sources and {events} events")
+                    rendered = self.wait_until(
+                        lambda: self.driver.execute_script("return 'end' in window.__oooBench.seen;"),
+                        timeout=self.timeout,
+                        interval=0.2,
+                    )
+                    self.assertIsNotNone(rendered, f"The final event was not rendered within {self.timeout}s")
+                    cpu = self.cpu_seconds()
+                    bench = self.driver.execute_script("return window.__oooBench;")
+                    stream = next((e for e in StandIn.drain_log(self.driver) if e["type"] == "stream"), None)
+                    if stream is None:
+                        self.fail("The chat request was not served by the stand-in stream")
+
+                    indices = sorted(int(k) for k in bench["seen"] if k != "end" and k in bench["emitted"])
+                    latencies = [bench["seen"][str(k)] - bench["emitted"][str(k)] for k in indices]
+                    total_ms = bench["seen"]["end"] - stream["start"]
+                    self.record(
+                        sources=sources,
+                        events=events,
+                        events_per_second=events / (total_ms / 1000.0) if total_ms else None,
+                        total_ms=total_ms,
+                        stream_ms=(stream["end"] - stream["start"]) if stream.get("end") else None,
+                        final_render_lag_ms=bench["seen"]["end"] - bench["emitted"]["end"],
+                        render_latency_ms=summarize(latencies),
+                        # ms of extra latency per checkpoint; growth here is the getText rebuild cost
+                        latency_slope=slope(indices, latencies) if len(indices) > 1 else None,
+                        frames=bench["frames"],
+                        script_ms=cpu["ScriptDuration"] * 1000,
+                        task_ms=cpu["TaskDuration"] * 1000,
+                        layout_ms=cpu["LayoutDuration"] * 1000,
+                        style_ms=cpu["RecalcStyleDuration"] * 1000,
+                    )
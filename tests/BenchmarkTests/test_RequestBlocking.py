@@ -0,0 +1,73 @@
+import os
+import time
+from tests.bench import BenchmarkTest, summarize, INTERACTIVE_PROBE, LOAD_TIMINGS
+from tests.cdp import add_init_script
+from tests import blocking
+
+
+TIMING_FIELDS = ["dom_content_loaded_ms", "load_ms", "interactive_ms"]
+
+
+class RequestBlockingBenchmark(BenchmarkTest):
+    """Cold page loads with and without each blocking profile from tests/blocking.py.
+
+    BLOCK_BENCH_PROFILES lists the profiles (default third_party,images,all),
+    BLOCK_BENCH_LOADS the loads per mode and BLOCK_BENCH_SETTLE_MS how long to
+    keep counting requests after the app is interactive, so late analytics
+    calls are included.
+    """
+
+    def setUp(self):
+        self.profiles = os.getenv("BLOCK_BENCH_PROFILES", "third_party,images,all").split(",")
+        self.loads = int(os.getenv("BLOCK_BENCH_LOADS", "5"))
+        self.settle_ms = int(os.getenv("BLOCK_BENCH_SETTLE_MS", "2000"))
+        super().setUp(headless=True)
+        add_init_script(self.driver, INTERACTIVE_PROBE)
+
+    # ----------------- Helpers -----------------
+    def measure_load(self, url_patterns, attribute_to):
+        """One cold load blocking url_patterns; bytes of URLs matching attribute_to are counted separately"""
+        blocking.apply(self.driver, url_patterns)
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        self.cdp_events.clear()
+        self.load_app()
+        time.sleep(self.settle_ms / 1000)
+        timings = self.driver.execute_script(LOAD_TIMINGS)
+        return {**timings, **blocking.network_cost(self.cdp_events.poll(), attribute_to)}
+
+    def summarize_loads(self, loads):
+        fields = TIMING_FIELDS + ["requests", "bytes", "blocked_requests", "matched_requests", "matched_bytes"]
+        return {field: summarize([load[field] for load in loads if load[field] is not None]) for field in fields}
+
+    # ----------------- Request Blocking -----------------
+    """Records requests, bytes and load milestones per profile and what blocking it saves"""
+
+    def test_request_blocking(self):
+        for profile in self.profiles:
+            url_patterns = blocking.patterns(profile)
+            with self.subTest(profile=profile):
+                modes = {}
+                # Alternate so drift in the server or network hits both modes alike
+                for _ in range(self.loads):
+                    modes.setdefault("without", []).append(self.measure_load([], url_patterns))
+                    modes.setdefault("with", []).append(self.measure_load(url_patterns, url_patterns))
+
+                stats = {mode: self.summarize_loads(loads) for mode, loads in modes.items()}
+                for mode, mode_stats in stats.items():
+                    self.record(profile=profile, mode=mode, patterns=url_patterns, loads=self.loads, **mode_stats)
+
+                without, blocked = stats["without"], stats["with"]
+
+                def median(mode_stats, field):
+                    return mode_stats[field].get("p50", 0)
+
+                self.summary[profile] = {
+                    "requests_saved": median(without, "requests") - median(blocked, "requests"),
+                    "bytes_saved": median(without, "bytes") - median(blocked, "bytes"),
+                    "matched_bytes_unblocked": median(without, "matched_bytes"),
+                    **{
+                        f"{field}_saved": median(without, field) - median(blocked, field)
+                        for field in TIMING_FIELDS
+                    },
+                }
+                self.assertEqual(median(blocked, "matched_bytes"), 0, f"{profile} requests still transferred bytes")
@@ -0,0 +1,172 @@
+import os
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest, summarize
+from tests.standin import StandIn
+
+
+TRIGGER = "Run the polling simulation"
+PLACEHOLDER = "I'm still working on that. I'll check back in a bit."
+RETRY_MESSAGE = "Still working on the simulated job."
+
+# The assistant answers the trigger with an invoke block; InvokeBlock runs it, and the
+# result the app sends back afterwards (content {"result": ...}) is answered with plain text
+CHAT_GENERATOR = """
+function* (request, callIndex) {
+    const messages = (request && request.messages) || [];
+    const last = messages.length ? messages[messages.length - 1] : null;
+    const content = last && typeof last.content === 'string' ? last.content : '';
+    if (content.includes(%(trigger)s)) {
+        yield {s: "0", d: "Starting the job.\\n\\n```invoke\\n{name: 'pollSim', payload: {}}\\n```\\n"};
+    } else {
+        if (window.__pollSim && content.includes('"result"')) window.__pollSim.followUpAt = performance.now();
+        yield {s: "0", d: "Result received."};
+    }
+}
+"""
+
+# /execute-custom-auto: start the simulated job and ask the client to poll
+EXECUTE_HANDLER = """
+(payload, opData, callIndex) => {
+    window.__pollSim = {startedAt: performance.now(), polls: []};
+    return {success: true, data: {retryIn: %(retry_in)d, jobId: 'sim-' + callIndex}};
+}
+"""
+
+# /get-job-result: the job is ready once ready_ms have passed since it started;
+# until then the server hints the next retryIn/sleepTime
+POLL_HANDLER = """
+(payload, opData, callIndex) => {
+    const sim = window.__pollSim;
+    const at = performance.now() - sim.startedAt;
+    const ready = %(ready_ms)d >= 0 && at >= %(ready_ms)d;
+    sim.polls.push({at: at, ready: ready, jobId: (payload && payload.jobId) || null});
+    if (ready) return {success: true, data: {value: 'simulated result'}};
+    const data = {retryIn: %(retry_in)d, retryMessage: %(retry_message)s, jobId: 'sim-0'};
+    if (%(sleep_ms)d > 0) data.sleepTime = %(sleep_ms)d;
+    return {success: true, data: data};
+}
+"""
+
+# Returns the simulation state and how many polling placeholders are on screen
+POLL_PROBE = """
+const [placeholder, retryMessage] = arguments;
+const text = Array.from(document.querySelectorAll('#chatHover')).map(m => m.textContent);
+return Object.assign({
+    now: performance.now(),
+    placeholders: text.filter(t => t.includes(placeholder) || t.includes(retryMessage)).length,
+}, window.__pollSim || {});
+"""
+
+# Candidate client schedules for the offline comparison: delay in ms before each poll
+CANDIDATE_SCHEDULES = {
+    "backoff_250ms": [250 * 2 ** i for i in range(7)],
+    "fixed_1s": [1000] * 30,
+    "fixed_2s": [2000] * 15,
+}
+
+
+def current_schedule(retry_in, sleep_ms, max_polls=3):
+    """Poll delays pollForResult produces for the given server hints.
+
+    InvokeBlock starts polling with {retryIn: 1000} and no sleepTime, so the
+    first poll waits 1000ms in pollForResult plus getAsyncResult's 1000ms default.
+    """
+    later = retry_in + (sleep_ms or 1000)
+    return [2000] + [later] * (max_polls - 1)
+
+
+def simulate(delays, ready_ms):
+    """Replay a poll schedule against a job that is ready after ready_ms (-1: never)"""
+    at, polls = 0, 0
+    for delay in delays:
+        at += delay
+        polls += 1
+        if 0 <= ready_ms <= at:
+            return {"polls": polls, "wasted_polls": polls - 1, "time_to_result_ms": at,
+                    "pickup_delay_ms": at - ready_ms, "delivered": True}
+    return {"polls": polls, "wasted_polls": polls, "time_to_result_ms": None,
+            "pickup_delay_ms": None, "delivered": False}
+
+
+class ResultPollingBenchmark(BenchmarkTest):
+    """Drives utils/app/resultPolling.ts through an invoke block against a stand-in job.
+
+    RESULT_POLL_READY_MS lists when the simulated job becomes ready (ms after it
+    starts, -1 for never); RESULT_POLL_RETRY_IN and RESULT_POLL_SLEEP_MS are the
+    retryIn/sleepTime hints the job returns while it is not ready, and
+    RESULT_POLL_RUNS repeats each readiness point.
+    """
+
+    def setUp(self):
+        self.require_chat_endpoint()
+        self.ready_points = [int(r) for r in os.getenv("RESULT_POLL_READY_MS", "0,1500,3000,5000,8000,-1").split(",")]
+        self.retry_in = int(os.getenv("RESULT_POLL_RETRY_IN", "1000"))
+        self.sleep_ms = int(os.getenv("RESULT_POLL_SLEEP_MS", "0"))
+        self.runs = int(os.getenv("RESULT_POLL_RUNS", "3"))
+        self.timeout = float(os.getenv("RESULT_POLL_TIMEOUT", "60"))
+        self.stand_in = StandIn()
+        super().setUp(headless=True)
+
+    # ----------------- Helpers -----------------
+    def install_job(self, ready_ms):
+        """Point the stand-in at a job that is ready after ready_ms and reload the app"""
+        self.stand_in.rules = []
+        self.stand_in.op("/feature_flags", response={"success": True, "data": {"assistantApis": True}})
+        self.stand_in.op("/execute-custom-auto", handler=EXECUTE_HANDLER % {"retry_in": self.retry_in})
+        self.stand_in.op("/get-job-result", handler=POLL_HANDLER % {
+            "ready_ms": ready_ms, "retry_in": self.retry_in, "sleep_ms": self.sleep_ms,
+            "retry_message": repr(RETRY_MESSAGE),
+        })
+        self.stand_in.stream(self.chat_endpoint, generator=CHAT_GENERATOR % {"trigger": repr(TRIGGER)})
+        self.stand_in.install(self.driver)
+        self.driver.get(self.base_url)
+        self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+
+    def probe(self):
+        return self.driver.execute_script(POLL_PROBE, PLACEHOLDER, RETRY_MESSAGE)
+
+    # ----------------- Result Polling -----------------
+    """Runs each readiness point end to end and compares the current schedule with candidates"""
+
+    def test_result_polling(self):
+        for ready_ms in self.ready_points:
+            with self.subTest(ready_ms=ready_ms):
+                rows = []
+                for run in range(self.runs):
+                    self.install_job(ready_ms)
+                    self.send_message(TRIGGER)
+                    finished = self.wait_until(lambda: "followUpAt" in self.probe(), timeout=self.timeout)
+                    self.assertIsNotNone(finished, f"The polling flow did not finish within {self.timeout}s")
+
+                    sim = self.probe()
+                    polls = sim["polls"]
+                    delivered = bool(polls) and polls[-1]["ready"]
+                    ready_at = polls[-1]["at"] if delivered else None
+                    rows.append(self.record(
+                        ready_ms=ready_ms,
+                        run=run,
+                        delivered=delivered,
+                        polls=len(polls),
+                        wasted_polls=sum(1 for p in polls if not p["ready"]),
+                        placeholders=sim["placeholders"],
+                        poll_offsets_ms=[p["at"] for p in polls],
+                        first_poll_job_id=polls[0]["jobId"] if polls else None,
+                        time_to_result_ms=ready_at,
+                        pickup_delay_ms=(ready_at - ready_ms) if delivered else None,
+                        end_to_end_ms=sim["followUpAt"] - sim["startedAt"],
+                    ))
+
+                schedule = current_schedule(self.retry_in, self.sleep_ms)
+                self.summary[str(ready_ms)] = {
+                    "delivered_rate": sum(r["delivered"] for r in rows) / len(rows),
+                    "polls": summarize([r["polls"] for r in rows]),
+                    "wasted_polls": summarize([r["wasted_polls"] for r in rows]),
+                    "placeholders": summarize([r["placeholders"] for r in rows]),
+                    "time_to_result_ms": summarize([r["time_to_result_ms"] for r in rows]),
+                    "end_to_end_ms": summarize([r["end_to_end_ms"] for r in rows]),
+                    "model": {
+                        "current": simulate(schedule, ready_ms),
+                        **{name: simulate(delays, ready_ms) for name, delays in CANDIDATE_SCHEDULES.items()},
+                    },
+                }
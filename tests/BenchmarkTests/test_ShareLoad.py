@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tests.bench import BenchmarkTest, summarize
+from tests.requestop_client import ApiClient, cookie_header
+
+
+SHARE_OPS = ["share", "list", "load", "you_shared", "delete_shared", "delete_you_shared"]
+
+
+def shared_data(name):
+    """ExportFormatV4 with one small conversation, like ShareAnythingModal sends"""
+    return {
+        "version": 4,
+        "history": [{
+            "id": str(uuid.uuid4()), "name": name, "folderId": None, "prompt": "", "temperature": 0.5,
+            "model": {"id": "gpt-4o"},
+            "messages": [
+                {"role": "user", "content": "Share load test", "id": str(uuid.uuid4()), "type": "chat", "data": {}},
+                {"role": "assistant", "content": "Shared reply", "id": str(uuid.uuid4()), "type": "chat", "data": {}},
+            ],
+        }],
+        "folders": [],
+        "prompts": [],
+    }
+
+
+def find_item(body, note):
+    """First dict in a list response whose JSON mentions note"""
+    items = body
+    if isinstance(body, dict):
+        items = body.get("items") or body.get("item") or body.get("data") or []
+        if isinstance(items, dict):
+            items = items.get("items") or items.get("data") or []
+    if not isinstance(items, list):
+        return None
+    return next((item for item in items if isinstance(item, dict) and note in json.dumps(item)), None)
+
+
+class ShareLoadTest(BenchmarkTest):
+    """Drives share, accept (load) and delete from many clients at once.
+
+    The browser logs in once; every simulated user is an ApiClient on the same
+    session calling /api/requestOp (/state/share, /state/share/load) and the
+    /api/share/* routes. SHARE_LOAD_USERS lists the concurrency levels,
+    SHARE_LOAD_ITERATIONS the cycles per user and SHARE_LOAD_RECIPIENTS who the
+    items are shared with (default: the test user).
+    """
+
+    def setUp(self):
+        self.levels = [int(k) for k in os.getenv("SHARE_LOAD_USERS", "1,5,10,25").split(",")]
+        self.iterations = int(os.getenv("SHARE_LOAD_ITERATIONS", "5"))
+        self.recipients = [r for r in os.getenv("SHARE_LOAD_RECIPIENTS", self.username).split(",") if r]
+        super().setUp(headless=True)
+        self.client = ApiClient(self.base_url, cookie_header(self.driver))
+
+    # ----------------- Helpers -----------------
+    def share_cycle(self, user, iteration, calls):
+        """One share -> list -> load -> you-shared -> delete round for one simulated user"""
+        note = f"share-load-{user}-{iteration}-{uuid.uuid4().hex[:8]}"
+
+        def timed(op, response):
+            calls.append({
+                "op": op, "user": user, "ms": response.seconds * 1000, "status": response.status,
+                "ok": response.ok, "error": response.error, "at": time.perf_counter(),
+            })
+            return response
+
+        timed("share", self.client.request_op("POST", "/state", "/share", data={
+            "note": note, "sharedWith": self.recipients, "sharedData": shared_data(note),
+        }))
+        listed = timed("list", self.client.request_op("GET", "/state", "/share"))
+        item = find_item(listed.body, note) if listed.ok else None
+        if item and item.get("key"):
+            timed("load", self.client.request_op("POST", "/state", "/share/load", data={"key": item["key"]}))
+
+        you_shared = timed("you_shared", self.client.call("GET", "/api/share/youshared"))
+        if item:
+            timed("delete_shared", self.client.call("POST", "/api/share/delete", {"op": "/delete", "data": item}))
+        mine = find_item(you_shared.body, note) if you_shared.ok else None
+        if mine and mine.get("id"):
+            timed("delete_you_shared", self.client.call("POST", "/api/share/deleteyoushared", {
+                "op": "/delete", "data": {"id": mine["id"], "shared_users": mine.get("shared_with")},
+            }))
+
+    def run_level(self, users):
+        calls = []
+        barrier = threading.Barrier(users)
+
+        def worker(user):
+            # Every user starts at the same moment so the first requests really overlap
+            barrier.wait()
+            for iteration in range(self.iterations):
+                self.share_cycle(user, iteration, calls)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            list(pool.map(worker, range(users)))
+        return calls, time.perf_counter() - start
+
+    # ----------------- Share Load -----------------
+    """Runs every concurrency level and reports throughput, latency percentiles and error rates per op"""
+
+    def test_share_load(self):
+        self.assertTrue(self.recipients, "SHARE_LOAD_RECIPIENTS or SELENIUM_USERNAME is needed to share items")
+        for users in self.levels:
+            with self.subTest(users=users):
+                calls, seconds = self.run_level(users)
+                per_op = {}
+                for op in SHARE_OPS:
+                    op_calls = [c for c in calls if c["op"] == op]
+                    if not op_calls:
+                        continue
+                    errors = [c for c in op_calls if not c["ok"]]
+                    per_op[op] = {
+                        "calls": len(op_calls),
+                        "error_rate": len(errors) / len(op_calls),
+                        "errors": sorted({c["error"] or f"HTTP {c['status']}" for c in errors}),
+                        "latency_ms": summarize([c["ms"] for c in op_calls]),
+                    }
+                row = self.record(
+                    users=users,
+                    iterations=self.iterations,
+                    seconds=seconds,
+                    calls=len(calls),
+                    throughput_per_second=len(calls) / seconds if seconds else None,
+                    cycles_per_second=users * self.iterations / seconds if seconds else None,
+                    error_rate=sum(1 for c in calls if not c["ok"]) / len(calls) if calls else None,
+                    ops=per_op,
+                )
+                self.summary[str(users)] = {
+                    key: row[key] for key in ("throughput_per_second", "cycles_per_second", "error_rate")
+                }
+                self.summary[str(users)]["p95_ms"] = {op: stats["latency_ms"]["p95"] for op, stats in per_op.items()}
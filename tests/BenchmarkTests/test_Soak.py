@@ -0,0 +1,222 @@
+import os
+import time
+import random
+import unittest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import UnexpectedAlertPresentException
+from tests.bench import BenchmarkTest, slope
+from tests.cdp import heap_usage
+from tests.standin import StandIn
+
+
+# Heap or DOM growth beyond this fraction between the first and last quarter of the run is flagged
+GROWTH_THRESHOLD = float(os.getenv("SOAK_GROWTH_THRESHOLD", "0.2"))
+
+
+class SoakTest(BenchmarkTest):
+    """Replays a mix of everyday flows in one browser session for a long time.
+
+    After every flow the page is garbage collected and the JS heap and DOM node
+    count are sampled, so steady growth shows up in the report together with
+    the flows that caused it. A failed flow is cleaned up in place; only when
+    that fails is the page reloaded, which starts a new segment that is
+    analysed on its own. Runs only when SOAK_MINUTES is set; SOAK_SEED
+    fixes the flow order and SOAK_REAL_CHAT=1 sends messages to the real chat
+    endpoint instead of the stand-in.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        if not os.getenv("SOAK_MINUTES"):
+            raise unittest.SkipTest("Soak mode only runs with SOAK_MINUTES set")
+        super().setUpClass()
+
+    def setUp(self):
+        if os.getenv("SOAK_REAL_CHAT") != "1":
+            self.require_chat_endpoint()
+        self.minutes = float(os.getenv("SOAK_MINUTES"))
+        self.rng = random.Random(int(os.getenv("SOAK_SEED", "216")))
+        if os.getenv("SOAK_REAL_CHAT") != "1":
+            self.stand_in = StandIn().stream(
+                self.chat_endpoint,
+                events=[{"s": "0", "d": "Soak reply " + "lorem ipsum " * 50}],
+            )
+        super().setUp(headless=True)
+
+    # ----------------- Flows -----------------
+    def flow_send_message(self):
+        prompt_buttons = self.wait.until(EC.presence_of_all_elements_located((By.ID, "promptButton")))
+        next(el for el in prompt_buttons if el.text == "New Chat").click()
+
+        replies = len(self.driver.find_elements(By.ID, "copyResponse"))
+        chat_input_bar = self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        chat_input_bar.send_keys("Soak test message")
+        self.wait.until(EC.element_to_be_clickable((By.ID, "sendMessage"))).click()
+        self.wait.until(lambda d: len(d.find_elements(By.ID, "copyResponse")) > replies)
+
+    def flow_clear_chats(self):
+        # Keeps the conversation list bounded so chat history alone does not look like a leak
+        self.wait.until(EC.element_to_be_clickable((By.ID, "promptHandler"))).click()
+        self.wait.until(EC.element_to_be_clickable((By.ID, "Delete"))).click()
+        select_all_check = self.wait.until(EC.presence_of_element_located((By.ID, "selectAllCheck")))
+        select_all_check.find_element(By.XPATH, ".//input[@type='checkbox']").click()
+        self.wait.until(EC.element_to_be_clickable((By.ID, "confirmItem"))).click()
+
+    def flow_open_settings_modal(self):
+        self.wait.until(EC.element_to_be_clickable((By.ID, "userMenu"))).click()
+        self.wait.until(EC.element_to_be_clickable((By.ID, "settingsInterface"))).click()
+        self.wait.until(EC.visibility_of_element_located((By.ID, "modalTitle")))
+        buttons = self.wait.until(EC.presence_of_all_elements_located((By.ID, "confirmationButton")))
+        cancel = next((b for b in buttons if b.text == "Cancel"), None)
+        if cancel:
+            cancel.click()
+        else:
+            self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        self.wait.until(EC.invisibility_of_element_located((By.ID, "modalTitle")))
+
+    def flow_switch_tabs(self):
+        tabs = self.wait.until(EC.presence_of_all_elements_located((By.ID, "tabSelection")))
+        for tab in tabs:
+            tab.click()
+        tabs[0].click()
+
+    def flow_create_delete_folder(self):
+        self.wait.until(EC.element_to_be_clickable((By.ID, "createFolderButton"))).click()
+        alert = self.wait.until(EC.alert_is_present())
+        alert.send_keys(f"Soak Folder {int(time.time())}")
+        alert.accept()
+
+        self.wait.until(EC.element_to_be_clickable((By.ID, "promptHandler"))).click()
+        self.wait.until(EC.element_to_be_clickable((By.ID, "folderSort"))).click()
+        self.wait.until(EC.presence_of_all_elements_located((By.ID, "Delete")))[-1].click()
+        select_all_check = self.wait.until(EC.presence_of_element_located((By.ID, "selectAllCheck")))
+        select_all_check.find_element(By.XPATH, ".//input[@type='checkbox']").click()
+        self.wait.until(EC.element_to_be_clickable((By.ID, "confirmItem"))).click()
+
+    FLOWS = {
+        "send_message": flow_send_message,
+        "clear_chats": flow_clear_chats,
+        "open_settings_modal": flow_open_settings_modal,
+        "switch_tabs": flow_switch_tabs,
+        "create_delete_folder": flow_create_delete_folder,
+    }
+
+    def recover(self):
+        """Back to the chat view without reloading: dismiss alerts, close menus and modals; True on success"""
+        try:
+            self.driver.switch_to.alert.dismiss()
+        except Exception:
+            pass
+        try:
+            body = self.driver.find_element(By.TAG_NAME, "body")
+            for _ in range(3):
+                body.send_keys(Keys.ESCAPE)
+            return (
+                bool(self.driver.find_elements(By.ID, "messageChatInputText"))
+                and not self.driver.find_elements(By.ID, "modalTitle")
+            )
+        except Exception:
+            return False
+
+    # ----------------- Analysis -----------------
+    def growth(self, samples):
+        """Heap/DOM growth between the first and last quarter of one segment's samples"""
+        quarter = max(1, len(samples) // 4)
+        analysis = {"samples": len(samples)}
+        for metric in ("js_heap_used", "dom_nodes"):
+            xs = [s["elapsed_seconds"] / 3600.0 for s in samples]
+            ys = [s[metric] for s in samples]
+            first = sorted(ys[:quarter])[quarter // 2]
+            last = sorted(ys[-quarter:])[quarter // 2]
+            growth = (last - first) / first if first else 0.0
+            analysis[metric] = {
+                "first_quarter_median": first,
+                "last_quarter_median": last,
+                "growth": growth,
+                "per_hour": slope(xs, ys),
+                "flagged": growth > GROWTH_THRESHOLD and slope(xs, ys) > 0,
+            }
+        return analysis
+
+    def analyze(self, samples):
+        """Flag steady heap/DOM growth per segment and attribute the growth to flows"""
+        segments = {}
+        for s in samples:
+            segments.setdefault(s["segment"], []).append(s)
+        analysis = {"segments": [self.growth(segment) for _, segment in sorted(segments.items())]}
+        for metric in ("js_heap_used", "dom_nodes"):
+            analysis[metric] = {"flagged": any(segment[metric]["flagged"] for segment in analysis["segments"])}
+
+        attribution = {}
+        for s in samples:
+            flow = attribution.setdefault(s["flow"], {"runs": 0, "heap_delta": 0, "dom_delta": 0})
+            flow["runs"] += 1
+            flow["heap_delta"] += s["heap_delta"]
+            flow["dom_delta"] += s["dom_delta"]
+        for flow in attribution.values():
+            flow["heap_delta_per_run"] = flow["heap_delta"] / flow["runs"]
+            flow["dom_delta_per_run"] = flow["dom_delta"] / flow["runs"]
+        analysis["flows"] = dict(
+            sorted(attribution.items(), key=lambda item: -item[1]["heap_delta"])
+        )
+        return analysis
+
+    # ----------------- Soak -----------------
+    """Runs random flows for SOAK_MINUTES and fails if the heap or DOM keeps growing"""
+
+    def test_soak(self):
+        self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        start = time.time()
+        previous = heap_usage(self.driver, collect_garbage=True)
+        samples = []
+        segment = 0
+
+        while time.time() - start < self.minutes * 60:
+            name = self.rng.choice(list(self.FLOWS))
+            flow_start = time.perf_counter()
+            error = None
+            reload = False
+            try:
+                self.FLOWS[name](self)
+            except UnexpectedAlertPresentException as e:
+                error = f"alert: {e.alert_text}"
+                reload = not self.recover()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                reload = not self.recover()
+
+            usage = heap_usage(self.driver, collect_garbage=True)
+            sample = self.record(
+                flow=name,
+                segment=segment,
+                reloaded=reload,
+                elapsed_seconds=time.time() - start,
+                flow_seconds=time.perf_counter() - flow_start,
+                error=error,
+                js_heap_used=usage["js_heap_used"],
+                dom_nodes=usage["dom_nodes"],
+                heap_delta=usage["js_heap_used"] - previous["js_heap_used"],
+                dom_delta=usage["dom_nodes"] - previous["dom_nodes"],
+            )
+            samples.append(sample)
+            previous = usage
+
+            if reload:
+                # A reload resets the heap and DOM, so what follows is analysed as a new segment
+                self.driver.get(self.base_url)
+                self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+                previous = heap_usage(self.driver, collect_garbage=True)
+                segment += 1
+
+        self.assertTrue(samples, f"No flow finished within SOAK_MINUTES={os.getenv('SOAK_MINUTES')}")
+        analysis = self.analyze(samples)
+        self.summary.update(analysis)
+        print(f"Soak analysis: {analysis}")
+
+        leaks = [metric for metric in ("js_heap_used", "dom_nodes") if analysis[metric]["flagged"]]
+        self.assertFalse(
+            leaks,
+            f"Monotonic growth detected in {leaks}; top flows: {list(analysis['flows'])[:2]}",
+        )
@@ -0,0 +1,83 @@
+import os
+from tests.bench import BenchmarkTest, summarize, robust_summary, INTERACTIVE_PROBE
+from tests.cdp import add_init_script
+
+
+# Navigation timing, Next.js bundle resources and the hydration mark for the current document
+STARTUP_TIMINGS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const scripts = performance.getEntriesByType('resource').filter(
+    r => r.initiatorType === 'script' || r.name.endsWith('.js')
+);
+const nextScripts = scripts.filter(r => r.name.includes('/_next/'));
+const hydration = performance.getEntriesByName('Next.js-hydration')[0];
+const afterHydrate = performance.getEntriesByName('afterHydrate')[0];
+return {
+    ttfb_ms: nav.responseStart - nav.requestStart,
+    html_ms: nav.responseEnd - nav.startTime,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd - nav.startTime,
+    load_ms: nav.loadEventEnd - nav.startTime,
+    js_files: nextScripts.length,
+    js_transfer_bytes: nextScripts.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+    js_decoded_bytes: nextScripts.reduce((sum, r) => sum + (r.decodedBodySize || 0), 0),
+    js_download_end_ms: nextScripts.reduce((end, r) => Math.max(end, r.responseEnd), 0),
+    hydration_ms: hydration ? hydration.duration : null,
+    hydrated_at_ms: afterHydrate ? afterHydrate.startTime : (hydration ? hydration.startTime + hydration.duration : null),
+    interactive_ms: window.__amplifyInteractiveAt,
+};
+"""
+
+TIMING_FIELDS = [
+    "ttfb_ms", "html_ms", "dom_content_loaded_ms", "load_ms", "js_download_end_ms",
+    "script_ms", "hydrated_at_ms", "interactive_ms",
+]
+
+
+class StartupBenchmark(BenchmarkTest):
+    """Cold and warm loads of base_url timed from navigation start to an interactive chat input.
+
+    Cold loads clear the HTTP cache first. STARTUP_BENCH_LOADS sets the number of
+    loads per mode (default 10), after one warmup load.
+    """
+
+    def setUp(self):
+        self.loads = int(os.getenv("STARTUP_BENCH_LOADS", "10"))
+        super().setUp(headless=True)
+        add_init_script(self.driver, INTERACTIVE_PROBE)
+
+    # ----------------- Helpers -----------------
+    def measure_load(self, cold):
+        if cold:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        # Restart the Performance domain so script time covers only this load
+        self.driver.execute_cdp_cmd("Performance.disable", {})
+        self.driver.execute_cdp_cmd("Performance.enable", {})
+
+        self.driver.get(self.base_url)
+        interactive = self.wait_until(
+            lambda: self.driver.execute_script("return window.__amplifyInteractiveAt;") is not None,
+            timeout=120,
+        )
+        self.assertIsNotNone(interactive, "Chat input never became interactive")
+
+        timings = self.driver.execute_script(STARTUP_TIMINGS)
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in metrics}
+        # Script evaluation including bundle parse/compile, in milliseconds
+        timings["script_ms"] = values.get("ScriptDuration", 0) * 1000
+        timings["task_ms"] = values.get("TaskDuration", 0) * 1000
+        return timings
+
+    # ----------------- Startup -----------------
+    """Loads the home page cold and warm and reports percentiles of each startup milestone"""
+
+    def test_startup(self):
+        for mode in ("cold", "warm"):
+            # The warmup load primes the server (and the cache for warm loads)
+            loads = self.repeat(lambda: self.measure_load(cold=mode == "cold"), self.loads)
+            rows = [self.record(mode=mode, **load) for load in loads]
+            self.summary[mode] = {
+                field: summarize([row[field] for row in rows]) for field in TIMING_FIELDS
+            }
+            self.summary[mode]["interactive_ms_robust"] = robust_summary([row["interactive_ms"] for row in rows])
+            print(f"{mode} startup: {self.summary[mode]['interactive_ms']}")
@@ -0,0 +1,171 @@
+import os
+import time
+from tests.bench import BenchmarkTest, summarize, INTERACTIVE_PROBE
+from tests.cdp import add_init_script
+
+
+# Times every IndexedDB get/put/delete the app issues and every localStorage key the migration removes
+STORAGE_PROBE = """
+(function () {
+    if (window.__storageBench) return;
+    const bench = window.__storageBench = {ops: [], removed: {}};
+
+    const wrap = (name) => {
+        const original = IDBObjectStore.prototype[name];
+        IDBObjectStore.prototype[name] = function (...args) {
+            const start = performance.now();
+            const request = original.apply(this, args);
+            const key = name === 'put' ? (args[0] && args[0].key) : args[0];
+            request.addEventListener('success', () => {
+                const value = name === 'put' ? args[0] && args[0].value : request.result && request.result.value;
+                bench.ops.push({
+                    op: name, key: String(key), start: start, ms: performance.now() - start,
+                    bytes: typeof value === 'string' ? value.length : 0,
+                });
+            });
+            return request;
+        };
+    };
+    ['get', 'put', 'delete'].forEach(wrap);
+
+    const removeItem = Storage.prototype.removeItem;
+    Storage.prototype.removeItem = function (key) {
+        if (this === window.localStorage) bench.removed[key] = performance.now();
+        return removeItem.call(this, key);
+    };
+})();
+"""
+
+# Fills localStorage the way a long-time user's browser looks before the IndexedDB upgrade
+SEED_LOCAL_STORAGE = """
+const [conversations, messages, messageChars, folders, prompts] = arguments;
+const text = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. '.repeat(Math.ceil(messageChars / 57)).slice(0, messageChars);
+const folderList = [];
+for (let f = 0; f < folders; f++) {
+    folderList.push({id: 'folder-' + f, name: 'Folder ' + f, type: f % 2 ? 'prompt' : 'chat', date: '2024-01-01'});
+}
+const conversationList = [];
+for (let c = 0; c < conversations; c++) {
+    const messageList = [];
+    for (let m = 0; m < messages; m++) {
+        messageList.push({role: m % 2 ? 'assistant' : 'user', content: text, id: 'm-' + c + '-' + m, type: 'chat', data: {}});
+    }
+    conversationList.push({
+        id: 'conv-' + c, name: 'Conversation ' + c, messages: messageList,
+        model: {id: 'gpt-4o'}, prompt: '', temperature: 0.5,
+        folderId: folders ? 'folder-' + (c % folders) : null, tags: [], isLocal: true,
+    });
+}
+const promptList = [];
+for (let p = 0; p < prompts; p++) {
+    promptList.push({id: 'prompt-' + p, name: 'Prompt ' + p, description: '', content: text, folderId: null, type: 'prompt'});
+}
+const entries = {
+    conversationHistory: JSON.stringify(conversationList),
+    folders: JSON.stringify(folderList),
+    prompts: JSON.stringify(promptList),
+    workflows: '[]',
+    workspaces: '[]',
+    settings: JSON.stringify({theme: 'dark', featureOptions: {}, hiddenModelIds: []}),
+    showChatbar: 'true', showPromptbar: 'true', chatFolderSort: 'name', promptFolderSort: 'name',
+};
+let bytes = 0;
+try {
+    for (const [key, value] of Object.entries(entries)) {
+        localStorage.setItem(key, value);
+        bytes += key.length + value.length;
+    }
+} catch (e) {
+    return {error: String(e), bytes: bytes, keys: Object.keys(localStorage).length};
+}
+return {bytes: bytes, keys: Object.keys(localStorage).length};
+"""
+
+MIGRATION_KEY = "__indexeddb_migration_status__"
+
+# name -> (conversations, messages per conversation, chars per message, folders, prompts);
+# the largest profile sits just under the ~5 MB localStorage quota
+PROFILES = {
+    "small": (20, 6, 200, 5, 10),
+    "medium": (200, 10, 300, 25, 50),
+    "large": (500, 12, 500, 100, 200),
+}
+
+
+class StorageMigrationBenchmark(BenchmarkTest):
+    """Measures the localStorage -> IndexedDB layer in utils/app/storage.ts.
+
+    Each profile seeds localStorage, then loads the app cold (migration runs) and
+    warm (already migrated). STORAGE_BENCH_PROFILES picks profiles and
+    STORAGE_BENCH_LOADS sets how many warm loads are timed.
+    """
+
+    def setUp(self):
+        self.profiles = os.getenv("STORAGE_BENCH_PROFILES", ",".join(PROFILES)).split(",")
+        self.warm_loads = int(os.getenv("STORAGE_BENCH_LOADS", "3"))
+        super().setUp(headless=True)
+        add_init_script(self.driver, STORAGE_PROBE)
+        add_init_script(self.driver, INTERACTIVE_PROBE)
+
+    # ----------------- Helpers -----------------
+    def reset_and_seed(self, profile):
+        self.reset_storage()
+        return self.driver.execute_script(SEED_LOCAL_STORAGE, *PROFILES[profile])
+
+    def load_and_probe(self, timeout=120):
+        """Load the app and return the page's storage probe once it is interactive and settled"""
+        self.load_app(timeout)
+        # Let the startup reads and writes finish before collecting the ops
+        time.sleep(2)
+        return self.driver.execute_script(
+            "return Object.assign({interactiveAt: window.__amplifyInteractiveAt}, window.__storageBench);"
+        )
+
+    def op_stats(self, bench):
+        stats = {}
+        for entry in bench["ops"]:
+            kind = "migration_status" if entry["key"] == MIGRATION_KEY else "data"
+            stats.setdefault(f"{entry['op']}_{kind}", []).append(entry["ms"])
+        return {name: summarize(values) for name, values in stats.items()}
+
+    # ----------------- Storage Migration -----------------
+    """Seeds each profile and records cold migration, per-op latency and time-to-interactive"""
+
+    def test_storage_migration(self):
+        for profile in self.profiles:
+            with self.subTest(profile=profile):
+                seeded = self.reset_and_seed(profile)
+                self.assertNotIn("error", seeded, f"Seeding {profile} failed: {seeded}")
+
+                cold = self.load_and_probe()
+                ops = cold["ops"]
+                migration_ms = None
+                if cold["removed"] and ops:
+                    migration_ms = max(cold["removed"].values()) - min(op["start"] for op in ops)
+                self.record(
+                    profile=profile,
+                    load="cold",
+                    seeded_bytes=seeded["bytes"],
+                    seeded_keys=seeded["keys"],
+                    interactive_ms=cold["interactiveAt"],
+                    migration_ms=migration_ms,
+                    migrated_keys=len(cold["removed"]),
+                    idb_ops=len(ops),
+                    migration_status_reads=sum(
+                        1 for op in ops if op["key"] == MIGRATION_KEY and op["op"] == "get"
+                    ),
+                    op_latency_ms=self.op_stats(cold),
+                )
+
+                for _ in range(self.warm_loads):
+                    warm = self.load_and_probe()
+                    self.record(
+                        profile=profile,
+                        load="warm",
+                        interactive_ms=warm["interactiveAt"],
+                        idb_ops=len(warm["ops"]),
+                        migration_status_reads=sum(
+                            1 for op in warm["ops"] if op["key"] == MIGRATION_KEY and op["op"] == "get"
+                        ),
+                        op_latency_ms=self.op_stats(warm),
+                    )
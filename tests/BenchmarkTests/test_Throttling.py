@@ -0,0 +1,97 @@
+import os
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from tests.bench import BenchmarkTest, summarize, INTERACTIVE_PROBE, LOAD_TIMINGS
+from tests.cdp import add_init_script
+from tests.standin import StandIn
+from tests import throttling
+
+
+STEPS = ["dom_content_loaded_ms", "load_ms", "interactive_ms", "send_message_ms", "settings_modal_ms",
+         "admin_modal_ms"]
+
+
+class ThrottlingBenchmark(BenchmarkTest):
+    """Times startup, sending a message and opening modals under each profile in tests/throttling.py.
+
+    THROTTLE_BENCH_PROFILES lists the profiles (default none,vpn,old_laptop,vpn_old_laptop)
+    and THROTTLE_BENCH_RUNS the runs per profile. Replies come from the stand-in
+    unless THROTTLE_BENCH_REAL_CHAT=1, in which case the chat request is
+    throttled too.
+    """
+
+    def setUp(self):
+        self.profiles = os.getenv("THROTTLE_BENCH_PROFILES", "none,vpn,old_laptop,vpn_old_laptop").split(",")
+        self.runs = int(os.getenv("THROTTLE_BENCH_RUNS", "3"))
+        if os.getenv("THROTTLE_BENCH_REAL_CHAT") != "1":
+            self.require_chat_endpoint()
+            self.stand_in = StandIn().stream(
+                self.chat_endpoint,
+                events=[{"s": "0", "d": "Throttled reply " + "lorem ipsum " * 50}],
+            )
+        super().setUp(headless=True)
+        add_init_script(self.driver, INTERACTIVE_PROBE)
+
+    # ----------------- Steps -----------------
+    def startup(self):
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        self.load_app(timeout=300)
+        return self.driver.execute_script(LOAD_TIMINGS)
+
+    def send_and_wait_reply(self):
+        replies = len(self.driver.find_elements(By.ID, "copyResponse"))
+        self.send_message("Throttling benchmark message")
+        return self.wait_until(lambda: len(self.driver.find_elements(By.ID, "copyResponse")) > replies, timeout=300)
+
+    def open_settings_modal(self):
+        self.wait.until(EC.element_to_be_clickable((By.ID, "userMenu"))).click()
+        self.wait.until(EC.element_to_be_clickable((By.ID, "settingsInterface"))).click()
+        seconds = self.wait_until(
+            lambda: any(e.is_displayed() for e in self.driver.find_elements(By.ID, "modalTitle")), timeout=120
+        )
+        self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        self.wait_until(lambda: not self.driver.find_elements(By.ID, "modalTitle"), timeout=30)
+        return seconds
+
+    def open_admin_modal(self):
+        """Seconds until the admin tabs show, or None for users without the admin interface"""
+        self.wait.until(EC.element_to_be_clickable((By.ID, "userMenu"))).click()
+        admin_buttons = self.driver.find_elements(By.ID, "adminInterface")
+        if not admin_buttons:
+            self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+            return None
+        admin_buttons[0].click()
+        return self.wait_until(lambda: self.driver.find_elements(By.ID, "tabName"), timeout=300)
+
+    # ----------------- Throttling -----------------
+    """Runs every step under each profile and reports per-profile timings and slowdown against 'none'"""
+
+    def test_throttling(self):
+        baseline = None
+        for profile in self.profiles:
+            with self.subTest(profile=profile):
+                settings = throttling.apply(self.driver, profile)
+                runs = []
+                for run in range(self.runs):
+                    timings = self.startup()
+                    message = self.send_and_wait_reply()
+                    settings_modal = self.open_settings_modal()
+                    admin_modal = self.open_admin_modal()
+                    timings.update(
+                        send_message_ms=message * 1000 if message is not None else None,
+                        settings_modal_ms=settings_modal * 1000 if settings_modal is not None else None,
+                        admin_modal_ms=admin_modal * 1000 if admin_modal is not None else None,
+                    )
+                    runs.append(self.record(throttle=profile, settings=settings, run=run, **timings))
+
+                medians = {step: summarize([r[step] for r in runs]).get("p50") for step in STEPS}
+                self.summary[profile] = {"settings": settings, "p50_ms": medians}
+                if baseline is None:
+                    baseline = medians
+                else:
+                    self.summary[profile]["slowdown"] = {
+                        step: medians[step] / baseline[step]
+                        for step in STEPS if medians[step] and baseline.get(step)
+                    }
+        throttling.apply(self.driver, "none")
@@ -0,0 +1,249 @@
+import os
+import re
+import time
+import random
+import shutil
+import tempfile
+import zipfile
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import UnexpectedAlertPresentException
+from tests.bench import BenchmarkTest, summarize
+from tests.cdp import heap_usage
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_files")
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+WORDS = (
+    "amplify raccoon budget quarterly report assistant model token upload "
+    "document folder policy analysis summary research campus student faculty"
+).split()
+
+
+def parse_size(text):
+    """'1K' -> 1024, '500M' -> 524288000"""
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def filler_block(size=64 * 1024):
+    """A block of pseudo-random words that is reused to fill large files quickly"""
+    rng = random.Random(216)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return (" ".join(words) + "\n").encode()
+
+
+def write_filler(f, size):
+    block = filler_block()
+    written = 0
+    while written < size:
+        chunk = block[: size - written]
+        f.write(chunk)
+        written += len(chunk)
+
+
+# ----------------- File Generators -----------------
+# Each generator writes a valid document of roughly `size` bytes to `path`.
+
+def generate_text(path, size):
+    with open(path, "wb") as f:
+        write_filler(f, size)
+
+
+def generate_csv(path, size):
+    header = b"Name,Race,Occupation,Notes\n"
+    row = b"Booker,Raccoon,Conman,amplify budget quarterly report\n"
+    with open(path, "wb") as f:
+        f.write(header)
+        for _ in range(max(1, (size - len(header)) // len(row))):
+            f.write(row)
+
+
+def generate_markdown(path, size):
+    with open(path, "wb") as f:
+        f.write(b"# Generated Benchmark Document\n\n")
+        write_filler(f, size)
+
+
+def generate_html(path, size):
+    with open(path, "wb") as f:
+        f.write(b"<html><body><p>")
+        write_filler(f, size)
+        f.write(b"</p></body></html>")
+
+
+def generate_pdf(path, size):
+    """Single page PDF whose content stream holds `size` bytes of text operators"""
+    line = b"BT /F1 8 Tf 20 700 Td (amplify upload benchmark text line) Tj ET\n"
+    stream = line * max(1, size // len(line))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"endstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(
+            f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        )
+
+
+def generate_office(fixture, member, text_tag):
+    """Copy an Office fixture and pad the first text run of `member` to the requested size"""
+    def generate(path, size):
+        with zipfile.ZipFile(os.path.join(FIXTURE_DIR, fixture)) as source, \
+                zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                data = source.read(item.filename)
+                if item.filename != member:
+                    target.writestr(item, data)
+                    continue
+                # Insert the filler right after the first text run's opening tag
+                split = re.search(text_tag, data).end()
+                # Stored uncompressed so the file on disk really is `size` bytes
+                info = zipfile.ZipInfo(member, date_time=item.date_time)
+                info.compress_type = zipfile.ZIP_STORED
+                with target.open(info, "w", force_zip64=True) as f:
+                    f.write(data[:split])
+                    write_filler(f, size)
+                    f.write(data[split:])
+    return generate
+
+
+GENERATORS = {
+    "txt": generate_text,
+    "csv": generate_csv,
+    "md": generate_markdown,
+    "html": generate_html,
+    "pdf": generate_pdf,
+    "docx": generate_office("Test_6.docx", "word/document.xml", rb"<w:t(?: [^>]*)?>"),
+    "pptx": generate_office("Test_5.pptx", "ppt/slides/slide1.xml", rb"<a:t>"),
+}
+
+
+class UploadThroughputBenchmark(BenchmarkTest):
+    """Uploads generated files through the chat file input and times each stage.
+
+    UPLOAD_BENCH_SIZES and UPLOAD_BENCH_TYPES (comma separated) narrow the matrix,
+    UPLOAD_BENCH_TIMEOUT (seconds) caps how long one file may take to become ready.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sizes = os.getenv("UPLOAD_BENCH_SIZES", "1K,100K,1M,10M,100M,500M").split(",")
+        cls.types = os.getenv("UPLOAD_BENCH_TYPES", ",".join(GENERATORS)).split(",")
+        cls.timeout = float(os.getenv("UPLOAD_BENCH_TIMEOUT", "900"))
+        cls.file_dir = tempfile.mkdtemp(prefix="amplify_upload_bench_")
+
+    @classmethod
+    def tearDownClass(cls):
+        if hasattr(cls, "file_dir"):
+            shutil.rmtree(cls.file_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp(headless=True)
+
+    # ----------------- Helpers -----------------
+    def generate_file(self, file_type, size_label):
+        path = os.path.join(self.file_dir, f"bench_{size_label}.{file_type}")
+        if not os.path.exists(path):
+            GENERATORS[file_type](path, parse_size(size_label))
+        return path
+
+    def upload_progress(self):
+        """Highest 'Progress: N' the chat input has logged since the last clear"""
+        try:
+            matches = self.console_log.search(r"Progress: (\d+)")
+        except UnexpectedAlertPresentException as e:
+            self.fail(f"Upload failed with alert: {e.alert_text}")
+        return max((int(m.group(1)) for m in matches), default=0)
+
+    def reset_chat(self):
+        """Reload so each upload starts without previously attached documents"""
+        self.driver.get(self.base_url)
+        self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        self.console_log.clear()
+
+    def upload(self, path):
+        file_input = self.driver.find_element(By.ID, "__attachFile")
+        self.driver.execute_script("arguments[0].classList.remove('sr-only');", file_input)
+        self.driver.execute_script("arguments[0].style.display = 'block';", file_input)
+
+        heap_before = heap_usage(self.driver)
+        peak_heap = heap_before["js_heap_used"]
+
+        start = time.perf_counter()
+        file_input.send_keys(path)
+        uploaded = ready = None
+        while time.perf_counter() - start < self.timeout:
+            progress = self.upload_progress()
+            now = time.perf_counter() - start
+            peak_heap = max(peak_heap, heap_usage(self.driver)["js_heap_used"])
+            # 95 is reported once the bytes are sent, 100 once the backend has processed them
+            if uploaded is None and progress >= 95:
+                uploaded = now
+            if progress >= 100:
+                ready = now
+                break
+            time.sleep(0.25)
+
+        return {
+            "upload_seconds": uploaded,
+            "ready_seconds": ready,
+            "heap_before": heap_before["js_heap_used"],
+            "heap_peak": peak_heap,
+            "heap_after": heap_usage(self.driver)["js_heap_used"],
+        }
+
+    # ----------------- Upload Throughput -----------------
+    """Uploads every configured type and size and records upload, processing and memory figures"""
+
+    def test_upload_throughput(self):
+        for file_type in self.types:
+            for size_label in self.sizes:
+                with self.subTest(file_type=file_type, size=size_label):
+                    path = self.generate_file(file_type, size_label)
+                    size = os.path.getsize(path)
+
+                    self.reset_chat()
+                    result = self.upload(path)
+                    upload_seconds = result["upload_seconds"]
+                    self.record(
+                        file_type=file_type,
+                        size_label=size_label,
+                        bytes=size,
+                        throughput_mb_s=(size / 1024 ** 2 / upload_seconds) if upload_seconds else None,
+                        **result,
+                    )
+                    self.assertIsNotNone(
+                        result["ready_seconds"],
+                        f"{file_type} {size_label} was not ready within {self.timeout}s",
+                    )
+
+        by_type = {}
+        for row in self.records:
+            by_type.setdefault(row["file_type"], []).append(row["ready_seconds"])
+        for file_type, values in by_type.items():
+            print(f"{file_type}: ready seconds {summarize(values)}")
@@ -0,0 +1,83 @@
+import os
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from tests.bench import BenchmarkTest, summarize
+from tests.waits import DomWait
+
+
+# Adds a button with the given id after delay ms, the way the app renders late content
+INSERT_LATER = """
+const [id, delay] = arguments;
+document.querySelectorAll('[id="' + id + '"]').forEach(el => el.remove());
+setTimeout(() => {
+    const button = document.createElement('button');
+    button.id = id;
+    button.textContent = 'Wait benchmark';
+    document.body.appendChild(button);
+}, delay);
+"""
+
+CONDITIONS = {
+    "presence": EC.presence_of_element_located,
+    "presence_all": EC.presence_of_all_elements_located,
+    "clickable": EC.element_to_be_clickable,
+}
+
+
+class WaitLatencyBenchmark(BenchmarkTest):
+    """Compares WebDriverWait polling with DomWait (tests/waits.py) on elements that appear late.
+
+    WAIT_BENCH_DELAYS_MS lists how long after the wait starts the element
+    appears and WAIT_BENCH_RUNS the waits per delay, condition and mode.
+    """
+
+    def setUp(self):
+        self.delays = [int(d) for d in os.getenv("WAIT_BENCH_DELAYS_MS", "0,50,250,1000,3000").split(",")]
+        self.runs = int(os.getenv("WAIT_BENCH_RUNS", "5"))
+        super().setUp(headless=True)
+
+    # ----------------- Helpers -----------------
+    def timed_wait(self, wait, condition, delay_ms):
+        """(ms from the element appearing to the wait returning, WebDriver commands sent)"""
+        element_id = "waitBenchTarget"
+        self.driver.execute_script(INSERT_LATER, element_id, delay_ms)
+        start = time.perf_counter()
+
+        commands = 0
+        execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            nonlocal commands
+            commands += 1
+            return execute(driver_command, params)
+
+        self.driver.execute = counting_execute
+        try:
+            wait.until(condition((By.ID, element_id)))
+        finally:
+            del self.driver.execute
+        return (time.perf_counter() - start) * 1000 - delay_ms, commands
+
+    # ----------------- Wait Latency -----------------
+    """Records reaction time and round trips per wait for polling and DOM-observing waits"""
+
+    def test_wait_latency(self):
+        waits = {"polling": WebDriverWait(self.driver, 10), "dom": DomWait(self.driver, 10)}
+        for condition_name, condition in CONDITIONS.items():
+            for delay_ms in self.delays:
+                for mode, wait in waits.items():
+                    with self.subTest(condition=condition_name, delay_ms=delay_ms, mode=mode):
+                        samples = [self.timed_wait(wait, condition, delay_ms) for _ in range(self.runs)]
+                        row = self.record(
+                            condition=condition_name,
+                            delay_ms=delay_ms,
+                            mode=mode,
+                            reaction_ms=summarize([reaction for reaction, _ in samples]),
+                            commands=summarize([commands for _, commands in samples]),
+                        )
+                        self.summary.setdefault(f"{condition_name}_{delay_ms}ms", {})[mode] = {
+                            "reaction_p50_ms": row["reaction_ms"].get("p50"),
+                            "commands_p50": row["commands"].get("p50"),
+                        }
@@ -0,0 +1,76 @@
+import io
+import os
+import json
+import contextlib
+import tempfile
+import unittest
+from unittest import mock
+from tests import budgets
+
+
+BUDGETS = {
+    "report": "Journeys",
+    "margin": {"relative": 0.1, "noise_mads": 3, "min_ms": 50},
+    "journeys": {
+        "new_chat": {"p50_ms": 1000, "p95_ms": 2000},
+        "open_admin_modal": {"p50_ms": 3000, "optional": True},
+    },
+}
+
+
+def sampled(values):
+    return {"samples": values}
+
+
+class BudgetsTests(unittest.TestCase):
+    """Pass/fail decisions of tests/budgets.py; no browser needed"""
+
+    def test_over_budget(self):
+        results = budgets.evaluate(BUDGETS, {"new_chat": sampled([1200] * 5)}, {})
+        self.assertEqual(results["new_chat"]["status"], "over_budget")
+        self.assertIn("p50 1200 ms > 1000 ms", results["new_chat"]["detail"])
+
+    def test_regression_past_baseline_tolerance(self):
+        # Steady baseline: allowed p50 = 100 + max(10% of 100, 3 * 0 noise, 50 ms) = 150
+        baselines = {"new_chat": sampled([100] * 5)}
+        results = budgets.evaluate(BUDGETS, {"new_chat": sampled([200] * 5)}, baselines)
+        self.assertEqual(results["new_chat"]["status"], "regression")
+        self.assertEqual(results["new_chat"]["allowed_p50_ms"], 150)
+
+    def test_within_baseline_tolerance(self):
+        baselines = {"new_chat": sampled([100] * 5)}
+        results = budgets.evaluate(BUDGETS, {"new_chat": sampled([140] * 5)}, baselines)
+        self.assertEqual(results["new_chat"]["status"], "ok")
+
+    def test_noise_widens_tolerance(self):
+        steady = budgets.allowed_p50([500] * 7, [500] * 7, BUDGETS["margin"])
+        noisy = budgets.allowed_p50([300, 400, 500, 600, 700, 500, 500], [500] * 7, BUDGETS["margin"])
+        self.assertGreater(noisy, steady)
+
+    def test_missing_baseline_checks_budgets_only(self):
+        results = budgets.evaluate(BUDGETS, {"new_chat": sampled([900] * 5)}, {})
+        self.assertEqual(results["new_chat"]["status"], "ok")
+        self.assertNotIn("baseline_p50_ms", results["new_chat"])
+
+    def test_missing_samples(self):
+        results = budgets.evaluate(BUDGETS, {"new_chat": sampled([])}, {})
+        self.assertEqual(results["new_chat"]["status"], "no_data")
+        self.assertEqual(results["open_admin_modal"]["status"], "skipped")
+
+    def test_main_without_baseline_file(self):
+        with tempfile.TemporaryDirectory() as report_dir:
+            budget_path = os.path.join(report_dir, "budgets.json")
+            with open(budget_path, "w") as f:
+                json.dump(BUDGETS, f)
+            with open(os.path.join(report_dir, "Journeys.json"), "w") as f:
+                json.dump({"summary": {"new_chat": sampled([900] * 5)}}, f)
+            env = {budgets.BASELINE_ENV: os.path.join(report_dir, "missing_baselines.json")}
+            output = io.StringIO()
+            with mock.patch.object(budgets, "REPORT_DIR", report_dir), \
+                    mock.patch.object(budgets, "BUDGET_PATH", budget_path), \
+                    mock.patch.dict(os.environ, env), contextlib.redirect_stdout(output):
+                self.assertEqual(budgets.main([]), 0)
+        self.assertIn("only the absolute budgets are checked", output.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
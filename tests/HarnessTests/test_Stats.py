@@ -0,0 +1,47 @@
+import unittest
+from tests import stats
+
+
+class StatsTests(unittest.TestCase):
+    """Outlier trimming, bootstrap CIs and the A/B verdict of tests/stats.py; no browser needed"""
+
+    def test_trim_outliers(self):
+        self.assertEqual(stats.trim_outliers([10, 11, 12, 13, 14, 1000]), [10, 11, 12, 13, 14])
+        # Below four values there are no quartiles to trust, so nothing is dropped
+        self.assertEqual(stats.trim_outliers([10, 1000, None]), [10, 1000])
+
+    def test_bootstrap_is_seeded(self):
+        values = [5, 7, 9, 11, 13]
+        self.assertEqual(stats.bootstrap(values, resamples=200), stats.bootstrap(values, resamples=200))
+        self.assertEqual(len(stats.bootstrap(values, resamples=200)), 200)
+
+    def test_bootstrap_ci_contains_median(self):
+        values = [100, 102, 98, 101, 99, 103, 97]
+        low, high = stats.bootstrap_ci(values)
+        self.assertLessEqual(low, stats.median(values))
+        self.assertGreaterEqual(high, stats.median(values))
+
+    def test_ci_excludes_zero(self):
+        result = stats.compare([100 + i for i in range(10)], [200 + i for i in range(10)])
+        self.assertTrue(result["significant"])
+        self.assertGreater(result["ci"][0], 0)
+        self.assertAlmostEqual(result["difference"], 100)
+        self.assertLess(result["p_value"], 0.05)
+
+    def test_ci_includes_zero(self):
+        a = [100, 104, 98, 101, 99, 103, 97, 102]
+        b = [101, 99, 103, 98, 102, 100, 97, 104]
+        result = stats.compare(a, b)
+        self.assertFalse(result["significant"])
+        self.assertLessEqual(result["ci"][0], 0)
+        self.assertGreaterEqual(result["ci"][1], 0)
+
+    def test_too_few_samples(self):
+        self.assertEqual(stats.bootstrap_ci([5]), (None, None))
+        self.assertIsNone(stats.compare([5], [6, 7, 8])["significant"])
+        self.assertEqual(stats.robust_summary([5])["ci"], [None, None])
+        self.assertEqual(stats.robust_summary([None])["count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
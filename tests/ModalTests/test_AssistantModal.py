@@ -146,11 +146,12 @@ class AssistantModalTests(BaseTest):
         
         assistant_add_button = self.wait.until(EC.element_to_be_clickable((By.ID, "addAssistantButton")))
         self.assertIsNotNone(assistant_add_button, "Add Assistant button should be initialized and clickable")
-        assistant_add_button.click()
+        with self.cpu_profile("open_assistant_modal"):
+            assistant_add_button.click()
+            assistant_name_input = self.wait.until(EC.presence_of_element_located((By.ID, "assistantNameInput")))
         
         time.sleep(2)
         
-        assistant_name_input = self.wait.until(EC.presence_of_element_located((By.ID, "assistantNameInput")))
         self.assertIsNotNone(assistant_name_input, "Assistant Name input should be present")
         assistant_name_input.clear()
         assistant_name_input.send_keys("Link")
@@ -0,0 +1,126 @@
+"""
+A/B comparison of two builds with the benchmark suites.
+
+Runs one benchmark file against build A and build B (two NEXTAUTH_URLs, e.g.
+main on :3000 and a branch on :3001), alternating A, B, A, B ... for
+--rounds rounds so drift on the machine hits both sides alike. Each side's
+reports are tagged through AMPLIFY_REPORT_SUFFIX. Afterwards every summary
+entry that carries samples (robust_summary in tests/stats.py) is compared:
+difference of medians B - A after outlier trimming, its bootstrap confidence
+interval, and whether the difference is significant (the CI excludes 0).
+
+Only suites that report samples through repeat() and robust_summary can be
+compared: test_Journeys.py and test_Startup.py (its interactive_ms). The other
+benchmarks keep only percentiles, so other files are rejected.
+
+    python3 -m tests.ab_compare --a http://localhost:3000 --b http://localhost:3001 \\
+        tests/BenchmarkTests/test_Journeys.py --rounds 2
+
+BENCH_WARMUP and BENCH_REPETITIONS apply to both sides. The comparison is
+written to tests/reports/ab_compare.json.
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+import subprocess
+from tests.stats import REPORT_DIR, compare, write_report
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIDES = ("a", "b")
+
+# Benchmark files whose reports carry samples
+SAMPLED_SUITES = ("test_Journeys.py", "test_Startup.py")
+
+
+def suffix(side, round_number):
+    return f".ab-{side}{round_number}"
+
+
+def run_side(test_file, url, side, round_number):
+    env = dict(os.environ)
+    env.update({
+        "NEXTAUTH_URL": url,
+        "AMPLIFY_BENCHMARK": "1",
+        "AMPLIFY_REPORT_SUFFIX": suffix(side, round_number),
+        "PYTHONPATH": PROJECT_DIR,
+    })
+    print(f"Round {round_number}, build {side.upper()} ({url})...")
+    return subprocess.call([sys.executable, "-m", "unittest", "-v", test_file], cwd=PROJECT_DIR, env=env)
+
+
+def sampled_entries(summary, path=()):
+    """{path: samples} for every dict in summary that carries a samples list"""
+    entries = {}
+    for key, value in summary.items():
+        if not isinstance(value, dict):
+            continue
+        if isinstance(value.get("samples"), list):
+            entries[path + (key,)] = value["samples"]
+        else:
+            entries.update(sampled_entries(value, path + (key,)))
+    return entries
+
+
+def collect(side):
+    """{(report, *path): samples} over every round of one side"""
+    samples = {}
+    for report_path in sorted(glob.glob(os.path.join(REPORT_DIR, f"*.ab-{side}*.json"))):
+        report = os.path.basename(report_path).split(".ab-")[0]
+        with open(report_path) as f:
+            summary = json.load(f).get("summary", {})
+        for path, values in sampled_entries(summary).items():
+            samples.setdefault((report,) + path, []).extend(v for v in values if v is not None)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare two builds with a benchmark suite. Only suites that report samples are supported: "
+                    + ", ".join(SAMPLED_SUITES)
+    )
+    parser.add_argument("test_file", help=f"benchmark file, one of {', '.join(SAMPLED_SUITES)} in tests/BenchmarkTests")
+    parser.add_argument("--a", required=True, help="NEXTAUTH_URL of build A (the reference)")
+    parser.add_argument("--b", required=True, help="NEXTAUTH_URL of build B")
+    parser.add_argument("--rounds", type=int, default=1, help="A/B rounds, alternating sides")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    args = parser.parse_args(argv)
+    if os.path.basename(args.test_file) not in SAMPLED_SUITES:
+        parser.error(f"{args.test_file} does not report samples; supported: {', '.join(SAMPLED_SUITES)}")
+
+    for stale in glob.glob(os.path.join(REPORT_DIR, "*.ab-*.json")):
+        os.remove(stale)
+    urls = {"a": args.a, "b": args.b}
+    for round_number in range(1, args.rounds + 1):
+        for side in SIDES:
+            if run_side(args.test_file, urls[side], side, round_number) != 0:
+                print(f"Build {side.upper()} had failing benchmark tests; its samples are still compared")
+
+    a, b = collect("a"), collect("b")
+    results = {}
+    print(f"\n{'metric':<55} {'A p50':>10} {'B p50':>10} {'change':>8} {'CI of B-A':>22} {'p':>6}  verdict")
+    for key in sorted(set(a) & set(b)):
+        result = compare(a[key], b[key], confidence=args.confidence)
+        name = ".".join(str(part) for part in key)
+        results[name] = result
+        if result["significant"] is None:
+            print(f"{name[-55:]:<55} {'too few samples':>10}")
+            continue
+        verdict = ("B higher" if result["difference"] > 0 else "B lower") if result["significant"] else "no difference"
+        change = f"{result['relative'] * 100:+.1f}%" if result["relative"] is not None else "-"
+        ci = f"[{result['ci'][0]:.1f}, {result['ci'][1]:.1f}]"
+        print(f"{name[-55:]:<55} {result['a_p50']:>10.1f} {result['b_p50']:>10.1f} {change:>8} {ci:>22} "
+              f"{result['p_value']:>6.3f}  {verdict}")
+
+    if not results:
+        print("No sampled metrics found in both builds' reports")
+        return 1
+    write_report("ab_compare", {"a": args.a, "b": args.b, "rounds": args.rounds, "metrics": results})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
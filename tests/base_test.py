@@ -1,15 +1,28 @@
 import unittest
 import time
 import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import UnexpectedAlertPresentException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from tests.preflight import preflight_diagnosis
+from tests.cdp import enable_performance_log, enable_console_log, CdpEventLog, ConsoleLog
+from tests.standin import StandIn
+from tests import payload_profiler
+from tests import cassette
+from tests import browser_pool
+from tests import blocking
+from tests import throttling
+from tests import js_coverage
+from tests import cpu_profile
+from tests.waits import DomWait
 
 
 class BaseTest(unittest.TestCase):
@@ -25,26 +38,93 @@ class BaseTest(unittest.TestCase):
         cls.base_url = os.getenv("NEXTAUTH_URL", "http://localhost:3000")
         cls.username = os.getenv("SELENIUM_USERNAME", "default_username")
         cls.password = os.getenv("SELENIUM_PASSWORD", "default_password")
+        cls.chat_endpoint = os.getenv("CHAT_ENDPOINT", "")
+
+        # Skip the whole class instead of timing out in every test when the app is unusable
+        diagnosis = preflight_diagnosis()
+        if diagnosis:
+            raise unittest.SkipTest(diagnosis)
 
     def setUp(self, headless=True):
         """Setup that runs before each test method"""
+        self.cassette = None
+        if cassette.mode() == "replay":
+            self.cassette = cassette.load(self.id())
+            if self.cassette is None:
+                raise unittest.SkipTest(f"No cassette recorded for {self.id()}")
+
         # Configure Chrome options
         options = webdriver.ChromeOptions()
         
-        # ⬇️ Use a persistent user profile
-        profile_dir = os.path.join(os.path.dirname(__file__), "chrome_profile")
-        options.add_argument(f"--user-data-dir={profile_dir}")
-    
         if headless:
             options.add_argument("--headless")
             options.add_argument("--disable-gpu")
             options.add_argument("--window-size=1920,1080")
 
+        # Each session downloads into its own directory so parallel runs never collide
+        self.download_dir = tempfile.mkdtemp(prefix="amplify_downloads_")
+        options.add_experimental_option("prefs", {
+            "download.default_directory": self.download_dir,
+            "download.prompt_for_download": False,
+        })
+        enable_performance_log(options)
+        enable_console_log(options)
+
         # Initialize WebDriver with ChromeDriverManager
         service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
+        self.browser_context = None
+        if browser_pool.enabled():
+            # Attach to a shared Chrome instead; launch options belong to the pool, only logging carries over
+            self.browser_context = browser_pool.open_context()
+            attach_options = webdriver.ChromeOptions()
+            enable_performance_log(attach_options)
+            enable_console_log(attach_options)
+            self.driver = self.browser_context.attach(service, attach_options)
+            self.browser_connection = self.browser_context.connection
+        else:
+            # ⬇️ Use a persistent user profile, so a login carries over to the next test
+            profile_dir = os.path.join(os.path.dirname(__file__), "chrome_profile")
+            if os.getenv("PYTEST_XDIST_WORKER"):
+                # Chrome locks its user data dir, so parallel workers each start from a copy of it
+                self.profile_dir = profile_dir = self.copy_profile(profile_dir)
+            options.add_argument(f"--user-data-dir={profile_dir}")
+            self.driver = webdriver.Chrome(service=service, options=options)
+            # Browser-level events such as download progress never reach the performance log
+            self.browser_connection = browser_pool.BrowserConnection(
+                self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+            )
+        self.cdp_events = CdpEventLog(self.driver, self.browser_connection.drain)
+        self.console_log = ConsoleLog(self.driver)
+        self.set_download_behavior()
+
+        # Suites opt into a request blocking profile with block_profile; AMPLIFY_BLOCK overrides it
+        self.blocked_urls = blocking.patterns(blocking.profile_for(self))
+        if self.blocked_urls:
+            blocking.apply(self.driver, self.blocked_urls)
+        # Likewise throttle_profile and AMPLIFY_THROTTLE for network and CPU throttling
+        self.throttle_profile_name = throttling.profile_for(self)
+        if self.throttle_profile_name:
+            throttling.apply(self.driver, self.throttle_profile_name)
+
+        # Payload profiling and cassettes need the stand-in's fetch wrapper even when nothing is stubbed
+        if payload_profiler.enabled() or cassette.mode():
+            self.stand_in = getattr(self, "stand_in", None) or StandIn()
+            self.stand_in.measure = payload_profiler.enabled()
+            self.stand_in.record = self.stand_in.record or cassette.mode() == "record"
+            if self.cassette is not None:
+                self.stand_in.replay(self.cassette)
+
+        # Tests that stub the backend set self.stand_in before calling setUp
+        if getattr(self, "stand_in", None):
+            self.stand_in.install(self.driver)
+
+        # V8 coverage has to start before the app's scripts load
+        if js_coverage.enabled():
+            js_coverage.start(self.driver)
+
         self.driver.get(self.base_url)
-        self.wait = WebDriverWait(self.driver, 10)
+        # Waits resolve on DOM mutations instead of 500 ms polling (see tests/waits.py)
+        self.wait = DomWait(self.driver, 10)
 
         # # Login before each test
         # self.login()
@@ -52,10 +132,112 @@ class BaseTest(unittest.TestCase):
         if not self.is_logged_in():
             self.login()
 
+        # --profile: sample the test body, not the login
+        if cpu_profile.mode() == "test":
+            cpu_profile.start(self.driver)
+
     def tearDown(self):
         """Cleanup after each test method"""
         if hasattr(self, "driver") and self.driver:
+            if payload_profiler.enabled() or cassette.mode():
+                try:
+                    entries = StandIn.drain_log(self.driver)
+                    if payload_profiler.enabled():
+                        payload_profiler.record_calls(self.id(), entries)
+                    if cassette.mode() == "record":
+                        cassette.save(self.id(), entries)
+                    elif self.cassette is not None:
+                        cassette.record_diff(self.id(), self.cassette, entries)
+                except Exception as e:
+                    print(f"Could not collect the stand-in log: {e}")
+            if cpu_profile.mode() == "test":
+                try:
+                    cpu_profile.stop(self.driver, self.id())
+                except Exception as e:
+                    print(f"Could not save the CPU profile: {e}")
+            if js_coverage.enabled():
+                try:
+                    js_coverage.collect(self.driver, self.id(), self.base_url)
+                except Exception as e:
+                    print(f"Could not collect JS coverage: {e}")
             self.driver.quit()
+        if getattr(self, "browser_context", None):
+            self.browser_context.close()
+        elif getattr(self, "browser_connection", None):
+            self.browser_connection.close()
+        if hasattr(self, "download_dir"):
+            shutil.rmtree(self.download_dir, ignore_errors=True)
+        if getattr(self, "profile_dir", None):
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    @contextmanager
+    def cpu_profile(self, section):
+        """Profile the enclosed steps when running with AMPLIFY_CPU_PROFILE=sections (see tests/cpu_profile.py)"""
+        if cpu_profile.mode() != "sections":
+            yield
+            return
+        cpu_profile.start(self.driver)
+        try:
+            yield
+        finally:
+            cpu_profile.stop(self.driver, f"{self.id()}.{section}")
+
+    @staticmethod
+    def copy_profile(source):
+        """Temporary copy of the profile at source (empty if it does not exist yet), without Chrome's lock files"""
+        profile_dir = tempfile.mkdtemp(prefix="amplify_profile_")
+        if os.path.isdir(source):
+            shutil.copytree(
+                source, profile_dir, dirs_exist_ok=True, symlinks=True,
+                ignore=shutil.ignore_patterns("Singleton*", "lockfile", "*.lock"),
+            )
+        return profile_dir
+
+    def set_download_behavior(self):
+        """Route downloads to self.download_dir with progress events on the browser connection"""
+        if self.browser_context:
+            self.browser_context.set_download_behavior(self.download_dir)
+            return
+        self.browser_connection.send("Browser.setDownloadBehavior", {
+            "behavior": "allow", "downloadPath": self.download_dir, "eventsEnabled": True,
+        })
+
+    def wait_for_download(self, filename=None, timeout=30):
+        """Return the path of a finished download as soon as Chrome reports it complete.
+
+        Completion comes from the Browser.downloadProgress events read over
+        the session's browser-level CDP connection (ChromeDriver's performance
+        log does not carry them). The download directory is checked as well,
+        for files that finished before the events were enabled.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            names = {
+                event["guid"]: event.get("suggestedFilename")
+                for event in self.cdp_events.find("Browser.downloadWillBegin")
+            }
+            for event in self.cdp_events.find("Browser.downloadProgress"):
+                name = names.get(event.get("guid"))
+                if filename and name != filename:
+                    continue
+                if event.get("state") == "canceled":
+                    self.fail(f"Download of '{name}' was canceled")
+                if event.get("state") == "completed" and name:
+                    path = os.path.join(self.download_dir, name)
+                    if os.path.exists(path):
+                        return path
+
+            finished = [
+                f for f in os.listdir(self.download_dir)
+                if not f.endswith(".crdownload") and (not filename or f == filename)
+            ]
+            if finished:
+                return os.path.join(self.download_dir, finished[0])
+            time.sleep(0.1)
+
+        self.fail(
+            f"Download failed: Expected file '{filename}' not found in {self.download_dir}"
+        )
             
     def is_logged_in(self):
         time.sleep(7)
@@ -0,0 +1,214 @@
+"""
+Shared helpers for the benchmarks in tests/BenchmarkTests.
+
+Benchmarks are BaseTest suites that record measurements instead of (or as well
+as) asserting on the UI. They are skipped unless AMPLIFY_BENCHMARK=1, which
+test_all_files.sh sets for case 10, and write a JSON report per class to
+tests/reports/<ReportName>.json. The statistics helpers live in tests/stats.py
+and are re-exported here for the benchmark suites. Page scripts and steps that
+several suites need (load_app, send_message, reset_storage, SEED_INDEXED_DB,
+LOAD_TIMINGS) live here too, never in another test_*.py module.
+
+repeat() runs a measurement BENCH_WARMUP times unrecorded (default 1) and then
+the suite's repetition count, or BENCH_REPETITIONS for every suite at once.
+robust_summary() trims outliers and adds a bootstrap CI of the median; A/B
+runs against two builds compare those samples (see tests/ab_compare.py).
+"""
+
+import os
+import re
+import time
+import unittest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from tests.base_test import BaseTest
+from tests import blocking
+from tests import throttling
+from tests.stats import percentile, summarize, slope, robust_summary, write_report
+
+# Init script that stamps window.__amplifyInteractiveAt (ms since navigation start)
+# the moment the chat input exists and is enabled
+INTERACTIVE_PROBE = """
+(function () {
+    if (window.__amplifyInteractiveProbe) return;
+    window.__amplifyInteractiveProbe = true;
+    window.__amplifyInteractiveAt = null;
+    const check = (observer) => {
+        const input = document.getElementById('messageChatInputText');
+        if (input && !input.disabled) {
+            window.__amplifyInteractiveAt = performance.now();
+            observer.disconnect();
+        }
+    };
+    const observer = new MutationObserver(() => check(observer));
+    observer.observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ['disabled']});
+})();
+"""
+
+# Runs on a same-origin page that does not boot the app, so nothing holds the database open
+RESET_STORAGE = """
+const done = arguments[arguments.length - 1];
+localStorage.clear();
+const request = indexedDB.deleteDatabase('ChatUIStorage');
+request.onsuccess = request.onerror = request.onblocked = () => done(true);
+"""
+
+# Navigation milestones of the current document
+LOAD_TIMINGS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return {
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd - nav.startTime,
+    load_ms: nav.loadEventEnd - nav.startTime,
+    interactive_ms: window.__amplifyInteractiveAt,
+};
+"""
+
+# Writes conversations, folders and prompts straight into the app's IndexedDB store,
+# already marked as migrated, so sizes past the localStorage quota can be seeded
+SEED_INDEXED_DB = """
+const [conversations, messages, folders, prompts, done] = arguments;
+const text = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. '.repeat(4);
+const folderList = [];
+for (let f = 0; f < folders; f++) {
+    folderList.push({id: 'folder-' + f, name: 'Folder ' + f, type: f % 2 ? 'prompt' : 'chat', date: '2024-01-01'});
+}
+const conversationList = [];
+for (let c = 0; c < conversations; c++) {
+    const messageList = [];
+    for (let m = 0; m < messages; m++) {
+        messageList.push({role: m % 2 ? 'assistant' : 'user', content: text, id: 'm-' + c + '-' + m, type: 'chat', data: {}});
+    }
+    conversationList.push({
+        id: 'conv-' + c, name: 'Conversation ' + c, messages: messageList,
+        model: {id: 'gpt-4o'}, prompt: '', temperature: 0.5,
+        folderId: folders ? 'folder-' + (2 * (c % Math.ceil(folders / 2))) : null, tags: [], isLocal: true,
+    });
+}
+const promptList = [];
+for (let p = 0; p < prompts; p++) {
+    promptList.push({id: 'prompt-' + p, name: 'Prompt ' + p, description: '', content: text, folderId: null, type: 'prompt'});
+}
+const entries = {
+    conversationHistory: JSON.stringify(conversationList),
+    folders: JSON.stringify(folderList),
+    prompts: JSON.stringify(promptList),
+};
+entries.__indexeddb_migration_status__ = JSON.stringify(Object.keys(entries));
+
+const request = indexedDB.open('ChatUIStorage', 1);
+request.onupgradeneeded = () => request.result.createObjectStore('keyvalue', {keyPath: 'key'});
+request.onerror = () => done({error: String(request.error)});
+request.onsuccess = () => {
+    const db = request.result;
+    const tx = db.transaction(['keyvalue'], 'readwrite');
+    const store = tx.objectStore('keyvalue');
+    let bytes = 0;
+    for (const [key, value] of Object.entries(entries)) {
+        store.put({key, value});
+        bytes += value.length;
+    }
+    tx.oncomplete = () => { db.close(); done({bytes: bytes}); };
+    tx.onerror = () => { db.close(); done({error: String(tx.error)}); };
+};
+"""
+
+
+class BenchmarkTest(BaseTest):
+    """Base class for benchmark suites; collects records and writes one report per class"""
+
+    report_name = None
+
+    @classmethod
+    def setUpClass(cls):
+        if os.getenv("AMPLIFY_BENCHMARK") != "1":
+            raise unittest.SkipTest("Benchmarks only run with AMPLIFY_BENCHMARK=1")
+        super().setUpClass()
+        cls.records = []
+        cls.summary = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if getattr(cls, "records", None):
+            name = cls.report_name or cls.__name__
+            profile = blocking.profile_for(cls)
+            throttle = throttling.profile_for(cls)
+            # Blocked and throttled runs get their own report to compare against the plain one
+            if blocking.patterns(profile):
+                name = f"{name}.blocked-{re.sub(r'[^A-Za-z0-9_-]+', '+', profile)}"
+            if throttle and throttle != "none":
+                name = f"{name}.throttled-{throttle}"
+            # A/B runs tag each side's report (tests/ab_compare.py)
+            name += os.getenv("AMPLIFY_REPORT_SUFFIX", "")
+            write_report(name, {
+                "summary": cls.summary, "records": cls.records, "blocking": profile, "throttle": throttle,
+            })
+        super().tearDownClass()
+
+    def record(self, **fields):
+        """Store one measurement row, tagged with the running test's name"""
+        row = {"test": self._testMethodName, **fields}
+        if self.blocked_urls:
+            row.setdefault("blocking", blocking.profile_for(self))
+        if self.throttle_profile_name:
+            row.setdefault("throttle", self.throttle_profile_name)
+        self.records.append(row)
+        print(f"[benchmark] {row}")
+        return row
+
+    # ----------------- Shared steps -----------------
+    def wait_interactive(self, timeout=120):
+        """ms from navigation until INTERACTIVE_PROBE saw the chat input enabled"""
+        interactive = self.wait_until(
+            lambda: self.driver.execute_script("return window.__amplifyInteractiveAt;") is not None,
+            timeout=timeout,
+        )
+        self.assertIsNotNone(interactive, "App never became interactive")
+        return self.driver.execute_script("return window.__amplifyInteractiveAt;")
+
+    def load_app(self, timeout=120):
+        """Load the home page and wait until it is interactive (needs INTERACTIVE_PROBE)"""
+        self.driver.get(self.base_url)
+        return self.wait_interactive(timeout)
+
+    def reset_storage(self):
+        """Empty localStorage and the app's IndexedDB; leaves the browser on a page that does not boot the app"""
+        # NextAuth's providers route is same-origin but never boots the app
+        self.driver.get(f"{self.base_url}/api/auth/providers")
+        self.driver.execute_async_script(RESET_STORAGE)
+
+    def send_message(self, message):
+        chat_input_bar = self.wait.until(EC.presence_of_element_located((By.ID, "messageChatInputText")))
+        chat_input_bar.send_keys(message)
+        chat_send_message = self.wait.until(EC.element_to_be_clickable((By.ID, "sendMessage")))
+        chat_send_message.click()
+
+    def require_chat_endpoint(self):
+        """Skip suites that stub chat replies when CHAT_ENDPOINT, the URL the stand-in matches, is not set"""
+        if not self.chat_endpoint:
+            raise unittest.SkipTest("CHAT_ENDPOINT is not set, so chat requests cannot be told apart")
+
+    def repeat(self, measure, repetitions, warmup=1):
+        """Results of measure() over the repetitions, after warmup calls that are thrown away.
+
+        While measure runs, self.repetition is the run index ("warmup" during
+        the warmup calls), e.g. for a subTest label.
+        """
+        warmup = int(os.getenv("BENCH_WARMUP", warmup))
+        repetitions = int(os.getenv("BENCH_REPETITIONS", repetitions))
+        for _ in range(warmup):
+            self.repetition = "warmup"
+            measure()
+        results = []
+        for run in range(repetitions):
+            self.repetition = run
+            results.append(measure())
+        return results
+
+    def wait_until(self, condition, timeout=60, interval=0.05):
+        """Return seconds until condition() is truthy, or None on timeout"""
+        start = time.perf_counter()
+        while time.perf_counter() - start < timeout:
+            if condition():
+                return time.perf_counter() - start
+            time.sleep(interval)
+        return None
@@ -0,0 +1,86 @@
+"""
+Request blocking profiles for the test harness.
+
+Most UI assertions do not need Mixpanel, Google Fonts or the app's decorative
+images. A suite can block them through CDP Network.setBlockedURLs by naming a
+profile in its class:
+
+    class ChatHomeTests(BaseTest):
+        block_profile = "third_party"
+
+AMPLIFY_BLOCK (test_all_files.sh --block=PROFILE) applies a profile to every
+test instead, and "none" turns blocking off everywhere. Profiles can be
+combined ("third_party,images"); entries that are not profile names are used
+as URL patterns as they are. Benchmarks tag their records and report name with
+the active profile so runs with and without blocking can be compared, and
+test_RequestBlocking.py measures the bytes and time each profile saves.
+"""
+
+import os
+from fnmatch import fnmatchcase
+
+
+BLOCK_ENV = "AMPLIFY_BLOCK"
+
+PROFILES = {
+    # mixpanel-browser, initialised by hooks/useEventService.ts when the mixPanel flag is on
+    "analytics": ["*mixpanel.com*"],
+    # styles/globals.css imports Inter from Google Fonts
+    "fonts": ["*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    # Backgrounds, logos and placeholder art from public/
+    "images": ["*/logos/*", "*/bg-*.png", "*/sparc_*.png", "*/screenshot*.png", "*/favicon.ico"],
+}
+PROFILES["third_party"] = PROFILES["analytics"] + PROFILES["fonts"]
+PROFILES["all"] = PROFILES["third_party"] + PROFILES["images"]
+
+
+def patterns(spec):
+    """URL patterns for 'profile[,profile|pattern...]'; empty for None or 'none'"""
+    if not spec or spec == "none":
+        return []
+    result = []
+    for part in (p.strip() for p in spec.split(",")):
+        for pattern in PROFILES.get(part, [part] if part else []):
+            if pattern not in result:
+                result.append(pattern)
+    return result
+
+
+def profile_for(test):
+    """The profile spec a test runs with: AMPLIFY_BLOCK, else the suite's block_profile"""
+    return os.getenv(BLOCK_ENV) or getattr(test, "block_profile", None)
+
+
+def apply(driver, url_patterns):
+    """Block url_patterns for the session's page; an empty list lifts the blocking"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(url_patterns)})
+
+
+def matches(url, url_patterns):
+    return any(fnmatchcase(url, pattern) for pattern in url_patterns)
+
+
+def network_cost(events, url_patterns=()):
+    """Requests and transferred bytes in a list of CDP events, total and for URLs matching url_patterns.
+
+    Blocked requests are the ones Chrome failed with blockedReason 'inspector'
+    (Network.setBlockedURLs); they are counted apart from the requests sent.
+    """
+    urls, finished, blocked = {}, {}, set()
+    for event in events:
+        method, params = event.get("method"), event.get("params", {})
+        if method == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif method == "Network.loadingFinished":
+            finished[params["requestId"]] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            blocked.add(params["requestId"])
+    matched = [rid for rid, url in urls.items() if url_patterns and matches(url, url_patterns)]
+    return {
+        "requests": len(urls) - len(blocked),
+        "bytes": sum(finished.values()),
+        "blocked_requests": len(blocked),
+        "matched_requests": len(matched),
+        "matched_bytes": sum(finished.get(rid, 0) for rid in matched),
+    }
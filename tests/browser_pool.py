@@ -0,0 +1,322 @@
+"""
+Shared Chrome processes with one isolated browser context per test.
+
+Every BaseTest normally starts its own Chrome (~300 MB). With a pool running,
+a test instead gets a fresh browser context (Target.createBrowserContext,
+its own cookie jar, storage and cache, like an incognito window) inside one of
+a few long-lived Chrome processes, and ChromeDriver attaches to that Chrome
+through debuggerAddress. Memory is then bounded by the pool size, not by how
+many tests run at once.
+
+    python3 -m tests.browser_pool start --size 2   # launch and log in once per Chrome
+    pytest -n 8 tests/                             # workers share the two processes
+    python3 -m tests.browser_pool status           # contexts and memory per Chrome
+    python3 -m tests.browser_pool stop
+
+test_all_files.sh --contexts N does the start and stop around a run. The
+logged-in session cookies of each Chrome's default context are copied into
+every new context, so tests start logged in without a login per test.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import select
+import signal
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+
+POOL_ENV = "AMPLIFY_BROWSER_POOL"
+POOL_STATE = os.path.join(tempfile.gettempdir(), "amplify_browser_pool.json")
+PROFILE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chrome_profile_pool")
+
+CHROME_CANDIDATES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+]
+
+# Fields Storage.setCookies accepts from what Storage.getCookies returns
+COOKIE_FIELDS = ["name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority",
+                 "sourceScheme", "sourcePort"]
+
+
+def enabled():
+    """True when tests should take a context from the running pool"""
+    return os.getenv(POOL_ENV) == "1" and os.path.exists(POOL_STATE)
+
+
+def load_state():
+    with open(POOL_STATE) as f:
+        return json.load(f)
+
+
+def chrome_binary():
+    configured = os.getenv("CHROME_BINARY")
+    if configured:
+        return configured
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.exists(candidate) else None)
+        if path:
+            return path
+    raise SystemExit("Chrome not found; set CHROME_BINARY to the Chrome executable")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class BrowserConnection:
+    """CDP over the browser-level websocket; Target and Browser commands need it, not a page session"""
+
+    def __init__(self, address, timeout=30):
+        import websocket  # installed with selenium
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            url = json.loads(response.read())["webSocketDebuggerUrl"]
+        self.socket = websocket.create_connection(url, timeout=timeout)
+        self.next_id = 0
+        self.events = []
+
+    def send(self, method, params=None):
+        self.next_id += 1
+        self.socket.send(json.dumps({"id": self.next_id, "method": method, "params": params or {}}))
+        while True:
+            message = json.loads(self.socket.recv())
+            # Events and other replies share the socket; keep the events and skip to ours
+            if "method" in message:
+                self.events.append(message)
+            if message.get("id") != self.next_id:
+                continue
+            if "error" in message:
+                raise RuntimeError(f"{method} failed: {message['error'].get('message')}")
+            return message.get("result", {})
+
+    def drain(self):
+        """Events received so far, including any still waiting on the socket; empties the buffer"""
+        while select.select([self.socket.sock], [], [], 0)[0]:
+            message = json.loads(self.socket.recv())
+            if "method" in message:
+                self.events.append(message)
+        events, self.events = self.events, []
+        return events
+
+    def close(self):
+        self.socket.close()
+
+
+class BrowserContext:
+    """One isolated context in a pooled Chrome, with the page the test drives"""
+
+    def __init__(self, address):
+        self.address = address
+        self.connection = BrowserConnection(address)
+        self.context_id = self.connection.send(
+            "Target.createBrowserContext", {"disposeOnDetach": False}
+        )["browserContextId"]
+        cookies = self.connection.send("Storage.getCookies")["cookies"]
+        if cookies:
+            self.connection.send("Storage.setCookies", {
+                "browserContextId": self.context_id,
+                "cookies": [
+                    {k: c[k] for k in COOKIE_FIELDS if k in c and not (k == "expires" and c.get("session"))}
+                    for c in cookies
+                ],
+            })
+        self.target_id = self.connection.send(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id}
+        )["targetId"]
+
+    def attach(self, service, options):
+        """Start a ChromeDriver session on the pooled Chrome, focused on this context's page"""
+        from selenium import webdriver
+        options.debugger_address = self.address
+        driver = webdriver.Chrome(service=service, options=options)
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            handle = next((h for h in driver.window_handles if h.upper().endswith(self.target_id.upper())), None)
+            if handle:
+                driver.switch_to.window(handle)
+                return driver
+            time.sleep(0.1)
+        driver.quit()
+        raise RuntimeError(f"ChromeDriver never saw the context page {self.target_id}")
+
+    def set_download_behavior(self, download_dir):
+        # The download events arrive on this connection, not in ChromeDriver's performance log
+        self.connection.send("Browser.setDownloadBehavior", {
+            "behavior": "allow", "downloadPath": download_dir, "browserContextId": self.context_id,
+            "eventsEnabled": True,
+        })
+
+    def close(self):
+        try:
+            self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        finally:
+            self.connection.close()
+
+
+def open_contexts(address):
+    """Number of contexts open in the Chrome at address (infinite when it does not answer)"""
+    try:
+        connection = BrowserConnection(address, timeout=5)
+        try:
+            return len(connection.send("Target.getBrowserContexts")["browserContextIds"])
+        finally:
+            connection.close()
+    except Exception:
+        return float("inf")
+
+
+def open_context():
+    """New isolated context in the pooled Chrome with the fewest open contexts"""
+    browsers = load_state()["browsers"]
+    # Ties go to a different Chrome per process, so tests starting together spread out
+    offset = os.getpid() % len(browsers)
+    rotated = browsers[offset:] + browsers[:offset]
+    return BrowserContext(min(rotated, key=lambda b: open_contexts(b["address"]))["address"])
+
+
+# ----------------- Pool lifecycle -----------------
+def launch(index, headless=True):
+    port = free_port()
+    profile = os.path.join(PROFILE_ROOT, str(index))
+    os.makedirs(profile, exist_ok=True)
+    args = [
+        chrome_binary(), f"--remote-debugging-port={port}", f"--user-data-dir={profile}",
+        "--no-first-run", "--no-default-browser-check", "--window-size=1920,1080", "about:blank",
+    ]
+    if headless:
+        args[1:1] = ["--headless=new", "--disable-gpu"]
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    address = f"127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://{address}/json/version", timeout=1).close()
+            return {"pid": process.pid, "address": address, "profile": profile}
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f"Chrome {index} never opened its debugging port")
+
+
+def log_in(address):
+    """Log the default context in once through the usual BaseTest flow"""
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    from tests.base_test import BaseTest
+
+    BaseTest.setUpClass()
+    session = BaseTest("login")
+    options = webdriver.ChromeOptions()
+    options.debugger_address = address
+    session.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    try:
+        session.wait = WebDriverWait(session.driver, 10)
+        session.driver.get(session.base_url)
+        if not session.is_logged_in():
+            session.login()
+    finally:
+        # Quitting an attached session leaves the browser running
+        session.driver.quit()
+
+
+def process_memory(pids):
+    """Resident memory in MB of each pid plus its child processes (renderers, GPU, ...)"""
+    rows = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True).stdout.split()
+    table = [(int(rows[i]), int(rows[i + 1]), int(rows[i + 2])) for i in range(0, len(rows) - 2, 3)]
+    memory = {}
+    for root in pids:
+        tree, total = {root}, 0
+        changed = True
+        while changed:
+            changed = False
+            for pid, ppid, _ in table:
+                if ppid in tree and pid not in tree:
+                    tree.add(pid)
+                    changed = True
+        for pid, _, rss in table:
+            if pid in tree:
+                total += rss
+        memory[root] = total / 1024
+    return memory
+
+
+def start(size, headless=True):
+    if os.path.exists(POOL_STATE):
+        stop()
+    browsers = []
+    try:
+        for i in range(size):
+            browsers.append(launch(i, headless))
+            # Written after every launch so stop() can always find what is running
+            with open(POOL_STATE, "w") as f:
+                json.dump({"browsers": browsers}, f, indent=2)
+        for browser in browsers:
+            log_in(browser["address"])
+    except BaseException:
+        stop()
+        raise
+    print(f"Started {size} shared Chrome process(es); set {POOL_ENV}=1 to use them")
+
+
+def status():
+    if not os.path.exists(POOL_STATE):
+        print("No browser pool is running")
+        return 1
+    browsers = load_state()["browsers"]
+    memory = process_memory([b["pid"] for b in browsers])
+    for browser in browsers:
+        try:
+            connection = BrowserConnection(browser["address"], timeout=5)
+            contexts = len(connection.send("Target.getBrowserContexts")["browserContextIds"])
+            connection.close()
+        except Exception as e:
+            contexts = f"unreachable ({type(e).__name__})"
+        print(f"{browser['address']}  pid {browser['pid']}  contexts {contexts}  {memory[browser['pid']]:.0f} MB")
+    print(f"Total {sum(memory.values()):.0f} MB")
+    return 0
+
+
+def stop():
+    if not os.path.exists(POOL_STATE):
+        return
+    for browser in load_state()["browsers"]:
+        try:
+            os.kill(browser["pid"], signal.SIGTERM)
+        except OSError:
+            pass
+    os.remove(POOL_STATE)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m tests.browser_pool", description=__doc__.split("\n\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    start_parser = commands.add_parser("start", help="launch the shared Chrome processes and log them in")
+    start_parser.add_argument("--size", type=int, default=2)
+    start_parser.add_argument("--headed", action="store_true")
+    commands.add_parser("status", help="show contexts and memory per Chrome")
+    commands.add_parser("stop", help="close every pooled Chrome")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        start(args.size, headless=not args.headed)
+    elif args.command == "status":
+        return status()
+    else:
+        stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Performance budgets for key user journeys.
+
+tests/budgets.json lists each journey test_Journeys.py measures with p50/p95
+budgets in ms, plus the margin a result may drift from its stored baseline:
+
+    allowed p50 = baseline p50 + max(relative * baseline p50,
+                                      noise_mads * pooled MAD of both runs,
+                                      min_ms)
+
+so a journey that is noisy on the CI machine needs a bigger change to count
+as a regression than a steady one. After a benchmark run
+
+    python3 -m tests.budgets
+
+prints a verdict per journey and exits 1 when any journey is over budget or
+regressed past its baseline. A journey without samples fails too, unless
+budgets.json marks it "optional" (the admin modal, for users who are not
+admins). Baselines live in tests/budget_baselines.json
+(AMPLIFY_BUDGET_BASELINES to use another file). They depend on the machine, so
+none are committed: until they are recorded from a known-good run with
+
+    python3 -m tests.budgets --update-baselines
+
+only the absolute budgets are checked, and the output says so.
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from tests.stats import REPORT_DIR, percentile
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_PATH = os.path.join(TESTS_DIR, "budgets.json")
+BASELINE_ENV = "AMPLIFY_BUDGET_BASELINES"
+DEFAULT_BASELINE_PATH = os.path.join(TESTS_DIR, "budget_baselines.json")
+
+# MAD * 1.4826 estimates the standard deviation of normally distributed samples
+MAD_SCALE = 1.4826
+
+
+def baseline_path():
+    return os.getenv(BASELINE_ENV) or DEFAULT_BASELINE_PATH
+
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def mad(values):
+    """Median absolute deviation"""
+    if not values:
+        return 0.0
+    median = percentile(values, 50)
+    return percentile([abs(v - median) for v in values], 50)
+
+
+def allowed_p50(baseline, samples, margin):
+    """Highest p50 that still counts as no regression against baseline samples"""
+    base_p50 = percentile(baseline, 50)
+    noise = MAD_SCALE * (mad(baseline) ** 2 + mad(samples) ** 2) ** 0.5
+    return base_p50 + max(
+        margin.get("relative", 0.1) * base_p50,
+        margin.get("noise_mads", 3) * noise,
+        margin.get("min_ms", 0),
+    )
+
+
+def evaluate(budgets, summary, baselines):
+    """Verdict per journey: ok, over_budget, regression, no_data or skipped (optional and no data)"""
+    margin = budgets.get("margin", {})
+    results = {}
+    for journey, budget in budgets["journeys"].items():
+        samples = (summary.get(journey) or {}).get("samples") or []
+        if not samples:
+            results[journey] = {"status": "skipped" if budget.get("optional") else "no_data"}
+            continue
+        row = {
+            "status": "ok",
+            "samples": len(samples),
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "budget": budget,
+        }
+        failures = [
+            f"{stat} {row[f'{stat}_ms']:.0f} ms > {budget[f'{stat}_ms']} ms"
+            for stat in ("p50", "p95") if f"{stat}_ms" in budget and row[f"{stat}_ms"] > budget[f"{stat}_ms"]
+        ]
+        if failures:
+            row["status"] = "over_budget"
+            row["detail"] = ", ".join(failures)
+
+        baseline = (baselines.get(journey) or {}).get("samples")
+        if baseline:
+            row["baseline_p50_ms"] = percentile(baseline, 50)
+            row["allowed_p50_ms"] = allowed_p50(baseline, samples, margin)
+            if row["p50_ms"] > row["allowed_p50_ms"] and row["status"] == "ok":
+                row["status"] = "regression"
+                row["detail"] = (
+                    f"p50 {row['p50_ms']:.0f} ms vs baseline {row['baseline_p50_ms']:.0f} ms "
+                    f"(allowed {row['allowed_p50_ms']:.0f} ms)"
+                )
+        results[journey] = row
+    return results
+
+
+def update_baselines(budgets, summary, path):
+    baselines = load_json(path, {})
+    for journey in budgets["journeys"]:
+        samples = (summary.get(journey) or {}).get("samples")
+        if samples:
+            baselines[journey] = {
+                "samples": samples,
+                "recorded": datetime.now().isoformat(timespec="seconds"),
+                "base_url": os.getenv("NEXTAUTH_URL", "http://localhost:3000"),
+            }
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2)
+    print(f"Baselines for {len(baselines)} journeys written to {path}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    budgets = load_json(BUDGET_PATH)
+    report_path = os.path.join(REPORT_DIR, f"{budgets['report']}.json")
+    report = load_json(report_path)
+    if report is None:
+        print(f"No {budgets['report']} report at {report_path}; run test_Journeys.py with AMPLIFY_BENCHMARK=1 first")
+        return 2
+    summary = report.get("summary", {})
+
+    if "--update-baselines" in argv:
+        update_baselines(budgets, summary, baseline_path())
+        return 0
+
+    baselines = load_json(baseline_path())
+    if baselines is None:
+        print(f"No baselines at {baseline_path()}; only the absolute budgets are checked. "
+              "Record them with: python3 -m tests.budgets --update-baselines")
+    results = evaluate(budgets, summary, baselines or {})
+    print(f"{'journey':<28} {'status':<12} {'p50':>8} {'p95':>8} {'baseline':>9}")
+    for journey, row in results.items():
+        p50 = f"{row['p50_ms']:.0f}" if "p50_ms" in row else "-"
+        p95 = f"{row['p95_ms']:.0f}" if "p95_ms" in row else "-"
+        base = f"{row['baseline_p50_ms']:.0f}" if "baseline_p50_ms" in row else "-"
+        print(f"{journey:<28} {row['status']:<12} {p50:>8} {p95:>8} {base:>9}  {row.get('detail', '')}")
+
+    failed = [journey for journey, row in results.items() if row["status"] in ("over_budget", "regression", "no_data")]
+    if failed:
+        print(f"Performance budgets failed: {', '.join(failed)}")
+        return 1
+    print("Performance budgets met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
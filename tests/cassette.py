@@ -0,0 +1,109 @@
+"""
+Record and replay /api/requestOp traffic per test.
+
+With AMPLIFY_CASSETTE=record (test_all_files.sh --record) BaseTest puts the
+stand-in in record mode and saves every requestOp request/response pair the
+test made to tests/cassettes/<test id>.json. Calls are keyed by method, path+op
+and the payload with ids and timestamps masked (see keyOf in tests/standin.py).
+
+With AMPLIFY_CASSETTE=replay (--replay) the stand-in answers requestOp calls
+from the test's cassette instead of the backend. Requests the cassette does
+not know, and recorded requests the test no longer makes, are appended to
+tests/reports/cassette_diff.jsonl. Summarize them with:
+
+    python3 -m tests.cassette
+"""
+
+import os
+import sys
+import json
+import time
+from tests.stats import REPORT_DIR, write_report
+
+
+CASSETTE_ENV = "AMPLIFY_CASSETTE"
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+DIFF_PATH = os.path.join(REPORT_DIR, "cassette_diff.jsonl")
+
+
+def mode():
+    """'record', 'replay' or None"""
+    value = os.getenv(CASSETTE_ENV, "").lower()
+    return value if value in ("record", "replay") else None
+
+
+def path_for(test_id):
+    return os.path.join(CASSETTE_DIR, f"{test_id}.json")
+
+
+def save(test_id, entries):
+    """Write the requestOp calls a test made, in call order"""
+    interactions = [
+        {k: e.get(k) for k in ("key", "method", "op", "status", "request", "response")}
+        for e in entries if e.get("type") == "requestOp" and e.get("key")
+    ]
+    os.makedirs(CASSETTE_DIR, exist_ok=True)
+    with open(path_for(test_id), "w") as f:
+        json.dump({
+            "test": test_id,
+            "recorded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "interactions": interactions,
+        }, f, indent=2)
+    return interactions
+
+
+def load(test_id):
+    """Cassette for the stand-in: {key: [{status, response}, ...]}, or None if never recorded"""
+    path = path_for(test_id)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        interactions = json.load(f)["interactions"]
+    cassette = {}
+    for interaction in interactions:
+        cassette.setdefault(interaction["key"], []).append(
+            {"status": interaction.get("status") or 200, "response": interaction.get("response")}
+        )
+    return cassette
+
+
+def diff(cassette, entries):
+    """Requests the cassette did not know and recorded keys that were never requested"""
+    calls = [e for e in entries if e.get("type") == "requestOp" and e.get("key")]
+    requested = {e["key"] for e in calls}
+    return {
+        # replayed is only set on calls the cassette had to answer (no stand-in rule matched)
+        "unknown": sorted({e["key"] for e in calls if e.get("replayed") is False}),
+        "unused": sorted(key for key in cassette if key not in requested),
+        "replayed": sum(1 for e in calls if e.get("replayed")),
+    }
+
+
+def record_diff(test_id, cassette, entries):
+    result = diff(cassette, entries)
+    if result["unknown"] or result["unused"]:
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        with open(DIFF_PATH, "a") as f:
+            f.write(json.dumps({"test": test_id, **result}) + "\n")
+    return result
+
+
+def main():
+    if not os.path.exists(DIFF_PATH):
+        print("Every replayed request matched its cassette")
+        return 0
+    with open(DIFF_PATH) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    for row in rows:
+        print(f"{row['test']}: {len(row['unknown'])} unknown, {len(row['unused'])} unused, {row['replayed']} replayed")
+        for key in row["unknown"]:
+            print(f"    + {key[:150]}")
+        for key in row["unused"]:
+            print(f"    - {key[:150]}")
+    write_report("cassette_diff", {"tests": rows})
+    return 1 if any(row["unknown"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
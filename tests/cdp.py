@@ -0,0 +1,109 @@
+"""
+Chrome DevTools Protocol helpers shared by the test harness.
+
+Selenium's execute_cdp_cmd only covers commands. Events are read back from
+ChromeDriver's performance log, which has to be enabled on the options before
+the driver starts (see enable_performance_log).
+"""
+
+import re
+import json
+
+
+def _enable_log(options, log_type):
+    prefs = dict(options.to_capabilities().get("goog:loggingPrefs", {}))
+    prefs[log_type] = "ALL"
+    options.set_capability("goog:loggingPrefs", prefs)
+
+
+def enable_performance_log(options):
+    """Ask ChromeDriver to forward DevTools events into the performance log"""
+    _enable_log(options, "performance")
+
+
+def enable_console_log(options):
+    """Make the page's console output available through get_log("browser")"""
+    _enable_log(options, "browser")
+
+
+def add_init_script(driver, source):
+    """Run source in every new document before the page's own scripts"""
+    return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+
+
+def heap_usage(driver, collect_garbage=False):
+    """JS heap used/total bytes plus DOM node count for the current page.
+
+    collect_garbage forces a GC first so samples taken over time are comparable.
+    """
+    if collect_garbage:
+        driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    values = {metric["name"]: metric["value"] for metric in metrics}
+    return {
+        "js_heap_used": values.get("JSHeapUsedSize", 0),
+        "js_heap_total": values.get("JSHeapTotalSize", 0),
+        "dom_nodes": values.get("Nodes", 0),
+    }
+
+
+class CdpEventLog:
+    """Buffers DevTools events from the performance log.
+
+    get_log("performance") drains the log, so every consumer in a test should
+    share one CdpEventLog instead of reading the log directly. Events that
+    reach the test some other way (a browser-level connection) come in through
+    sources: callables returning new event messages.
+    """
+
+    def __init__(self, driver, *sources):
+        self.driver = driver
+        self.sources = sources
+        self.events = []
+
+    def poll(self):
+        """Move any new events from ChromeDriver into the buffer"""
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            self.events.append(message)
+        for source in self.sources:
+            self.events.extend(source())
+        return self.events
+
+    def find(self, *methods):
+        """Params of every buffered event whose method is in methods"""
+        self.poll()
+        return [
+            event.get("params", {}) for event in self.events
+            if event.get("method") in methods
+        ]
+
+    def clear(self):
+        self.poll()
+        self.events = []
+
+
+class ConsoleLog:
+    """Buffers the page's console messages; get_log("browser") drains too."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.messages = []
+
+    def poll(self):
+        for entry in self.driver.get_log("browser"):
+            self.messages.append(entry.get("message", ""))
+        return self.messages
+
+    def search(self, pattern):
+        """Every regex match of pattern across buffered messages"""
+        self.poll()
+        return [m for message in self.messages for m in re.finditer(pattern, message)]
+
+    def clear(self):
+        self.poll()
+        self.messages = []
@@ -0,0 +1,245 @@
+"""
+CPU profiles of the app during Selenium tests.
+
+With AMPLIFY_CPU_PROFILE set (test_all_files.sh --profile) BaseTest runs the
+V8 sampling profiler through CDP (Profiler.start/stop) and saves each profile
+to tests/reports/cpuprofiles/<test id>[.<section>].cpuprofile, which Chrome
+DevTools (Performance panel) and speedscope open directly.
+
+    AMPLIFY_CPU_PROFILE=test       profile each test body, from the end of setUp to tearDown
+    AMPLIFY_CPU_PROFILE=sections   profile only sections a test marks:
+
+        with self.cpu_profile("open_assistant_modal"):
+            add_button.click()
+            self.wait.until(...)
+
+CPU_PROFILE_INTERVAL_US sets the sampling interval (default 200 us). After
+the run, aggregate every saved profile with
+
+    python3 -m tests.cpu_profile
+
+which prints the functions with the most self time across the run and writes
+tests/reports/cpu_profile.json, cpu_profile.folded (folded stacks for
+flamegraph.pl/speedscope) and cpu_flamegraph.svg.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import bisect
+import hashlib
+import urllib.parse
+from html import escape
+from tests.stats import REPORT_DIR, write_report
+from tests.preflight import fetch
+from tests import js_coverage
+
+
+CPU_PROFILE_ENV = "AMPLIFY_CPU_PROFILE"
+PROFILE_DIR = os.path.join(REPORT_DIR, "cpuprofiles")
+FOLDED_PATH = os.path.join(REPORT_DIR, "cpu_profile.folded")
+FLAMEGRAPH_PATH = os.path.join(REPORT_DIR, "cpu_flamegraph.svg")
+
+# Nodes that are not JavaScript the app runs
+SKIPPED_FRAMES = {"(root)", "(idle)"}
+
+TOP_FUNCTIONS = 30
+
+# url -> source map segments grouped by generated line, for names in minified chunks
+_line_segments = {}
+
+
+def mode():
+    """'test', 'sections' or None"""
+    value = os.getenv(CPU_PROFILE_ENV)
+    if value in ("1", "test"):
+        return "test"
+    return "sections" if value == "sections" else None
+
+
+def start(driver):
+    driver.execute_cdp_cmd("Profiler.enable", {})
+    driver.execute_cdp_cmd("Profiler.setSamplingInterval", {
+        "interval": int(os.getenv("CPU_PROFILE_INTERVAL_US", "200")),
+    })
+    driver.execute_cdp_cmd("Profiler.start", {})
+
+
+def stop(driver, name):
+    """Stop the profiler and save the profile as <name>.cpuprofile; returns the path"""
+    profile = driver.execute_cdp_cmd("Profiler.stop", {})["profile"]
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, re.sub(r"[^A-Za-z0-9_.-]+", "_", name) + ".cpuprofile")
+    with open(path, "w") as f:
+        json.dump(profile, f)
+    return path
+
+
+# ----------------- Aggregation -----------------
+
+def original_location(url, line, column):
+    """file:line in the original sources when the script has a source map, else None"""
+    if url.startswith("webpack-internal://"):
+        path = js_coverage.project_path(url)
+        return f"{path}:{line + 1}" if path else None
+    if not url.startswith("http"):
+        return None
+    if url not in _line_segments:
+        _line_segments[url] = None
+        try:
+            status, body = fetch(url, 10)
+            parsed = js_coverage.source_map(url, body.decode("utf-8", "replace")) if status == 200 else None
+        except (OSError, ValueError):
+            parsed = None
+        if parsed:
+            by_line = {}
+            for gen_line, gen_column, index, source_line in parsed["segments"]:
+                by_line.setdefault(gen_line, []).append((gen_column, parsed["sources"][index], source_line))
+            _line_segments[url] = {key: sorted(value, key=lambda s: s[0]) for key, value in by_line.items()}
+    segments = (_line_segments[url] or {}).get(line)
+    if not segments:
+        return None
+    position = bisect.bisect_right([s[0] for s in segments], column) - 1
+    if position < 0 or not segments[position][1]:
+        return None
+    return f"{segments[position][1]}:{segments[position][2] + 1}"
+
+
+def frame_name(call_frame):
+    name = call_frame.get("functionName") or "(anonymous)"
+    url = call_frame.get("url", "")
+    if not url:
+        return name
+    location = original_location(url, call_frame.get("lineNumber", 0), call_frame.get("columnNumber", 0))
+    if location is None:
+        location = f"{urllib.parse.urlparse(url).path.rsplit('/', 1)[-1]}:{call_frame.get('lineNumber', 0) + 1}"
+    return f"{name} ({location})"
+
+
+def sample_weights(profile):
+    """Microseconds attributed to each sample: the gap until the next sample"""
+    deltas = profile.get("timeDeltas") or []
+    samples = profile.get("samples") or []
+    weights = deltas[1:len(samples)] + [0]
+    return zip(samples, weights)
+
+
+def fold(profile, stacks):
+    """Add the profile's samples to stacks: {"a;b;c": microseconds}"""
+    nodes = {node["id"]: node for node in profile["nodes"]}
+    parents = {child: node["id"] for node in profile["nodes"] for child in node.get("children", [])}
+    names = {}
+    for node_id, weight in sample_weights(profile):
+        if weight <= 0 or node_id not in nodes:
+            continue
+        if node_id not in names:
+            frames, current = [], node_id
+            while current is not None:
+                call_frame = nodes[current]["callFrame"]
+                if call_frame.get("functionName") not in SKIPPED_FRAMES:
+                    frames.append(frame_name(call_frame).replace(";", ","))
+                current = parents.get(current)
+            names[node_id] = ";".join(reversed(frames))
+        if names[node_id]:
+            stacks[names[node_id]] = stacks.get(names[node_id], 0) + weight
+    return stacks
+
+
+def self_times(stacks):
+    """Self microseconds per function (the leaf of each stack), largest first"""
+    totals = {}
+    for stack, weight in stacks.items():
+        leaf = stack.rsplit(";", 1)[-1]
+        totals[leaf] = totals.get(leaf, 0) + weight
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+# ----------------- Flamegraph -----------------
+
+def flame_tree(stacks):
+    root = {"name": "all", "value": 0, "children": {}}
+    for stack, weight in stacks.items():
+        root["value"] += weight
+        node = root
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"name": frame, "value": 0, "children": {}})
+            node["value"] += weight
+    return root
+
+
+def flamegraph_svg(stacks, width=1600, row=17):
+    """Self-contained SVG flamegraph (root at the bottom) of folded stacks"""
+    root = flame_tree(stacks)
+    rects, depth = [], [0]
+
+    def layout(node, x, level):
+        node_width = node["value"] / root["value"] * width if root["value"] else 0
+        if node_width < 0.5:
+            return
+        depth[0] = max(depth[0], level)
+        rects.append((node, x, level, node_width))
+        child_x = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            layout(child, child_x, level + 1)
+            child_x += child["value"] / root["value"] * width
+
+    layout(root, 0, 0)
+    height = (depth[0] + 1) * row + row
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="12">CPU flamegraph, {root["value"] / 1000:.0f} ms sampled</text>',
+    ]
+    for node, x, level, node_width in rects:
+        y = height - (level + 1) * row
+        hue = int(hashlib.md5(node["name"].encode("utf-8")).hexdigest()[:2], 16) % 60
+        label = node["name"][:max(0, int(node_width / 7))]
+        title = f'{node["name"]} ({node["value"] / 1000:.1f} ms, {node["value"] / root["value"] * 100:.1f}%)'
+        parts.append(
+            f'<g><title>{escape(title)}</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{node_width:.1f}" height="{row - 1}" fill="hsl({hue},80%,60%)"/>'
+            f'<text x="{x + 2:.1f}" y="{y + row - 5}">{escape(label)}</text></g>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def main():
+    paths = sorted(glob.glob(os.path.join(PROFILE_DIR, "*.cpuprofile")))
+    if not paths:
+        print(f"No CPU profiles found in {PROFILE_DIR}")
+        return 1
+
+    stacks, per_profile = {}, {}
+    for path in paths:
+        with open(path) as f:
+            profile = json.load(f)
+        profile_stacks = fold(profile, {})
+        per_profile[os.path.basename(path)] = sum(profile_stacks.values()) / 1000
+        for stack, weight in profile_stacks.items():
+            stacks[stack] = stacks.get(stack, 0) + weight
+
+    total = sum(stacks.values())
+    top = list(self_times(stacks).items())[:TOP_FUNCTIONS]
+    print(f"{'self ms':>9} {'%':>6}  function")
+    for name, weight in top:
+        print(f"{weight / 1000:>9.1f} {weight / total * 100 if total else 0:>5.1f}%  {name}")
+
+    with open(FOLDED_PATH, "w") as f:
+        for stack, weight in sorted(stacks.items()):
+            f.write(f"{stack} {weight}\n")
+    with open(FLAMEGRAPH_PATH, "w") as f:
+        f.write(flamegraph_svg(stacks))
+    print(f"Flamegraph written to {FLAMEGRAPH_PATH}")
+
+    write_report("cpu_profile", {
+        "profiles": per_profile,
+        "sampled_ms": total / 1000,
+        "top_self_ms": {name: weight / 1000 for name, weight in top},
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+JavaScript coverage of the app code the Selenium suite executes.
+
+With AMPLIFY_JS_COVERAGE=1 (test_all_files.sh --js-coverage) BaseTest starts
+V8 precise coverage (Profiler.startPreciseCoverage with call counts and block
+ranges) before the first page load. At tearDown it takes the coverage of every
+app script, maps it back through the script's source map to the original
+utils/, components/, pages/ ... files and appends the covered and missed
+lines per file to tests/reports/js_coverage.jsonl.
+
+Source maps:
+    next dev     inline maps, nothing to do
+    next build   set AMPLIFY_SOURCE_MAPS=1 for the build so next.config.js
+                 emits productionBrowserSourceMaps; scripts without a map
+                 are left out and listed in the report
+
+Merge the run into a per-file report (tests/reports/js_coverage.json) with:
+
+    python3 -m tests.js_coverage
+
+Files in HOT_PATHS (JS_COVERAGE_HOT_PATHS, comma separated) are listed
+separately with their uncovered lines, so hot code gets regression coverage
+before it is optimized. App files that no test loaded at all are listed too.
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import base64
+import urllib.parse
+from tests.stats import REPORT_DIR, write_report
+from tests.preflight import fetch
+
+
+COVERAGE_ENV = "AMPLIFY_JS_COVERAGE"
+COVERAGE_PATH = os.path.join(REPORT_DIR, "js_coverage.jsonl")
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hot paths from the storage and payload work; a file below HOT_MIN line coverage is flagged
+HOT_PATHS = ["utils/app/conversationStorage.ts", "utils/app/lzwCompression.ts"]
+HOT_MIN = 0.8
+
+# Files the "never loaded" list looks for
+APP_FILE_GLOBS = ["utils/app/*.ts", "components/**/*.tsx", "components/**/*.ts"]
+
+SOURCE_MAP_URL = re.compile(r"//[#@] sourceMappingURL=(\S+)\s*$")
+BASE64_DIGITS = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+# url -> sorted (offset, file, line) mappings, or None without a source map, for scripts seen by this process
+_script_mappings = {}
+
+
+def enabled():
+    return os.getenv(COVERAGE_ENV) == "1"
+
+
+def start(driver):
+    """Start collecting; call before the first navigation so every app script is counted"""
+    driver.execute_cdp_cmd("Profiler.enable", {})
+    driver.execute_cdp_cmd("Debugger.enable", {})
+    driver.execute_cdp_cmd("Profiler.startPreciseCoverage", {"callCount": True, "detailed": True})
+
+
+def is_app_script(url, base_url):
+    if url.startswith("webpack-internal://"):
+        return True
+    return url.startswith(base_url.rstrip("/") + "/") and "/_next/" in url
+
+
+# ----------------- Source maps -----------------
+
+def decode_vlq(segment):
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = BASE64_DIGITS[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value, shift = 0, 0
+    return values
+
+
+def decode_mappings(mappings):
+    """[(generated line, generated column, source index, source line)] from a v3 mappings string"""
+    segments = []
+    source = source_line = 0
+    for line, group in enumerate(mappings.split(";")):
+        column = 0
+        for segment in group.split(","):
+            if not segment:
+                continue
+            values = decode_vlq(segment)
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                source_line += values[2]
+                segments.append((line, column, source, source_line))
+    return segments
+
+
+def project_path(source):
+    """Repo-relative path for a source map entry, or None for node_modules and generated code"""
+    path = source.split("?")[0]
+    if "/./" in path:
+        path = path.rsplit("/./", 1)[1]
+    elif path.startswith("webpack://"):
+        path = path.split("/", 3)[-1]
+    if os.path.isabs(path) and path.startswith(PROJECT_DIR + os.sep):
+        path = os.path.relpath(path, PROJECT_DIR)
+    path = re.sub(r"^(\./)+", "", path)
+    if not path or path.startswith("node_modules/") or "/node_modules/" in path:
+        return None
+    return path if os.path.isfile(os.path.join(PROJECT_DIR, path)) else None
+
+
+def source_map(url, source):
+    """Parsed source map of a script: {"sources": [...], "segments": [...]}, or None"""
+    match = SOURCE_MAP_URL.search(source[-2000:])
+    if not match:
+        return None
+    try:
+        reference = match.group(1)
+        if reference.startswith("data:"):
+            raw = base64.b64decode(reference.split(",", 1)[1])
+        else:
+            status, raw = fetch(urllib.parse.urljoin(url, reference), 10)
+            if status != 200:
+                return None
+        data = json.loads(raw)
+        return {
+            "sources": [project_path(s) for s in data.get("sources", [])],
+            "segments": decode_mappings(data.get("mappings", "")),
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# ----------------- Collection -----------------
+
+def counts_at(ranges, offsets):
+    """Execution count of the innermost range around each offset (offsets sorted)"""
+    ranges = sorted(ranges, key=lambda r: (r[0], -r[1]))
+    counts, stack, i = [], [], 0
+    for offset in offsets:
+        while i < len(ranges) and ranges[i][0] <= offset:
+            while stack and stack[-1][1] <= ranges[i][0]:
+                stack.pop()
+            stack.append(ranges[i])
+            i += 1
+        while stack and stack[-1][1] <= offset:
+            stack.pop()
+        counts.append(stack[-1][2] if stack else 0)
+    return counts
+
+
+def script_mappings(url, source):
+    """Generated offsets of a script mapped to (offset, file, line) in the original files"""
+    parsed = source_map(url, source)
+    if parsed is None:
+        return None
+    starts = [0] + [match.end() for match in re.finditer("\n", source)]
+    sources = parsed["sources"]
+    return sorted(
+        (starts[line] + column, sources[index], source_line + 1)
+        for line, column, index, source_line in parsed["segments"]
+        if line < len(starts) and index < len(sources) and sources[index]
+    )
+
+
+def script_lines(mappings, ranges):
+    """{file: {line: count}} for one script; a line counts as run if any code on it ran"""
+    counts = counts_at(ranges, [offset for offset, _, _ in mappings])
+    files = {}
+    for (_, path, line), count in zip(mappings, counts):
+        lines = files.setdefault(path, {})
+        lines[line] = max(lines.get(line, 0), count)
+    return files
+
+
+def collect(driver, test_id, base_url):
+    """Take the coverage since start() and append this test's per-file lines"""
+    result = driver.execute_cdp_cmd("Profiler.takePreciseCoverage", {})["result"]
+    files, unmapped = {}, []
+    for script in result:
+        url = script.get("url", "")
+        if not is_app_script(url, base_url):
+            continue
+        if url not in _script_mappings:
+            try:
+                source = driver.execute_cdp_cmd("Debugger.getScriptSource", {"scriptId": script["scriptId"]})
+            except Exception:
+                # The script belonged to a document that has since been replaced
+                continue
+            _script_mappings[url] = script_mappings(url, source["scriptSource"])
+        if _script_mappings[url] is None:
+            unmapped.append(url)
+            continue
+        ranges = [
+            (r["startOffset"], r["endOffset"], r["count"])
+            for function in script["functions"] for r in function["ranges"]
+        ]
+        for path, lines in script_lines(_script_mappings[url], ranges).items():
+            merged = files.setdefault(path, {})
+            for line, count in lines.items():
+                merged[line] = merged.get(line, 0) + count
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    with open(COVERAGE_PATH, "a") as f:
+        f.write(json.dumps({
+            "test": test_id,
+            "unmapped": sorted(set(unmapped)),
+            "files": {
+                path: {
+                    "hit": {str(line): count for line, count in sorted(lines.items()) if count},
+                    "missed": sorted(line for line, count in lines.items() if not count),
+                }
+                for path, lines in files.items()
+            },
+        }) + "\n")
+
+
+# ----------------- Report -----------------
+
+def load_records(path=COVERAGE_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def line_spans(lines):
+    """[3, 4, 5, 9] -> "3-5, 9" """
+    spans = []
+    for line in sorted(lines):
+        if spans and line == spans[-1][1] + 1:
+            spans[-1][1] = line
+        else:
+            spans.append([line, line])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in spans)
+
+
+def merge(records):
+    """Per-file line coverage over all tests, lowest coverage first"""
+    hits, lines, tests = {}, {}, {}
+    for record in records:
+        for path, data in record["files"].items():
+            file_hits = hits.setdefault(path, {})
+            for line, count in data["hit"].items():
+                file_hits[int(line)] = file_hits.get(int(line), 0) + count
+            lines.setdefault(path, set()).update(int(line) for line in data["hit"])
+            lines[path].update(data["missed"])
+            if data["hit"]:
+                tests.setdefault(path, set()).add(record["test"])
+
+    files = {}
+    for path, executable in lines.items():
+        covered = set(hits.get(path, {}))
+        files[path] = {
+            "lines": len(executable),
+            "covered": len(covered),
+            "coverage": len(covered) / len(executable) if executable else None,
+            "executions": sum(hits.get(path, {}).values()),
+            "tests": sorted(tests.get(path, ())),
+            "uncovered": line_spans(executable - covered),
+        }
+    return dict(sorted(files.items(), key=lambda item: (item[1]["coverage"] or 0, item[0])))
+
+
+def never_loaded(files):
+    app_files = {
+        os.path.relpath(p, PROJECT_DIR)
+        for pattern in APP_FILE_GLOBS
+        for p in glob.glob(os.path.join(PROJECT_DIR, pattern), recursive=True)
+    }
+    return sorted(app_files - set(files))
+
+
+def main():
+    records = load_records()
+    if not records:
+        print(f"No coverage recorded in {COVERAGE_PATH}")
+        return 1
+
+    files = merge(records)
+    hot_paths = os.getenv("JS_COVERAGE_HOT_PATHS", ",".join(HOT_PATHS)).split(",")
+    hot = {
+        path: files.get(path, {"lines": 0, "covered": 0, "coverage": 0.0, "executions": 0, "tests": [], "uncovered": "all"})
+        for path in hot_paths
+    }
+    unloaded = never_loaded(files)
+    unmapped = sorted({url for record in records for url in record.get("unmapped", [])})
+
+    print(f"{'file':<70} {'lines':>6} {'covered':>8} {'tests':>6} {'executions':>11}")
+    for path, row in files.items():
+        coverage = f"{row['coverage'] * 100:.0f}%" if row["coverage"] is not None else "-"
+        print(f"{path[-70:]:<70} {row['lines']:>6} {coverage:>8} {len(row['tests']):>6} {row['executions']:>11}")
+
+    print("\nHot paths:")
+    for path, row in hot.items():
+        flag = "UNDER-TESTED" if (row["coverage"] or 0) < HOT_MIN else "ok"
+        print(f"  {path}: {(row['coverage'] or 0) * 100:.0f}% of {row['lines']} lines, "
+              f"{len(row['tests'])} tests [{flag}]")
+        if row["uncovered"]:
+            print(f"    uncovered lines: {row['uncovered']}")
+
+    print(f"\n{len(unloaded)} app files were never loaded by any test")
+    if unmapped:
+        print(f"{len(unmapped)} scripts had no source map and were left out; build with AMPLIFY_SOURCE_MAPS=1")
+    write_report("js_coverage", {
+        "tests": len(records),
+        "hot_paths": hot,
+        "never_loaded": unloaded,
+        "unmapped_scripts": unmapped,
+        "files": files,
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
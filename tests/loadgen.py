@@ -0,0 +1,320 @@
+"""
+HTTP-level load generator for /api/requestOp.
+
+Drives pages/api/requestOp.ts directly with asyncio instead of a browser. It
+reuses a logged-in session cookie, sends a weighted mix of ops at fixed target
+rates (open loop: requests are sent on schedule whether or not earlier ones
+have finished) and reports a latency histogram per rate plus the rate at which
+the Next.js proxy layer saturates.
+
+    python3 -m tests.loadgen --rps 5,10,20,50 --duration 30 --mix models=2,assistants=1
+
+The session cookie comes from --cookie or AMPLIFY_SESSION_COOKIE; without one
+the script logs in once through BaseTest. --from-profile replays the GET ops
+recorded in tests/reports/payload_profile.jsonl (see tests/payload_profiler.py),
+weighted by how often the UI suite called them.
+"""
+
+import os
+import ssl
+import sys
+import json
+import random
+import asyncio
+import argparse
+import unittest
+from urllib.parse import urlsplit
+from tests.preflight import load_config
+from tests.requestop_client import encode, decode
+from tests.stats import summarize, write_report
+from tests import payload_profiler
+
+
+# Named op mixes, each op as doRequestOp sends it from services/*.ts.
+# models is answered inside requestOp.ts itself, so it isolates the proxy layer.
+MIXES = {
+    "models": [{"method": "GET", "path": "/available_models", "op": ""}],
+    "assistants": [{"method": "GET", "path": "/assistant", "op": "/list"}],
+    "files": [{
+        "method": "POST", "path": "/files", "op": "/query",
+        "data": {
+            "pageSize": 10, "sortIndex": "createdAt", "forwardScan": False,
+            "filters": [{"attribute": "data.type", "operator": "not_startsWith", "value": "assistant"}],
+        },
+    }],
+    "shares": [{"method": "GET", "path": "/state", "op": "/share"}],
+}
+
+# Histogram bucket upper bounds in ms
+BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# Failures that leave a connection in an unknown state; anything else keeps it open
+TRANSPORT_ERRORS = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError)
+
+
+def parse_mix(spec):
+    """'models=2,assistants=1' -> weighted list of ops"""
+    ops = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in MIXES:
+            raise SystemExit(f"Unknown mix '{name}', choose from {', '.join(MIXES)}")
+        for op in MIXES[name]:
+            ops.append({**op, "name": name, "weight": float(weight or 1)})
+    return ops
+
+
+def profile_mix(path=payload_profiler.PROFILE_PATH):
+    """GET ops recorded by the payload profile, weighted by call count.
+
+    Only bodiless GETs are replayed; the profile keeps the op key, not the payloads.
+    """
+    counts = {}
+    for call in payload_profiler.load_calls(path):
+        if call.get("method") == "GET" and call.get("op"):
+            counts[call["op"]] = counts.get(call["op"], 0) + 1
+    return [{"method": "GET", "path": op, "op": "", "name": op, "weight": count} for op, count in counts.items()]
+
+
+def request_body(op):
+    op_data = {"method": op["method"], "path": op["path"], "op": op["op"]}
+    if op.get("data") is not None:
+        op_data["data"] = encode(op["data"])
+    return json.dumps({"data": op_data}).encode("utf-8")
+
+
+def histogram(values):
+    counts = [0] * (len(BUCKETS) + 1)
+    for value in values:
+        counts[next((i for i, bound in enumerate(BUCKETS) if value <= bound), len(BUCKETS))] += 1
+    labels = [f"<={bound}ms" for bound in BUCKETS] + [f">{BUCKETS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+def browser_session_cookie():
+    """Log in once through the Selenium harness and return the session cookie header"""
+    from tests.base_test import BaseTest
+    from tests.requestop_client import cookie_header
+    try:
+        BaseTest.setUpClass()
+        session = BaseTest("login")
+        session.setUp(headless=True)
+    except unittest.SkipTest as e:
+        raise SystemExit(f"Could not log in for a session cookie:\n{e}")
+    try:
+        return cookie_header(session.driver)
+    finally:
+        session.tearDown()
+
+
+# ----------------- HTTP -----------------
+class Connection:
+    """One keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, host, port, use_ssl):
+        self.host, self.port, self.use_ssl = host, port, use_ssl
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=ssl.create_default_context() if self.use_ssl else None
+            )
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        try:
+            status = int(head[0].split(" ")[1])
+        except (IndexError, ValueError):
+            raise ConnectionError(f"Malformed status line {head[0]!r}")
+        response_headers = {}
+        for line in head[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                response_headers[key.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            data = await self.reader.readexactly(int(response_headers["content-length"]))
+        elif response_headers.get("transfer-encoding") == "chunked":
+            data = b""
+            while True:
+                line = await self.reader.readuntil(b"\r\n")
+                try:
+                    size = int(line.strip().split(b";")[0], 16)
+                except ValueError:
+                    raise ConnectionError(f"Malformed chunk size {line!r}")
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                data += chunk[:-2]
+        else:
+            data = await self.reader.read()
+            self.close()
+        if response_headers.get("connection") == "close":
+            self.close()
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class LoadGenerator:
+    def __init__(self, base_url, cookie, ops, connections=50, timeout=30, seed=216):
+        url = urlsplit(base_url)
+        use_ssl = url.scheme == "https"
+        self.endpoint = (url.path.rstrip("/") or "") + "/api/requestOp"
+        self.headers = {"Content-Type": "application/json", "Cookie": cookie}
+        self.ops = ops
+        self.weights = [op["weight"] for op in ops]
+        self.bodies = [request_body(op) for op in ops]
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.pool = asyncio.Queue()
+        for _ in range(connections):
+            self.pool.put_nowait(Connection(url.hostname, url.port or (443 if use_ssl else 80), use_ssl))
+
+    async def send(self, index, scheduled, results):
+        loop = asyncio.get_running_loop()
+        connection = await self.pool.get()
+        sent = loop.time()
+        result = {"op": self.ops[index]["name"], "queued_ms": (sent - scheduled) * 1000}
+        try:
+            status, data = await asyncio.wait_for(
+                connection.request("POST", self.endpoint, self.headers, self.bodies[index]), self.timeout
+            )
+        except TRANSPORT_ERRORS as e:
+            # The next request on this connection reconnects
+            connection.close()
+            result.update(status=None, ok=False, error=f"{type(e).__name__}: {e}")
+        else:
+            result["status"] = status
+            try:
+                body = decode(json.loads(data)["data"]) if status == 200 else None
+                result["ok"] = status == 200 and not (isinstance(body, dict) and body.get("success") is False)
+            except Exception as e:
+                # A bad body is the op's failure, not the connection's
+                result.update(ok=False, error=f"Bad response: {type(e).__name__}: {e}")
+        finally:
+            self.pool.put_nowait(connection)
+        done = loop.time()
+        # Latency counts from the scheduled send time so a backed-up proxy is not hidden
+        result["latency_ms"] = (done - scheduled) * 1000
+        result["service_ms"] = (done - sent) * 1000
+        results.append(result)
+
+    async def run_step(self, rps, duration):
+        loop = asyncio.get_running_loop()
+        results, tasks = [], []
+        start = loop.time()
+        for i in range(max(1, int(rps * duration))):
+            scheduled = start + i / rps
+            await asyncio.sleep(max(0.0, scheduled - loop.time()))
+            index = self.rng.choices(range(len(self.ops)), weights=self.weights)[0]
+            tasks.append(asyncio.create_task(self.send(index, scheduled, results)))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+        return results, elapsed
+
+
+def step_report(rps, results, elapsed):
+    latencies = [r["latency_ms"] for r in results]
+    errors = [r for r in results if not r["ok"]]
+    by_op = {}
+    for r in results:
+        by_op.setdefault(r["op"], []).append(r)
+    return {
+        "target_rps": rps,
+        "achieved_rps": len(results) / elapsed if elapsed else None,
+        "requests": len(results),
+        "error_rate": len(errors) / len(results) if results else None,
+        "errors": sorted({r.get("error") or f"HTTP {r['status']}" for r in errors}),
+        "latency_ms": summarize(latencies),
+        "service_ms": summarize([r["service_ms"] for r in results]),
+        "queued_ms": summarize([r["queued_ms"] for r in results]),
+        "histogram": histogram(latencies),
+        "ops": {op: summarize([r["latency_ms"] for r in op_results]) for op, op_results in by_op.items()},
+    }
+
+
+def saturated(step, baseline, max_error_rate, latency_factor):
+    """Why a step counts as past saturation, or None"""
+    if step["achieved_rps"] is not None and step["achieved_rps"] < 0.9 * step["target_rps"]:
+        return "throughput below 90% of target"
+    if step["error_rate"] and step["error_rate"] > max_error_rate:
+        return f"error rate {step['error_rate']:.1%}"
+    if baseline and step["latency_ms"].get("p95", 0) > latency_factor * baseline["latency_ms"].get("p95", 0):
+        return f"p95 over {latency_factor}x the first step"
+    return None
+
+
+def print_step(step):
+    latency = step["latency_ms"]
+    print(
+        f"{step['target_rps']:>7.1f} rps -> {step['achieved_rps']:>7.1f} rps  "
+        f"p50 {latency.get('p50', 0):>8.1f}ms  p95 {latency.get('p95', 0):>8.1f}ms  "
+        f"p99 {latency.get('p99', 0):>8.1f}ms  errors {step['error_rate']:.1%}"
+    )
+    peak = max(step["histogram"].values()) or 1
+    for label, count in step["histogram"].items():
+        if count:
+            print(f"    {label:>10} {'#' * max(1, int(40 * count / peak))} {count}")
+
+
+async def run(args, cookie, ops):
+    generator = LoadGenerator(args.base_url, cookie, ops, connections=args.connections, timeout=args.timeout)
+    steps, saturation = [], None
+    for rps in args.rps:
+        results, elapsed = await generator.run_step(rps, args.duration)
+        step = step_report(rps, results, elapsed)
+        steps.append(step)
+        print_step(step)
+        reason = saturated(step, steps[0] if len(steps) > 1 else None, args.max_error_rate, args.latency_factor)
+        if reason:
+            saturation = {"target_rps": rps, "reason": reason,
+                          "last_good_rps": steps[-2]["target_rps"] if len(steps) > 1 else None}
+            print(f"Saturated at {rps} rps: {reason}")
+            if not args.keep_going:
+                break
+    return steps, saturation
+
+
+def main(argv=None):
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="python3 -m tests.loadgen", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--base-url", default=config["base_url"])
+    parser.add_argument("--cookie", default=os.getenv("AMPLIFY_SESSION_COOKIE"))
+    parser.add_argument("--rps", default="5,10,20,50,100", type=lambda s: [float(r) for r in s.split(",")])
+    parser.add_argument("--duration", type=float, default=30, help="seconds per rate step")
+    parser.add_argument("--mix", default="models=1,assistants=1,files=1,shares=1")
+    parser.add_argument("--from-profile", action="store_true", help="replay GET ops from the payload profile")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--latency-factor", type=float, default=3.0)
+    parser.add_argument("--keep-going", action="store_true", help="keep stepping after saturation")
+    args = parser.parse_args(argv)
+
+    ops = profile_mix() if args.from_profile else parse_mix(args.mix)
+    if not ops:
+        print(f"No GET ops recorded in {payload_profiler.PROFILE_PATH}; run the suite with --payload-profile first")
+        return 1
+    cookie = args.cookie or browser_session_cookie()
+
+    steps, saturation = asyncio.run(run(args, cookie, ops))
+    write_report("loadgen", {
+        "ops": [{k: op[k] for k in ("name", "method", "path", "op", "weight")} for op in ops],
+        "duration": args.duration,
+        "connections": args.connections,
+        "steps": steps,
+        "saturation": saturation,
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
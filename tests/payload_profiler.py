@@ -0,0 +1,109 @@
+"""
+Per-op payload size profile for /api/requestOp.
+
+doRequestOp base64 encodes JSON.stringify output before POSTing it, and
+requestOp.ts decodes it and usually lzwCompresses it again before calling the
+backend. With AMPLIFY_PAYLOAD_PROFILE=1 (test_all_files.sh --payload-profile)
+BaseTest puts the stand-in fetch wrapper in measure mode; every requestOp call
+a test makes is logged with its raw, base64 and upstream (LZW) sizes and
+appended to tests/reports/payload_profile.jsonl.
+
+The encode/decode times (est_encode_ms/est_decode_ms) are estimates: the
+stand-in re-encodes each payload with its own TextEncoder/btoa codec, since the
+app's transformPayload (Buffer base64 in utils/app/data.ts) cannot be wrapped
+from the page. They track payload cost, not the app's actual encode time.
+
+Summarize the collected calls with:
+
+    python3 -m tests.payload_profiler
+"""
+
+import os
+import sys
+import json
+from tests.stats import REPORT_DIR, summarize, write_report
+
+
+PROFILE_ENV = "AMPLIFY_PAYLOAD_PROFILE"
+PROFILE_PATH = os.path.join(REPORT_DIR, "payload_profile.jsonl")
+
+SIZE_FIELDS = [
+    "requestRawBytes", "requestEncodedBytes", "requestUpstreamBytes",
+    "responseRawBytes", "responseEncodedBytes",
+]
+
+
+def enabled():
+    return os.getenv(PROFILE_ENV) == "1"
+
+
+def record_calls(test_id, entries):
+    """Append the requestOp calls logged during one test"""
+    calls = [e for e in entries if e.get("type") == "requestOp"]
+    if not calls:
+        return
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    with open(PROFILE_PATH, "a") as f:
+        for call in calls:
+            f.write(json.dumps({"test": test_id, **call}) + "\n")
+
+
+def load_calls(path=PROFILE_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def profile(calls):
+    """Aggregate calls per op, largest total encoded traffic first"""
+    by_op = {}
+    for call in calls:
+        by_op.setdefault(call.get("op") or "(none)", []).append(call)
+
+    ops = {}
+    for op, op_calls in by_op.items():
+        totals = {field: sum(c.get(field) or 0 for c in op_calls) for field in SIZE_FIELDS}
+        raw = totals["requestRawBytes"] + totals["responseRawBytes"]
+        encoded = totals["requestEncodedBytes"] + totals["responseEncodedBytes"]
+        ops[op] = {
+            "calls": len(op_calls),
+            "tests": sorted({c["test"] for c in op_calls}),
+            **{f"total_{field}": value for field, value in totals.items()},
+            "base64_overhead": (encoded / raw - 1) if raw else None,
+            "upstream_vs_raw": (totals["requestUpstreamBytes"] / totals["requestRawBytes"])
+            if totals["requestRawBytes"] else None,
+            "est_encode_ms": summarize([c.get("estEncodeMs") for c in op_calls]),
+            "est_decode_ms": summarize([c.get("estDecodeMs") for c in op_calls]),
+            "latency_ms": summarize([c["end"] - c["start"] for c in op_calls if "end" in c]),
+        }
+    return dict(sorted(
+        ops.items(),
+        key=lambda item: -(item[1]["total_requestEncodedBytes"] + item[1]["total_responseEncodedBytes"]),
+    ))
+
+
+def main():
+    calls = load_calls()
+    if not calls:
+        print(f"No requestOp calls recorded in {PROFILE_PATH}")
+        return 1
+
+    ops = profile(calls)
+    print(f"{'op':<45} {'calls':>6} {'raw':>10} {'base64':>10} {'upstream':>10} {'overhead':>9} {'~enc p50':>8} {'~dec p50':>8}")
+    for op, row in ops.items():
+        raw = row["total_requestRawBytes"] + row["total_responseRawBytes"]
+        encoded = row["total_requestEncodedBytes"] + row["total_responseEncodedBytes"]
+        overhead = f"{row['base64_overhead'] * 100:.0f}%" if row["base64_overhead"] is not None else "-"
+        print(
+            f"{op[:45]:<45} {row['calls']:>6} {raw:>10} {encoded:>10} "
+            f"{row['total_requestUpstreamBytes']:>10} {overhead:>9} "
+            f"{(row['est_encode_ms'].get('p50') or 0):>8.3f} {(row['est_decode_ms'].get('p50') or 0):>8.3f}"
+        )
+    print("~enc/~dec: ms estimated by re-encoding with the stand-in's own base64 codec, not the app's transformPayload")
+    write_report("payload_profile", {"ops": ops})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
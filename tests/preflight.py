@@ -0,0 +1,166 @@
+"""
+Pre-flight checks that run once before the Selenium suite.
+
+Every test spins up Chrome and waits through is_logged_in/login before it can
+fail, so a dead server or broken login costs ~45 seconds per test. These checks
+probe the Next.js server, the login provider and the backend in parallel and
+report a single diagnosis instead. Cassette replay runs (AMPLIFY_CASSETTE=replay)
+skip the backend and chat endpoint checks.
+
+Run directly with:
+
+    python3 -m tests.preflight
+"""
+
+import os
+import sys
+import json
+import time
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from tests import cassette
+
+
+# Exported by test_all_files.sh once the checks pass so each test process can skip them
+PREFLIGHT_ENV = "AMPLIFY_PREFLIGHT"
+
+
+def load_config():
+    """Load .env.local the same way BaseTest does"""
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv(dotenv_path=os.path.join(project_dir, ".env.local"))
+    return {
+        "base_url": os.getenv("NEXTAUTH_URL", "http://localhost:3000").rstrip("/"),
+        "issuer": os.getenv("COGNITO_ISSUER", ""),
+        "api_base_url": os.getenv("API_BASE_URL", ""),
+        "chat_endpoint": os.getenv("CHAT_ENDPOINT", ""),
+        "timeout": float(os.getenv("PREFLIGHT_TIMEOUT", "5")),
+    }
+
+
+def fetch(url, timeout):
+    """Return (status, body) for a GET; HTTP errors still count as a response"""
+    request = urllib.request.Request(url, headers={"User-Agent": "amplify-preflight"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+# ----------------- Checks -----------------
+# Each check returns a short detail string on success and raises on failure.
+
+def check_server(config):
+    status, _ = fetch(config["base_url"], config["timeout"])
+    if status >= 500:
+        raise RuntimeError(f"{config['base_url']} answered HTTP {status}")
+    return f"HTTP {status}"
+
+
+def check_auth(config):
+    url = f"{config['base_url']}/api/auth/providers"
+    status, body = fetch(url, config["timeout"])
+    if status != 200:
+        raise RuntimeError(f"{url} answered HTTP {status}")
+    providers = json.loads(body or b"{}")
+    if not providers:
+        raise RuntimeError("NextAuth reports no login providers")
+
+    if config["issuer"]:
+        issuer_url = config["issuer"].rstrip("/") + "/.well-known/openid-configuration"
+        status, _ = fetch(issuer_url, config["timeout"])
+        if status != 200:
+            raise RuntimeError(f"{issuer_url} answered HTTP {status}")
+    return ", ".join(providers.keys())
+
+
+def check_backend(config):
+    if not config["api_base_url"]:
+        raise RuntimeError("API_BASE_URL is not set")
+    # Any HTTP answer (even 403/404) proves the gateway is reachable
+    status, _ = fetch(config["api_base_url"], config["timeout"])
+    return f"HTTP {status}"
+
+
+def check_chat_endpoint(config):
+    if not config["chat_endpoint"]:
+        raise RuntimeError("CHAT_ENDPOINT is not set")
+    status, _ = fetch(config["chat_endpoint"], config["timeout"])
+    return f"HTTP {status}"
+
+
+CHECKS = {
+    "server": check_server,
+    "auth": check_auth,
+    "backend": check_backend,
+    "chat": check_chat_endpoint,
+}
+
+# Replay runs answer requestOp from cassettes, so they must work offline
+REPLAY_SKIPPED = {"backend", "chat"}
+
+
+def active_checks():
+    if cassette.mode() == "replay":
+        return {name: check for name, check in CHECKS.items() if name not in REPLAY_SKIPPED}
+    return CHECKS
+
+
+def run_checks(config=None):
+    """Run all checks that apply to this run in parallel and return {name: (ok, detail, seconds)}"""
+    config = config or load_config()
+    checks = active_checks()
+
+    def run(check):
+        start = time.time()
+        try:
+            return True, check(config), time.time() - start
+        except Exception as e:
+            return False, f"{type(e).__name__}: {e}", time.time() - start
+
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = {name: pool.submit(run, check) for name, check in checks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def diagnose(results):
+    """Human readable summary of failed checks, or None when everything passed"""
+    failures = [
+        f"  {name}: {detail}" for name, (ok, detail, _) in results.items() if not ok
+    ]
+    if not failures:
+        return None
+    return "Pre-flight checks failed:\n" + "\n".join(failures)
+
+
+# The result is cached per process so a pytest run only probes once
+_cached_diagnosis = ()
+
+
+def preflight_diagnosis():
+    """Used by BaseTest to skip tests when the environment is unusable"""
+    global _cached_diagnosis
+    if os.getenv(PREFLIGHT_ENV) in ("passed", "skip"):
+        return None
+    if _cached_diagnosis == ():
+        _cached_diagnosis = diagnose(run_checks())
+    return _cached_diagnosis
+
+
+def main():
+    results = run_checks()
+    for name, (ok, detail, seconds) in results.items():
+        print(f"[{'ok' if ok else 'FAIL'}] {name:<8} {seconds:5.2f}s  {detail}")
+
+    diagnosis = diagnose(results)
+    if diagnosis:
+        print(diagnosis)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
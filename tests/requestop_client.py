@@ -0,0 +1,90 @@
+"""
+Lightweight HTTP client for the app's API routes.
+
+Logs in through the browser once, then reuses the NextAuth session cookie so
+load tests can call /api/requestOp and the /api/share/* routes without a
+browser per user. Payloads are encoded the way doRequestOp does it: base64 of
+the JSON body, decoded the same way on the way back.
+"""
+
+import json
+import time
+import base64
+import urllib.request
+import urllib.error
+
+
+def encode(data):
+    """transformPayload.encode: base64 of the JSON text"""
+    return base64.b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+
+def decode(encoded):
+    return json.loads(base64.b64decode(encoded).decode("utf-8"))
+
+
+def cookie_header(driver):
+    """Cookie header carrying the logged-in browser session"""
+    return "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies())
+
+
+class Response:
+    """Status, decoded body and wall time of one call; error is set on failure"""
+
+    def __init__(self, status, body, seconds, error=None):
+        self.status = status
+        self.body = body
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        if self.error or not 200 <= (self.status or 0) < 300:
+            return False
+        return not (isinstance(self.body, dict) and self.body.get("success") is False)
+
+
+class ApiClient:
+    """Calls the app's Next.js API routes with a session cookie"""
+
+    def __init__(self, base_url, cookies, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.cookies = cookies
+        self.timeout = timeout
+
+    def call(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json", "Cookie": self.cookies},
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, text = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, text = e.code, e.read()
+        except Exception as e:
+            return Response(None, None, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+        seconds = time.perf_counter() - start
+        try:
+            return Response(status, json.loads(text) if text else None, seconds)
+        except ValueError:
+            return Response(status, None, seconds, error="Response was not JSON")
+
+    def request_op(self, method, path, op, data=None, query_params=None):
+        """POST an op to /api/requestOp the way doRequestOp does and decode the result"""
+        op_data = {"method": method, "path": path, "op": op}
+        if data is not None:
+            op_data["data"] = encode(data)
+        if query_params:
+            op_data["queryParams"] = {k: encode(v) for k, v in query_params.items()}
+        response = self.call("POST", "/api/requestOp", {"data": op_data})
+        if response.status == 200 and isinstance(response.body, dict) and "data" in response.body:
+            try:
+                response.body = decode(response.body["data"])
+            except ValueError:
+                response.error = "Could not decode the requestOp response"
+        return response
@@ -0,0 +1,150 @@
+"""
+Cache of passing test files for test_all_files.sh.
+
+A test file that passed is not run again while nothing it depends on has
+changed. The cache key combines:
+
+    build     the Next.js build ID the server at NEXTAUTH_URL is serving
+    test      the test file itself
+    harness   tests/base_test.py and the other harness modules in tests/
+    fixtures  tests/test_files, the file's cassettes, the backend settings
+              (NEXTAUTH_URL, API_BASE_URL, CHAT_ENDPOINT) and the run mode
+              (cassette replay, request blocking, throttling, browser pool)
+
+A dev server (`next dev`) reports the build ID "development" for every code
+change, so nothing is cached against it. The runner calls
+
+    python3 -m tests.result_cache check tests/ModalTests/test_MemoryModal.py
+    python3 -m tests.result_cache record tests/ModalTests/test_MemoryModal.py
+
+around each file; --no-cache skips both, and `clear` empties the cache.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import hashlib
+from tests.preflight import load_config, fetch
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(TESTS_DIR)
+CACHE_PATH = os.path.join(TESTS_DIR, ".result_cache.json")
+
+BUILD_ID_PATTERN = re.compile(rb'"buildId"\s*:\s*"([^"]+)"')
+BACKEND_SETTINGS = ["NEXTAUTH_URL", "API_BASE_URL", "CHAT_ENDPOINT"]
+# A pass against replayed cassettes or with requests blocked/throttled says nothing about a plain live run
+RUN_MODE_SETTINGS = ["AMPLIFY_CASSETTE", "AMPLIFY_BLOCK", "AMPLIFY_THROTTLE", "AMPLIFY_BROWSER_POOL"]
+
+
+def digest(paths, extra=""):
+    """sha256 over the contents of paths (in order) plus extra text"""
+    h = hashlib.sha256(extra.encode("utf-8"))
+    for path in paths:
+        h.update(os.path.relpath(path, PROJECT_DIR).encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def build_id(config):
+    """Build ID of the running app, from __NEXT_DATA__ or else the local .next/BUILD_ID"""
+    try:
+        status, body = fetch(config["base_url"], config["timeout"])
+        match = BUILD_ID_PATTERN.search(body or b"")
+        if match:
+            return match.group(1).decode("utf-8")
+    except OSError:
+        pass
+    local = os.path.join(PROJECT_DIR, ".next", "BUILD_ID")
+    if os.path.exists(local):
+        with open(local) as f:
+            return f.read().strip()
+    return None
+
+
+def key_parts(test_file, config, build):
+    module = os.path.splitext(os.path.basename(test_file))[0]
+    harness = sorted(glob.glob(os.path.join(TESTS_DIR, "*.py")))
+    fixtures = sorted(
+        p for p in glob.glob(os.path.join(TESTS_DIR, "test_files", "*")) + glob.glob(
+            os.path.join(TESTS_DIR, "cassettes", f"*{module}.*.json")
+        ) if os.path.isfile(p)
+    )
+    backend = json.dumps(
+        {name: os.getenv(name, "") for name in BACKEND_SETTINGS + RUN_MODE_SETTINGS}, sort_keys=True
+    )
+    return {
+        "build": build,
+        "test": digest([test_file]),
+        "harness": digest(harness),
+        "fixtures": digest(fixtures, backend),
+    }
+
+
+def load():
+    if not os.path.exists(CACHE_PATH):
+        return {}
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def save(cache):
+    # Concurrent files (--contexts) record at the same time: a whole file is always swapped in, and a lost
+    # entry only means that file runs again next time
+    temp_path = f"{CACHE_PATH}.{os.getpid()}"
+    with open(temp_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(temp_path, CACHE_PATH)
+
+
+def check(test_file, config):
+    """True if test_file passed before with the same key"""
+    build = build_id(config)
+    if not build or build == "development":
+        return False
+    entry = load().get(os.path.relpath(test_file, PROJECT_DIR))
+    return bool(entry) and entry["key"] == key_parts(test_file, config, build)
+
+
+def record(test_file, config):
+    build = build_id(config)
+    if not build or build == "development":
+        return
+    cache = load()
+    cache[os.path.relpath(test_file, PROJECT_DIR)] = {
+        "key": key_parts(test_file, config, build),
+        "passed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    save(cache)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("check", "record", "clear") or (argv[0] != "clear" and len(argv) != 2):
+        print("Usage: python3 -m tests.result_cache check|record <test file> | clear")
+        return 2
+    if argv[0] == "clear":
+        if os.path.exists(CACHE_PATH):
+            os.remove(CACHE_PATH)
+        return 0
+
+    config = load_config()
+    test_file = os.path.abspath(argv[1])
+    if argv[0] == "check":
+        if check(test_file, config):
+            print(f"{argv[1]}: cached pass")
+            return 0
+        return 1
+    record(test_file, config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
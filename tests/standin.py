@@ -0,0 +1,321 @@
+"""
+In-page stand-in for the backend.
+
+The app talks to the backend in two ways: doRequestOp POSTs base64 encoded
+payloads to /api/requestOp, and chat requests stream server-sent events straight
+from CHAT_ENDPOINT. StandIn installs a window.fetch wrapper (via
+Page.addScriptToEvaluateOnNewDocument, so it is in place before the app boots)
+that can answer either kind of call locally and logs every call it sees.
+
+    stand_in = StandIn()
+    stand_in.op("/available_models", {"success": True, "data": {...}}, delay_ms=200)
+    stand_in.stream(chat_endpoint, events=[{"s": "0", "d": "Hello"}])
+    stand_in.install(driver)
+
+Responses, handlers and generators may be given as JS function source for cases
+that are too large or too dynamic to embed as JSON.
+"""
+
+import json
+from tests.cdp import add_init_script
+
+
+HOOK_SCRIPT = r"""
+(function () {
+    const config = %(config)s;
+    if (window.__amplifyStandIn && window.__amplifyStandIn.installed) {
+        Object.assign(window.__amplifyStandIn, config);
+        return;
+    }
+    const standIn = window.__amplifyStandIn = Object.assign({log: [], calls: {}, installed: true}, config);
+    const realFetch = window.fetch.bind(window);
+
+    // Keep the log across reloads and navigations within the session
+    try {
+        standIn.log = JSON.parse(sessionStorage.getItem("__amplifyStandInLog") || "[]");
+        sessionStorage.removeItem("__amplifyStandInLog");
+    } catch (e) {}
+    window.addEventListener("pagehide", () => {
+        try { sessionStorage.setItem("__amplifyStandInLog", JSON.stringify(standIn.log)); } catch (e) {}
+    });
+    const compiled = {};
+
+    const compile = (src) => {
+        if (!compiled[src]) compiled[src] = new Function("return (" + src + ")")();
+        return compiled[src];
+    };
+    const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+    const toBase64 = (text) => {
+        const bytes = new TextEncoder().encode(text);
+        let binary = "";
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return btoa(binary);
+    };
+    const fromBase64 = (encoded) => {
+        const binary = atob(encoded);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+        return new TextDecoder().decode(bytes);
+    };
+    standIn.encode = (data) => toBase64(JSON.stringify(data));
+    standIn.decode = (encoded) => JSON.parse(fromBase64(encoded));
+
+    // Size of JSON.stringify({data: lzwCompress(text)}), i.e. what requestOp.ts sends upstream
+    const lzwWireBytes = (text) => {
+        const dictionary = new Map();
+        for (let i = 0; i < 256; i++) dictionary.set(String.fromCharCode(i), i);
+        let nextCode = 256, current = "", digits = 0, codes = 0;
+        const emit = (code) => { digits += String(code).length; codes++; };
+        const processed = text.split("").map(c => c.charCodeAt(0) > 255 ? "U+" + c.charCodeAt(0).toString(16) : c).join("");
+        for (const character of processed) {
+            const pattern = current + character;
+            if (dictionary.has(pattern)) {
+                current = pattern;
+            } else {
+                emit(dictionary.get(current));
+                dictionary.set(pattern, nextCode++);
+                current = character;
+            }
+        }
+        if (current !== "") emit(dictionary.get(current));
+        return '{"data":[]}'.length + digits + Math.max(0, codes - 1);
+    };
+    const NO_COMPRESSION_PATHS = ["/billing", "/se", "/vu-agent", "/user-data"];
+
+    // est*Ms time the stand-in's own TextEncoder/btoa codec on the same payloads. The app's
+    // transformPayload (Buffer.from(...).toString('base64')) is bundled out of reach, so these
+    // are estimates of its cost, not measurements of it
+    const measurePayloads = (entry, opData, payload, responseText) => {
+        if (payload !== null) {
+            const json = JSON.stringify(payload);
+            const started = performance.now();
+            standIn.encode(payload);
+            entry.estEncodeMs = performance.now() - started;
+            entry.requestRawBytes = new TextEncoder().encode(json).length;
+            entry.requestEncodedBytes = (opData.data || "").length;
+            const compress = !NO_COMPRESSION_PATHS.includes(opData.path) &&
+                (typeof payload === "object" || (typeof payload === "string" && payload.length > 1000));
+            entry.requestUpstreamBytes = compress
+                ? lzwWireBytes(typeof payload === "object" ? json : payload)
+                : JSON.stringify({data: payload}).length;
+        }
+        try {
+            const encoded = JSON.parse(responseText).data;
+            const started = performance.now();
+            const decoded = standIn.decode(encoded);
+            entry.estDecodeMs = performance.now() - started;
+            entry.responseEncodedBytes = encoded.length;
+            entry.responseRawBytes = new TextEncoder().encode(JSON.stringify(decoded)).length;
+        } catch (e) {}
+    };
+
+    const findRule = (kind, key) => (standIn.rules || []).find(
+        rule => rule.kind === kind && key.includes(rule.match)
+    );
+
+    // Cassette key: method, path+op and the payload with volatile values (ids, times) masked
+    const UUID = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+    const ISO_DATE = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}/;
+    const normalize = (value) => {
+        if (Array.isArray(value)) return value.map(normalize);
+        if (value && typeof value === "object") {
+            const out = {};
+            for (const key of Object.keys(value).sort()) out[key] = normalize(value[key]);
+            return out;
+        }
+        if (typeof value === "string" && UUID.test(value)) return "<uuid>";
+        if (typeof value === "string" && ISO_DATE.test(value)) return "<date>";
+        if (typeof value === "number" && value > 1e12 && value < 1e13) return "<time>";
+        return value;
+    };
+    const keyOf = (opData, payload) => {
+        const query = {};
+        for (const [k, v] of Object.entries(opData.queryParams || {})) {
+            try { query[k] = standIn.decode(v); } catch (e) { query[k] = v; }
+        }
+        return [opData.method, (opData.path || "") + (opData.op || ""),
+                JSON.stringify(normalize({query: query, data: payload}))].join(" ");
+    };
+
+    const countCall = (key) => {
+        standIn.calls[key] = (standIn.calls[key] || 0) + 1;
+        return standIn.calls[key] - 1;
+    };
+
+    const handleRequestOp = async (url, init) => {
+        const started = performance.now();
+        const rawBody = (init && typeof init.body === "string") ? init.body : "";
+        let opData = {};
+        try { opData = JSON.parse(rawBody).data || {}; } catch (e) {}
+        const opKey = (opData.path || "") + (opData.op || "");
+        let payload = null;
+        try { payload = opData.data ? standIn.decode(opData.data) : null; } catch (e) {}
+
+        const entry = {
+            type: "requestOp", op: opKey, method: opData.method, start: started,
+            requestBytes: rawBody.length,
+        };
+        if (standIn.record) entry.request = {method: opData.method, path: opData.path, op: opData.op,
+                                             queryParams: opData.queryParams, data: payload};
+        if (standIn.record || standIn.cassette) entry.key = keyOf(opData, payload);
+
+        const rule = findRule("requestOp", opKey);
+        let response;
+        if (rule) {
+            const callIndex = countCall("requestOp:" + rule.match);
+            const body = rule.handler
+                ? await compile(rule.handler)(payload, opData, callIndex)
+                : (Array.isArray(rule.sequence)
+                    ? rule.sequence[Math.min(callIndex, rule.sequence.length - 1)]
+                    : rule.response);
+            if (rule.delayMs) await sleep(rule.delayMs);
+            const text = (rule.status || 200) === 200
+                ? JSON.stringify({data: standIn.encode(body)})
+                : JSON.stringify({error: "Stand-in error"});
+            response = new Response(text, {status: rule.status || 200,
+                                           headers: {"Content-Type": "application/json"}});
+            entry.stoodIn = true;
+        } else if (standIn.cassette) {
+            // Replay: serve the recorded responses for this key in order, repeating the last
+            const recorded = standIn.cassette[entry.key];
+            const callIndex = countCall("cassette:" + entry.key);
+            const hit = recorded ? recorded[Math.min(callIndex, recorded.length - 1)] : null;
+            const body = hit ? hit.response : {success: false, message: "No cassette entry for " + opKey};
+            response = new Response(JSON.stringify({data: standIn.encode(body)}), {
+                status: hit ? hit.status || 200 : 200, headers: {"Content-Type": "application/json"}});
+            entry.stoodIn = true;
+            entry.replayed = !!hit;
+        } else {
+            response = await realFetch(url, init);
+            entry.stoodIn = false;
+        }
+
+        entry.status = response.status;
+        entry.end = performance.now();
+        if (standIn.record || standIn.measure) {
+            const text = await response.clone().text();
+            entry.responseBytes = text.length;
+            if (standIn.record) {
+                try { entry.response = standIn.decode(JSON.parse(text).data); } catch (e) { entry.response = null; }
+            }
+            if (standIn.measure) measurePayloads(entry, opData, payload, text);
+        }
+        standIn.log.push(entry);
+        return response;
+    };
+
+    const handleStream = (url, init, rule) => {
+        const entry = {type: "stream", url: url, start: performance.now(), events: 0};
+        standIn.log.push(entry);
+        let request = null;
+        try { request = JSON.parse(init.body); } catch (e) {}
+        const callIndex = countCall("stream:" + rule.match);
+        const events = rule.generator
+            ? compile(rule.generator)(request, callIndex)
+            : (rule.events || [])[Symbol.iterator]();
+        const encoder = new TextEncoder();
+        const batch = rule.batch || 1;
+
+        const body = new ReadableStream({
+            async pull(controller) {
+                let text = "";
+                for (let i = 0; i < batch; i++) {
+                    const next = events.next();
+                    if (next.done) break;
+                    text += "data: " + JSON.stringify(next.value) + "\n\n";
+                    entry.events++;
+                }
+                if (!text) {
+                    entry.end = performance.now();
+                    controller.close();
+                    return;
+                }
+                if (entry.firstByte === undefined) entry.firstByte = performance.now();
+                controller.enqueue(encoder.encode(text));
+                if (rule.intervalMs) await sleep(rule.intervalMs);
+            }
+        });
+        return new Response(body, {status: 200, headers: {"Content-Type": "text/event-stream"}});
+    };
+
+    window.fetch = async function (input, init) {
+        const url = typeof input === "string" ? input : (input && input.url) || String(input);
+        if (url.includes("/api/requestOp")) {
+            return handleRequestOp(url, init);
+        }
+        const rule = findRule("stream", url);
+        if (rule) {
+            return handleStream(url, init || {}, rule);
+        }
+        return realFetch(input, init);
+    };
+})();
+"""
+
+
+class StandIn:
+    """Collects stand-in rules and installs them into a Selenium session"""
+
+    def __init__(self, record=False, measure=False):
+        self.rules = []
+        self.record = record
+        self.measure = measure
+        self.cassette = None
+
+    # ----------------- Rules -----------------
+    def op(self, match, response=None, sequence=None, handler=None, delay_ms=0, status=200):
+        """Answer /api/requestOp calls whose path+op contains `match`.
+
+        response is returned every time, sequence returns one item per call
+        (repeating the last), handler is JS source `(payload, opData, callIndex) => body`.
+        """
+        self.rules.append({
+            "kind": "requestOp", "match": match, "response": response,
+            "sequence": sequence, "handler": handler, "delayMs": delay_ms, "status": status,
+        })
+        return self
+
+    def stream(self, match, events=None, generator=None, interval_ms=0, batch=1):
+        """Answer fetches to URLs containing `match` with a server-sent event stream.
+
+        events is a list of event dicts; generator is JS source of a generator
+        function `function* (request, callIndex)` yielding event dicts. batch
+        events are written per chunk with interval_ms between chunks.
+        """
+        # Every URL contains "", so an empty match would answer all of the app's fetches with the stream
+        if not match:
+            raise ValueError("StandIn.stream needs a URL to match; is CHAT_ENDPOINT set?")
+        self.rules.append({
+            "kind": "stream", "match": match, "events": events,
+            "generator": generator, "intervalMs": interval_ms, "batch": batch,
+        })
+        return self
+
+    def replay(self, cassette):
+        """Answer requestOp calls no rule matches from a {key: [{status, response}]} cassette"""
+        self.cassette = cassette
+        return self
+
+    # ----------------- Session -----------------
+    def script(self):
+        config = {"rules": self.rules, "record": self.record, "measure": self.measure, "cassette": self.cassette}
+        return HOOK_SCRIPT % {"config": json.dumps(config)}
+
+    def install(self, driver):
+        """Install for every future document and the current one.
+
+        Call again after changing rules; the latest install wins on both.
+        """
+        source = self.script()
+        add_init_script(driver, source)
+        driver.execute_script(source)
+
+    @staticmethod
+    def drain_log(driver):
+        """Return and clear the calls logged by the page since the last drain"""
+        return driver.execute_script(
+            "return window.__amplifyStandIn ? window.__amplifyStandIn.log.splice(0) : [];"
+        ) or []
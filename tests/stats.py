@@ -0,0 +1,147 @@
+"""
+Statistics and report helpers shared by the benchmarks and harness tools.
+
+Kept free of Selenium imports so command line tools (pre-flight, profilers,
+load generators) can use them without starting a browser.
+"""
+
+import os
+import json
+import random
+from datetime import datetime
+
+
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0-100) of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    """count/min/mean/p50/p95/p99/max of a list of numbers"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": min(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def slope(xs, ys):
+    """Least-squares slope of ys over xs (0 when it cannot be computed)"""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def median(values):
+    return percentile(values, 50)
+
+
+def trim_outliers(values, k=1.5):
+    """values inside Tukey's fences (k * IQR beyond the quartiles); fewer than 4 values are kept as is"""
+    values = [v for v in values if v is not None]
+    if len(values) < 4:
+        return values
+    q1, q3 = percentile(values, 25), percentile(values, 75)
+    spread = k * (q3 - q1)
+    return [v for v in values if q1 - spread <= v <= q3 + spread]
+
+
+def bootstrap(values, statistic=median, resamples=2000, seed=0):
+    """Sorted estimates of statistic over resamples drawn with replacement"""
+    rng = random.Random(seed)
+    return sorted(statistic([rng.choice(values) for _ in values]) for _ in range(resamples))
+
+
+def bootstrap_ci(values, statistic=median, confidence=0.95, resamples=2000, seed=0):
+    """Percentile bootstrap confidence interval (low, high) of statistic; (None, None) below 2 values"""
+    if len(values) < 2:
+        return None, None
+    estimates = bootstrap(values, statistic, resamples, seed)
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+def robust_summary(values, trim=True, confidence=0.95):
+    """Median, p95 and a bootstrap CI of the median after trimming outliers; keeps the raw samples"""
+    values = [v for v in values if v is not None]
+    kept = trim_outliers(values) if trim else values
+    if not kept:
+        return {"samples": values, "count": 0}
+    low, high = bootstrap_ci(kept, confidence=confidence)
+    return {
+        "samples": values,
+        "count": len(values),
+        "outliers": len(values) - len(kept),
+        "mean": sum(kept) / len(kept),
+        "p50": median(kept),
+        "p95": percentile(kept, 95),
+        "ci": [low, high],
+        "confidence": confidence,
+    }
+
+
+def compare(a, b, trim=True, confidence=0.95, resamples=2000, seed=0):
+    """Difference of medians b - a with a bootstrap CI; significant when the CI excludes 0"""
+    a = trim_outliers(a) if trim else [v for v in a if v is not None]
+    b = trim_outliers(b) if trim else [v for v in b if v is not None]
+    if len(a) < 2 or len(b) < 2:
+        return {"a_count": len(a), "b_count": len(b), "significant": None}
+    rng = random.Random(seed)
+    differences = sorted(
+        median([rng.choice(b) for _ in b]) - median([rng.choice(a) for _ in a]) for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2 * 100
+    low, high = percentile(differences, tail), percentile(differences, 100 - tail)
+    below = sum(1 for d in differences if d <= 0) / resamples
+    above = sum(1 for d in differences if d >= 0) / resamples
+    difference = median(b) - median(a)
+    return {
+        "a_count": len(a),
+        "b_count": len(b),
+        "a_p50": median(a),
+        "b_p50": median(b),
+        "difference": difference,
+        "relative": difference / median(a) if median(a) else None,
+        "ci": [low, high],
+        "confidence": confidence,
+        "p_value": min(1.0, 2 * min(below, above)),
+        "significant": low > 0 or high < 0,
+    }
+
+
+def write_report(name, data):
+    """Write a benchmark report to tests/reports/<name>.json and return its path"""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"{name}.json")
+    report = {
+        "name": name,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "base_url": os.getenv("NEXTAUTH_URL", "http://localhost:3000"),
+        **data,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Benchmark report written to {path}")
+    return path
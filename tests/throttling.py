@@ -0,0 +1,64 @@
+"""
+Named network and CPU throttling profiles for the test harness.
+
+Field users sit behind VPNs and on old laptops while the suite runs on fast
+CI machines. A profile emulates both through CDP (Network.emulateNetworkConditions
+and Emulation.setCPUThrottlingRate). A suite opts in with a class attribute:
+
+    class ChatHomeTests(BaseTest):
+        throttle_profile = "vpn"
+
+AMPLIFY_THROTTLE (test_all_files.sh --throttle=PROFILE) applies a profile to
+every test instead. Benchmarks tag their records and report name with the
+active profile, and test_Throttling.py times startup, sending a message and
+opening modals under each profile.
+
+Throttling only covers traffic Chrome sends. Calls answered by the in-page
+stand-in (tests/standin.py) never reach the network, so only the CPU part of a
+profile applies to them.
+"""
+
+import os
+
+
+THROTTLE_ENV = "AMPLIFY_THROTTLE"
+
+# latency in ms, throughput in kbit/s, cpu as a slowdown factor
+PROFILES = {
+    "none": {},
+    "vpn": {"latency_ms": 150, "download_kbps": 5000, "upload_kbps": 1000},
+    "slow_vpn": {"latency_ms": 300, "download_kbps": 1500, "upload_kbps": 500},
+    "old_laptop": {"cpu": 4},
+    "vpn_old_laptop": {"latency_ms": 150, "download_kbps": 5000, "upload_kbps": 1000, "cpu": 4},
+    "worst_case": {"latency_ms": 300, "download_kbps": 1500, "upload_kbps": 500, "cpu": 6},
+}
+
+
+def profile_for(test):
+    """The profile a test runs with: AMPLIFY_THROTTLE, else the suite's throttle_profile"""
+    return os.getenv(THROTTLE_ENV) or getattr(test, "throttle_profile", None)
+
+
+def settings(name):
+    if name not in PROFILES:
+        raise ValueError(f"Unknown throttling profile '{name}', choose from {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def throughput(kbps):
+    """kbit/s to the bytes/s CDP expects; -1 leaves the direction unthrottled"""
+    return kbps * 1000 / 8 if kbps else -1
+
+
+def apply(driver, name):
+    """Throttle the session's page to profile `name`; 'none' lifts any throttling"""
+    profile = settings(name)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile.get("latency_ms", 0),
+        "downloadThroughput": throughput(profile.get("download_kbps")),
+        "uploadThroughput": throughput(profile.get("upload_kbps")),
+    })
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile.get("cpu", 1)})
+    return profile
@@ -0,0 +1,152 @@
+"""
+Event-driven waits for the Selenium suite.
+
+WebDriverWait polls every 500 ms and every poll is a WebDriver round trip.
+DomWait is a drop-in WebDriverWait (BaseTest sets it up as self.wait) that,
+for the expected conditions the suite uses most, installs a MutationObserver
+in the page and blocks in a single execute_async_script call until the DOM
+matches the condition's locator. The expected condition itself is still
+evaluated afterwards, so results and failures are the same as with polling.
+
+Supported: presence_of_element_located, presence_of_all_elements_located,
+visibility_of_element_located, element_to_be_clickable (with a locator) and
+invisibility_of_element_located. Anything else, and everything when
+AMPLIFY_POLLING_WAITS=1, falls back to WebDriverWait's polling.
+"""
+
+import os
+import time
+import inspect
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+    WebDriverException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+POLLING_ENV = "AMPLIFY_POLLING_WAITS"
+
+# Longest single wait in the page; stays under ChromeDriver's default 30 s script timeout
+CHUNK_SECONDS = 20
+
+# expected condition factory -> what the page waits for
+KINDS = {
+    "presence_of_element_located": "present",
+    "presence_of_all_elements_located": "present",
+    "visibility_of_element_located": "visible",
+    "element_to_be_clickable": "clickable",
+    "invisibility_of_element_located": "invisible",
+}
+
+# By strategies the page script can resolve itself
+LOCATOR_STRATEGIES = {"id", "name", "class name", "xpath", "css selector", "tag name"}
+
+# Resolves when the first element matching the locator is present/visible/clickable/gone,
+# or with false after timeout ms. The interval covers style changes that are not mutations.
+WAIT_SCRIPT = """
+const [kind, using, value, timeout, done] = arguments;
+const quoted = (text) => '"' + text.replace(/["\\\\]/g, '\\\\$&') + '"';
+const first = () => {
+    switch (using) {
+        case 'id': return document.querySelector('[id=' + quoted(value) + ']');
+        case 'name': return document.querySelector('[name=' + quoted(value) + ']');
+        case 'class name': return document.querySelector('.' + CSS.escape(value));
+        case 'xpath': return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        default: return document.querySelector(value);
+    }
+};
+const visible = (el) => {
+    if (!el.isConnected || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    const style = getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+};
+const holds = () => {
+    let el;
+    try { el = first(); } catch (e) { return true; }  // let the real condition report a bad locator
+    if (kind === 'present') return !!el;
+    if (kind === 'invisible') return !el || !visible(el);
+    if (!el || !visible(el)) return false;
+    return kind === 'visible' || !el.disabled;
+};
+if (holds()) { done(true); return; }
+let finished = false;
+const finish = (result) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+};
+const observer = new MutationObserver(() => { if (holds()) finish(true); });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+const interval = setInterval(() => { if (holds()) finish(true); }, 100);
+const timer = setTimeout(() => finish(false), timeout);
+"""
+
+
+def observable(method):
+    """(kind, by, value) for an expected condition the page can watch, else None"""
+    factory = getattr(method, "__qualname__", "").split(".")[0]
+    kind = KINDS.get(factory)
+    if not kind:
+        return None
+    try:
+        captured = inspect.getclosurevars(method).nonlocals
+    except (TypeError, ValueError):
+        return None
+    locator = next((v for v in captured.values() if isinstance(v, tuple) and len(v) == 2), None)
+    if locator is None or locator[0] not in LOCATOR_STRATEGIES:
+        return None
+    return kind, locator[0], locator[1]
+
+
+class DomWait(WebDriverWait):
+    """WebDriverWait that waits on DOM mutations instead of polling where it can.
+
+    calls counts until() calls and page_waits the execute_async_script waits
+    that replaced polling, so suites can see how many round trips were saved.
+    """
+
+    def __init__(self, driver, timeout, *args, **kwargs):
+        super().__init__(driver, timeout, *args, **kwargs)
+        self.calls = 0
+        self.page_waits = 0
+
+    def until(self, method, message=""):
+        self.calls += 1
+        spec = observable(method)
+        if spec is None or os.getenv(POLLING_ENV) == "1":
+            return super().until(method, message)
+
+        screen = stacktrace = None
+        woke = False
+        end = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            if woke:
+                # The page and Selenium disagree (e.g. on visibility); do not spin on round trips
+                time.sleep(min(0.05, remaining))
+            self.page_waits += 1
+            try:
+                woke = self._driver.execute_async_script(
+                    WAIT_SCRIPT, *spec, int(min(remaining, CHUNK_SECONDS) * 1000)
+                )
+            except UnexpectedAlertPresentException:
+                raise
+            except (JavascriptException, TimeoutException, WebDriverException):
+                # Navigation unloads the page mid-wait; check again and watch the new document
+                woke = False
+                time.sleep(min(self._poll, max(0.0, end - time.monotonic())))
+        raise TimeoutException(message, screen, stacktrace)